@@ -1,6 +1,11 @@
+import logging
+
 from .agent import Agent, AgentOptions
 from .rtc import RTC, RTCOptions
 
+# The application decides where the records go, see `ai01.utils.log.configure_logging`.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __all__ = [
     "Agent",
     "AgentOptions",
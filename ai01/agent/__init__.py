@@ -1,10 +1,15 @@
-from ._models import AgentsEvents
+from ._models import AgentsEvents, AgentState
 from .agent import Agent, AgentOptions
+from .host import AgentHost, AgentHostOptions, HostedSession
 
 __all__ = [
     "Agent",
     "AgentOptions",
+    "AgentHost",
+    "AgentHostOptions",
+    "HostedSession",
     "AgentsEvents",
+    "AgentState",
 ]
 
 # Cleanup docs of unexported modules
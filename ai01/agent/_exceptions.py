@@ -41,3 +41,12 @@ class RoomNotConnectedError(AgentError):
             - Make Sure the room_id is valid for the API_KEY being used to connect to the Room.
             """
         )
+
+
+class AgentHostAdmissionError(AgentError):
+    """Exception raised when the Agent Host refuses a new session, because it is full or its Event Loop is lagging."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Agent Host refused the session: {reason}")
+
+        self.reason = reason
@@ -5,10 +5,13 @@ class AgentsEvents(str):
     Speaking: str = "Speaking"
     Listening: str = "Listening"
     Thinking: str = "Thinking"
+    Idle: str = "Idle"
+    StateChanged: str = "StateChanged"
 
 
-
-
-
-
-
+# AgentState is the Enum for the states of the Agent, entering a state emits the AgentsEvents of the same name.
+class AgentState(str):
+    Idle: str = "Idle"
+    Listening: str = "Listening"
+    Thinking: str = "Thinking"
+    Speaking: str = "Speaking"
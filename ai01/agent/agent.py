@@ -9,6 +9,7 @@ from ..providers.Anthropic.textmodel import TextModel
 from ..rtc import RTC, RTCOptions
 from ..utils.emitter import EnhancedEventEmitter
 from ._exceptions import RoomNotConnectedError, RoomNotCreatedError
+from ._models import AgentsEvents, AgentState
 
 
 
@@ -37,6 +38,11 @@ class AgentOptions(BaseModel):
     Text Track is the Text input for the Agent.
     """
 
+    state_debounce_ms: int = 0
+    """
+    State Debounce is how long in milliseconds a state has to hold before it is emitted, Default is 0, which emits every transition.
+    """
+
     _lock: Optional[asyncio.Lock]
     """
     Optional asyncio lock for synchronization.
@@ -47,7 +53,7 @@ class AgentOptions(BaseModel):
 
 
 
-logger = logging.getLogger("Agent")
+logger = logging.getLogger(__name__)
 class Agent(EnhancedEventEmitter):
     """
     Agents is defined as the higher level user which is its own entity and has exposed APIs to
@@ -71,11 +77,22 @@ class Agent(EnhancedEventEmitter):
         # Text Track is the Text Stream Track for the Agent.
         self.text_track = options.text_track
 
-        # self.audio_track = options.audio_track
+        # Audio Track is the Audio Stream Track for the Agent.
+        self.audio_track = options.audio_track
 
         # Logger for the Agent.
         self._logger = logger.getChild("Agent")
 
+        # State of the Agent, and the State last emitted to the listeners.
+        self._state = AgentState.Idle
+        self._emitted_state = AgentState.Idle
+        self._state_timer: Optional[asyncio.TimerHandle] = None
+        self._state_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Speaking ends once the Audio Track played out the audio of the response.
+        if self.audio_track is not None:
+            self.audio_track.on_drained = self._on_playout_drained
+
     @property
     def agent_lock(self):
         """
@@ -91,6 +108,65 @@ class Agent(EnhancedEventEmitter):
     def logger(self):
         return self._logger
 
+    @property
+    def state(self) -> str:
+        """
+        State of the Agent, one of the AgentState, the listeners may not have been told yet while it is debounced.
+        """
+        return self._state
+
+    def set_state(self, state: str):
+        """
+        Move the Agent to a State, called by the Models from the Event Loop.
+
+        Only transitions are emitted, as the AgentsEvents of the new state and as `StateChanged` with the new and the previous state.
+        With `state_debounce_ms`, a state is emitted once it held for that long, a state which is left sooner is never emitted.
+
+        Example Usage:
+            ```python
+            @agent.on(AgentsEvents.StateChanged)
+            def on_state_changed(state: str, previous: str):
+                print(f"{previous} -> {state}")
+            ```
+        """
+        if state == self._state:
+            return
+
+        self._state = state
+
+        if self._state_loop is None:
+            self._state_loop = asyncio.get_event_loop()
+
+        if self._state_timer is not None:
+            self._state_timer.cancel()
+            self._state_timer = None
+
+        if self.options.state_debounce_ms <= 0:
+            self._emit_state()
+        else:
+            self._state_timer = self._state_loop.call_later(self.options.state_debounce_ms / 1000, self._emit_state)
+
+    def _emit_state(self):
+        self._state_timer = None
+
+        if self._state == self._emitted_state:
+            return
+
+        previous = self._emitted_state
+        self._emitted_state = self._state
+
+        self.emit(self._state)
+        self.emit(AgentsEvents.StateChanged, self._state, previous)
+
+    def _on_playout_drained(self):
+        # Called by the Audio Track once the audio of a response was played, possibly from another thread.
+        if self._state_loop is not None:
+            self._state_loop.call_soon_threadsafe(self._end_speaking)
+
+    def _end_speaking(self):
+        if self._state == AgentState.Speaking:
+            self.set_state(AgentState.Idle)
+
     @property
     def room(self):
         """
@@ -0,0 +1,509 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Literal,
+    Optional,
+    Union,
+)
+
+from huddle01.local_peer import ProduceOptions
+from huddle01.room import RoomEvents, RoomEventsData
+from pydantic import BaseModel
+
+from ..providers.openai.audio_decoder import DecodeBackend
+from ..providers.openai.audio_track import AudioTrack, AudioTrackOptions
+from ..rtc import RTCOptions
+from ..rtc.playout_clock import PlayoutClock
+from ..utils.histogram import Histogram
+from ..utils.metrics import REGISTRY, serve_from_env, start_http_server, stop_env_server
+from ._exceptions import AgentHostAdmissionError
+from .agent import Agent, AgentOptions
+
+if TYPE_CHECKING:
+    from ..providers.openai.realtime.realtime_model import (
+        RealTimeModel,
+        RealTimeModelOptions,
+    )
+
+logger = logging.getLogger(__name__)
+
+LAG_MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+HOSTED_SESSIONS = REGISTRY.gauge("ai01_host_sessions", "Sessions running on the Agent Hosts.")
+LOOP_LAG = REGISTRY.gauge("ai01_host_loop_lag_ms", "Recent Event Loop lag of the Agent Hosts, in milliseconds.")
+ADMISSIONS = REGISTRY.counter("ai01_host_admissions_total", "Sessions requested from the Agent Hosts, by result.", ("result",))
+ADMITTED = ADMISSIONS.labels("admitted")
+REJECTED = ADMISSIONS.labels("rejected")
+CRASHES = REGISTRY.counter("ai01_host_session_crashes_total", "Sessions of the Agent Hosts which ended with an error.")
+
+HostedSessionState = Literal["starting", "running", "stopping", "stopped", "crashed"]
+"""
+State of a Hosted Session.
+"""
+
+SessionSetup = Callable[["HostedSession"], Union[Awaitable[None], None]]
+"""
+Called once the session's Agent and RealTimeModel are connected, to add the application's own listeners.
+"""
+
+ModelFactory = Callable[[Agent], Any]
+"""
+Creates the model of a session for its Agent, the model needs `connect`, `close` and a `conversation`,
+and may have a `wait_failure` coroutine returning the error which ended it, which crashes the session.
+"""
+
+
+class AgentHostOptions(BaseModel):
+    """
+    AgentHostOptions is the configuration for the AgentHost.
+    """
+
+    max_sessions: int = 50
+    """
+    Max Sessions is the number of sessions the host runs at most, Default is 50.
+    """
+
+    max_loop_lag_ms: float = 40
+    """
+    Max Loop Lag is the recent Event Loop lag in milliseconds above which new sessions are refused, Default is 40,
+    a loop lagging by more than a couple of 20ms frames delays the playout of every session.
+    """
+
+    lag_interval_ms: float = 100
+    """
+    Lag Interval is how often in milliseconds the Event Loop lag is measured, Default is 100.
+    """
+
+    lag_window: int = 50
+    """
+    Lag Window is the number of latest lag measurements the admission looks at, Default is 50, which is 5 seconds.
+    """
+
+    decode_backend: DecodeBackend = "inline"
+    """
+    Decode Backend of the sessions' RealTimeModels, Default is inline on the Event Loop, which kept the loop lag lower
+    than the shared decode thread pool as sessions were added in the `audio_delta_decode` benchmark. The pool is
+    deliberately left unused by default, it is only started once a session decodes with `thread`.
+    """
+
+    playout_clock: Optional[PlayoutClock] = None
+    """
+    Playout Clock pacing the Audio Tracks of every session, Default is the shared clock of the host's event loop.
+    """
+
+    session_pool: Optional[Any] = None
+    """
+    Session Pool is the RealtimeSessionPool the sessions' RealTimeModels take warm sessions from, unless their options have their own.
+    """
+
+    state_debounce_ms: int = 0
+    """
+    State Debounce of the sessions' Agents.
+    """
+
+    metrics_port: Optional[int] = None
+    """
+    Metrics Port serves the process metrics on `/metrics` when set, otherwise they are served on `AI01_METRICS_PORT` when that is set,
+    either server is stopped when the host is closed.
+    """
+
+    stop_timeout_s: float = 5.0
+    """
+    Stop Timeout is how long in seconds a session's teardown may take, Default is 5.
+    """
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class HostedSession:
+    """
+    Hosted Session is an Agent and its RealTimeModel running on the AgentHost, in a task of its own.
+    """
+
+    def __init__(self, id: str, agent: Agent, model: Any):
+        self.id = id
+        """
+        ID of the session, unique on the host.
+        """
+
+        self.agent = agent
+        """
+        Agent of the session.
+        """
+
+        self.model = model
+        """
+        Model of the session, a RealTimeModel unless the session was started with another model factory.
+        """
+
+        self.state: HostedSessionState = "starting"
+        """
+        State of the session.
+        """
+
+        self.error: Optional[BaseException] = None
+        """
+        Error which ended the session, when it crashed.
+        """
+
+        self.started_at = time.time()
+        """
+        Time the session was started, in seconds since the epoch.
+        """
+
+        self.task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+    def __repr__(self) -> str:
+        return f"<HostedSession {self.id} state={self.state}>"
+
+    def stop(self):
+        """
+        Ask the session to stop, `AgentHost.stop_session` also waits for its teardown.
+        """
+        self._stop.set()
+
+
+class AgentHost:
+    """
+    Agent Host runs many Agents, each with its RealTimeModel, on one Event Loop.
+
+    The sessions share the playout clock, the metrics and optionally a Realtime Session Pool.
+    A new session is admitted only while the host has room and the measured Event Loop lag is below `max_loop_lag_ms`,
+    as every session's playout runs on the same loop. Every session runs in a task of its own, an error in one session
+    tears down that session only.
+
+    Example Usage:
+        ```python
+        host = AgentHost(AgentHostOptions(max_sessions=20, metrics_port=9464))
+        await host.start()
+
+        session = await host.start_session(room_id, rtc_options, RealTimeModelOptions(oai_api_key=key))
+        ...
+        await host.close()
+        ```
+    """
+
+    def __init__(self, options: Optional[AgentHostOptions] = None, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.options = options = options or AgentHostOptions()
+
+        self.loop = loop or asyncio.get_event_loop()
+
+        # Playout Clock shared by the Audio Tracks of every session.
+        self.playout_clock = options.playout_clock or PlayoutClock.shared(loop=self.loop)
+
+        # Sessions running on the host, by ID.
+        self._sessions: Dict[str, HostedSession] = {}
+
+        # Lag of the Event Loop, every measurement and the latest ones the admission looks at.
+        self.loop_lag = Histogram(LAG_MS_BUCKETS)
+        self._recent_lag: Deque[float] = deque(maxlen=options.lag_window)
+
+        self._lag_tsk: Optional[asyncio.Task] = None
+        self._metrics_server = None
+        self._serves_env_metrics = False
+
+    def __repr__(self) -> str:
+        return f"<AgentHost sessions={len(self._sessions)}/{self.options.max_sessions} loop_lag={self.recent_loop_lag_ms:.1f}ms>"
+
+    @property
+    def sessions(self) -> Dict[str, HostedSession]:
+        return dict(self._sessions)
+
+    @property
+    def recent_loop_lag_ms(self) -> float:
+        """
+        Largest Event Loop lag in milliseconds of the latest `lag_window` measurements.
+        """
+        return max(self._recent_lag, default=0.0)
+
+    def admission(self) -> Optional[str]:
+        """
+        Reason a new session would be refused, None when it would be admitted.
+        """
+        if len(self._sessions) >= self.options.max_sessions:
+            return f"{len(self._sessions)} sessions running, the maximum is {self.options.max_sessions}"
+
+        lag = self.recent_loop_lag_ms
+
+        if lag > self.options.max_loop_lag_ms:
+            return f"Event Loop lag {lag:.1f}ms is above {self.options.max_loop_lag_ms}ms"
+
+        return None
+
+    async def start(self):
+        """
+        Start measuring the Event Loop lag, and serve the metrics on `metrics_port` or `AI01_METRICS_PORT`.
+        """
+        if self._lag_tsk is None:
+            self._lag_tsk = self.loop.create_task(self._measure_lag(), name="AgentHost-LoopLag")
+
+        if self.options.metrics_port is not None:
+            if self._metrics_server is None:
+                self._metrics_server = start_http_server(self.options.metrics_port)
+        else:
+            self._serves_env_metrics = serve_from_env() is not None
+
+    async def start_session(
+        self,
+        id: str,
+        rtc_options: RTCOptions,
+        model_options: Optional["RealTimeModelOptions"] = None,
+        setup: Optional[SessionSetup] = None,
+        model_factory: Optional[ModelFactory] = None,
+    ) -> HostedSession:
+        """
+        Start a session, its Agent joins the room of `rtc_options` with a RealTimeModel created from `model_options`,
+        or by `model_factory`. Returns once the session is running, raises AgentHostAdmissionError when it is refused
+        and the error of the session when it fails to start, in which case it is already torn down.
+        """
+        if id in self._sessions:
+            raise ValueError(f"Session {id} is already running")
+
+        if model_factory is None and model_options is None:
+            raise ValueError("Either model_options or model_factory is needed to start a session")
+
+        reason = self.admission()
+
+        if reason is not None:
+            REJECTED.inc()
+            logger.warning(f"Session {id} refused: {reason}")
+            raise AgentHostAdmissionError(reason)
+
+        agent: Optional[Agent] = None
+
+        try:
+            agent = Agent(
+                options=AgentOptions(
+                    rtc_options=rtc_options,
+                    audio_track=AudioTrack(AudioTrackOptions(playout_clock=self.playout_clock)),
+                    text_track=None,
+                    state_debounce_ms=self.options.state_debounce_ms,
+                )
+            )
+
+            if model_factory is not None:
+                model = model_factory(agent)
+            else:
+                model = self._create_model(agent, model_options)
+
+        except Exception:
+            # The session is not registered yet, so it holds no slot, its Audio Track lets go of the playout clock.
+            if agent is not None and agent.audio_track is not None:
+                agent.audio_track.stop()
+
+            logger.error(f"Session {id} could not be created", exc_info=True)
+            raise
+
+        session = HostedSession(id, agent, model)
+        started = self.loop.create_future()
+
+        self._sessions[id] = session
+        ADMITTED.inc()
+        HOSTED_SESSIONS.inc()
+
+        session.task = self.loop.create_task(self._run(session, setup, started), name=f"AgentHost-{id}")
+
+        await started
+
+        return session
+
+    async def stop_session(self, id: str) -> bool:
+        """
+        Stop a session and wait for its teardown, returns False when there is no such session.
+        """
+        session = self._sessions.get(id)
+
+        if session is None:
+            return False
+
+        session.stop()
+
+        if session.task is not None:
+            await asyncio.gather(session.task, return_exceptions=True)
+
+        return True
+
+    async def close(self):
+        """
+        Stop every session, stop measuring the Event Loop lag and stop serving the metrics.
+        """
+        await asyncio.gather(*(self.stop_session(id) for id in list(self._sessions)), return_exceptions=True)
+
+        if self._lag_tsk is not None:
+            self._lag_tsk.cancel()
+            self._lag_tsk = None
+
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server.server_close()
+            self._metrics_server = None
+
+        if self._serves_env_metrics:
+            stop_env_server()
+            self._serves_env_metrics = False
+
+    def _create_model(self, agent: Agent, model_options: "RealTimeModelOptions") -> "RealTimeModel":
+        # Imported here, the RealTimeModel imports the agent package.
+        from ..providers.openai.realtime.realtime_model import RealTimeModel
+
+        update: Dict[str, Any] = {
+            "loop": self.loop,
+            "audio_decode_backend": self.options.decode_backend,
+        }
+
+        if model_options.session_pool is None and self.options.session_pool is not None:
+            update["session_pool"] = self.options.session_pool
+
+        return RealTimeModel(agent=agent, options=model_options.copy(update=update))
+
+    async def _run(self, session: HostedSession, setup: Optional[SessionSetup], started: asyncio.Future):
+        session_logger = logger.getChild(session.id)
+
+        # Errors of the listeners of the session are logged, instead of being raised into the loop of another session.
+        session.agent.on("error", lambda e: session_logger.error(f"Agent listener error: {e!r}"))
+
+        if hasattr(session.model, "on"):
+            session.model.on("error", lambda e: session_logger.error(f"Model listener error: {e!r}"))
+
+        try:
+            await self._connect(session)
+
+            if setup is not None:
+                result = setup(session)
+
+                if asyncio.iscoroutine(result):
+                    await result
+
+            session.state = "running"
+            started.set_result(None)
+
+            session_logger.info("Session running")
+
+            await self._wait_stop(session)
+
+            session.state = "stopping"
+
+        except asyncio.CancelledError:
+            session.state = "stopping"
+            raise
+
+        except Exception as e:
+            session.state = "crashed"
+            session.error = e
+            CRASHES.inc()
+
+            session_logger.error(f"Session crashed: {e!r}", exc_info=True)
+
+        finally:
+            await self._teardown(session, session_logger)
+
+            if not started.done():
+                if session.error is not None:
+                    started.set_exception(session.error)
+                else:
+                    started.cancel()
+
+    async def _wait_stop(self, session: HostedSession):
+        # Wait until the session is asked to stop, the failure of its model is raised to crash the session.
+        wait_failure = getattr(session.model, "wait_failure", None)
+
+        if wait_failure is None:
+            await session._stop.wait()
+            return
+
+        stop = asyncio.ensure_future(session._stop.wait())
+        failure = asyncio.ensure_future(wait_failure())
+
+        try:
+            await asyncio.wait((stop, failure), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+            failure.cancel()
+
+        if not session._stop.is_set() and failure.done() and not failure.cancelled():
+            raise failure.result()
+
+    async def _connect(self, session: HostedSession):
+        agent = session.agent
+        model = session.model
+        conversation = model.conversation
+
+        room = await agent.join()
+
+        @room.on(RoomEvents.NewConsumerAdded)
+        def on_remote_consumer_added(data: RoomEventsData.NewConsumerAdded):
+            track = data["consumer"].track
+
+            if data["kind"] == "audio" and track is not None:
+                conversation.add_track(data["consumer_id"], track)
+
+        @room.on(RoomEvents.ConsumerClosed)
+        def on_remote_consumer_closed(data: RoomEventsData.ConsumerClosed):
+            conversation.remove_track(data["consumer_id"])
+
+        @room.on(RoomEvents.ConsumerPaused)
+        def on_remote_consumer_paused(data: RoomEventsData.ConsumerPaused):
+            conversation.pause_track(data["consumer_id"])
+
+        @room.on(RoomEvents.ConsumerResumed)
+        def on_remote_consumer_resumed(data: RoomEventsData.ConsumerResumed):
+            conversation.resume_track(data["consumer_id"])
+
+        await model.connect()
+        await agent.connect()
+
+        if agent.audio_track is not None:
+            await agent.rtc.produce(options=ProduceOptions(label="audio", track=agent.audio_track))
+
+    async def _teardown(self, session: HostedSession, session_logger: logging.Logger):
+        async def teardown():
+            await session.model.close()
+
+            if session.agent.audio_track is not None:
+                session.agent.audio_track.stop()
+
+            # Leave the room when the dRTC client supports it.
+            room = session.agent.rtc.room
+            leave = getattr(room, "leave", None) if room is not None else None
+
+            if leave is not None:
+                await leave()
+
+        try:
+            await asyncio.wait_for(teardown(), self.options.stop_timeout_s)
+        except Exception as e:
+            session_logger.error(f"Session teardown failed: {e!r}")
+        finally:
+            if session.state != "crashed":
+                session.state = "stopped"
+
+            if self._sessions.get(session.id) is session:
+                del self._sessions[session.id]
+                HOSTED_SESSIONS.dec()
+
+            session_logger.info(f"Session {session.state}")
+
+    async def _measure_lag(self):
+        interval = self.options.lag_interval_ms / 1000
+
+        while True:
+            expected = self.loop.time() + interval
+
+            await asyncio.sleep(interval)
+
+            lag = max(0.0, (self.loop.time() - expected) * 1000)
+
+            self.loop_lag.observe(lag)
+            self._recent_lag.append(lag)
+
+            LOOP_LAG.set(self.recent_loop_lag_ms)
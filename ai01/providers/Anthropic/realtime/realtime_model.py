@@ -5,18 +5,23 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from ai01.agent import Agent, AgentsEvents
+from ai01.agent import Agent, AgentsEvents, AgentState
 from ai01.utils.socket import SocketClient  # If not needed, you can remove this import
 from ....utils.emitter import EnhancedEventEmitter
+from ....utils.metrics import REGISTRY
 
 from . import _api
 from .conversation import Conversation
 
 import anthropic
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ACTIVE_SESSIONS = REGISTRY.gauge("ai01_realtime_sessions", "Connected RealTimeModel sessions, by provider.", ("provider",)).labels("anthropic")
+COMPLETIONS = REGISTRY.counter("ai01_anthropic_completions_total", "Completions streamed from the Anthropic API, by outcome.", ("outcome",))
+COMPLETIONS_OK = COMPLETIONS.labels("ok")
+COMPLETIONS_ERROR = COMPLETIONS.labels("error")
+
 
 class RealTimeModelOptions(BaseModel):
     """
@@ -88,6 +93,9 @@ class RealTimeModel(EnhancedEventEmitter):
         # Task that handles streaming completions
         self._stream_task: Optional[asyncio.Task] = None
 
+        # Counted is set while the model is counted in the active sessions.
+        self._counted = False
+
     def __str__(self):
         return f"AnthropicRealTimeModel: {self._opts.model}"
 
@@ -108,6 +116,22 @@ class RealTimeModel(EnhancedEventEmitter):
         # We can still start a background task if needed.
         self._stream_task = asyncio.create_task(self._main(), name="AnthropicModelMain")
 
+        if not self._counted:
+            self._counted = True
+            ACTIVE_SESSIONS.inc()
+
+    async def close(self):
+        """
+        Stop streaming completions.
+        """
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+
+        if self._counted:
+            self._counted = False
+            ACTIVE_SESSIONS.dec()
+
     def _build_prompt(self):
         """
         Build the prompt for Anthropic from instructions and conversation.
@@ -175,6 +199,8 @@ class RealTimeModel(EnhancedEventEmitter):
     async def _stream_completion(self, prompt: str):
         self._logger.info("Sending request to Anthropic completions API.")
 
+        self.agent.set_state(AgentState.Thinking)
+
         # Use the anthropic client to stream the response.
         # The anthropic-python client returns a generator when stream=True.
         # We'll iterate over it and handle tokens as they come in.
@@ -199,7 +225,7 @@ class RealTimeModel(EnhancedEventEmitter):
             async for token_data in response:
                 token = token_data.get("completion", "")
                 if token:
-                    self.agent.emit(AgentsEvents.Speaking)
+                    self.agent.set_state(AgentState.Speaking)
                     text_buffer += token
                     # We can emit partial text to the agent if desired.
                     # Once done, finalize.
@@ -221,9 +247,15 @@ class RealTimeModel(EnhancedEventEmitter):
 
             self._logger.info("Anthropic completion streaming done.")
 
+            COMPLETIONS_OK.inc()
+
         except Exception as e:
+            COMPLETIONS_ERROR.inc()
             self._logger.error(f"Error streaming from Anthropic: {e}")
 
+        finally:
+            self.agent.set_state(AgentState.Idle)
+
     async def send_user_message(self, user_text: str):
         """
         Called externally when a user message arrives.
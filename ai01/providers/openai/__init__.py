@@ -1,6 +1,7 @@
+from .audio_decoder import AudioDeltaDecoder, DecodeBackend
 from .audio_track import AudioTrack
 
-__all__ = ["AudioTrack"]
+__all__ = ["AudioTrack", "AudioDeltaDecoder", "DecodeBackend"]
 
 # Cleanup docs of unexported modules
 _module = dir()
@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Literal, Optional, Tuple
+
+from .audio_track import AudioTrack
+
+logger = logging.getLogger(__name__)
+
+DecodeBackend = Literal["inline", "thread"]
+"""
+Decode Backend is where the audio deltas are decoded.
+- `inline`: on the event loop, once per loop iteration for the whole batch.
+- `thread`: on the shared decode thread pool, keeping the event loop free for socket reads and playout.
+"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_decode_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide thread pool used by the `thread` decode backend.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="ai01-decode",
+            )
+
+        return _executor
+
+
+class AudioDeltaDecoder:
+    """
+    Audio Delta Decoder is the decode stage between the `response.audio.delta` events and the Audio Track.
+
+    Deltas are submitted as raw base64 strings and collected into a batch until the current loop iteration ends,
+    the batch is then decoded and written to the track through its thread-safe `write_pcm` producer API.
+    With the `thread` backend at most one batch per decoder is in flight, which keeps the audio in order,
+    deltas arriving meanwhile are collected into the next batch.
+    """
+
+    def __init__(
+        self,
+        track: AudioTrack,
+        backend: DecodeBackend = "inline",
+        executor: Optional[ThreadPoolExecutor] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.track = track
+        """
+        Audio Track receiving the decoded audio.
+        """
+
+        self.backend: DecodeBackend = backend
+        """
+        Backend the deltas are decoded on.
+        """
+
+        self.executor = executor
+        """
+        Thread pool of the `thread` backend, defaults to the process-wide decode pool.
+        """
+
+        self.loop = loop or asyncio.get_event_loop()
+
+        self._pending: List[Tuple[str, Optional[str], int]] = []
+        self._scheduled = False
+        self._in_flight = False
+        self._end_pending = False
+
+        self.batches = 0
+        """
+        Number of batches decoded.
+        """
+
+        self.deltas = 0
+        """
+        Number of deltas decoded.
+        """
+
+    def __repr__(self) -> str:
+        return f"<AudioDeltaDecoder backend={self.backend} pending={len(self._pending)} batches={self.batches} deltas={self.deltas}>"
+
+    def submit(self, delta: str, item_id: Optional[str] = None, content_index: int = 0):
+        """
+        Submit a base64 encoded PCM delta of the response item `item_id` for decoding, must be called from the event loop.
+        """
+        self._pending.append((delta, item_id, content_index))
+
+        if not self._scheduled:
+            self._scheduled = True
+            self.loop.call_soon(self._flush)
+
+    def end_of_response(self):
+        """
+        Mark the end of the current response, the track is told once every delta submitted before has been decoded.
+        """
+        self._end_pending = True
+        self._maybe_end()
+
+    def clear(self):
+        """
+        Drop the deltas which are not decoded yet, batches already in flight are dropped by the track's generation check.
+        """
+        self._pending.clear()
+        self._end_pending = False
+
+    def _flush(self):
+        self._scheduled = False
+
+        if not self._pending or self._in_flight:
+            return
+
+        batch = self._pending
+        self._pending = []
+
+        generation = self.track.generation
+
+        if self.backend == "inline":
+            self._decode(batch, generation)
+            self._maybe_end()
+            return
+
+        self._in_flight = True
+
+        executor = self.executor or get_decode_executor()
+        future = executor.submit(self._decode, batch, generation)
+        future.add_done_callback(lambda _: self.loop.call_soon_threadsafe(self._on_batch_done))
+
+    def _on_batch_done(self):
+        self._in_flight = False
+
+        if self._pending and not self._scheduled:
+            self._scheduled = True
+            self._flush()
+
+        self._maybe_end()
+
+    def _maybe_end(self):
+        if self._end_pending and not self._pending and not self._in_flight:
+            self._end_pending = False
+            self.track.end_of_response()
+
+    def _decode(self, batch: List[Tuple[str, Optional[str], int]], generation: int):
+        try:
+            for delta, item_id, content_index in batch:
+                self.track.write_pcm(
+                    base64.b64decode(delta),
+                    generation=generation,
+                    item_id=item_id,
+                    content_index=content_index,
+                )
+
+            self.batches += 1
+            self.deltas += len(batch)
+
+        except Exception as e:
+            logger.error(f"Error decoding audio deltas: {e}", exc_info=True)
@@ -1,17 +1,39 @@
-import asyncio
 import base64
-import fractions
 import logging
 import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Union
 
 import numpy as np
 from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
 from av import AudioFrame
-from av.audio.fifo import AudioFifo
 from pydantic import BaseModel
 
+from ...rtc.frame_pool import FramePool, get_frame_template
+from ...rtc.jitter_buffer import AdaptiveJitterBuffer, JitterBufferStats
+from ...rtc.playout_clock import PlayoutClock
+from ...utils.log import EventLogger, LogSampler
+from ...utils.metrics import REGISTRY
+from ...utils.ring_buffer import AudioRingBuffer
+
 logger = logging.getLogger(__name__)
 
+# Overflows repeat on every enqueue while the buffer is full, only one in 50 is logged.
+event_log = EventLogger(logger, LogSampler({"audio_track.overflow": 50}))
+
+PLAYED_FRAMES = REGISTRY.counter(
+    "ai01_track_frames_total",
+    "Frames returned by the audio tracks, by kind.",
+    ("kind",),
+)
+AUDIO_FRAMES = PLAYED_FRAMES.labels("audio")
+SILENCE_FRAMES = PLAYED_FRAMES.labels("silence")
+DROPPED_SAMPLES = REGISTRY.counter(
+    "ai01_track_dropped_samples_total",
+    "Samples dropped because the playout buffer was full.",
+)
+
 
 class AudioTrackOptions(BaseModel):
     """Audio Track Options"""
@@ -31,13 +53,89 @@ class AudioTrackOptions(BaseModel):
     Sample Width is the number of bytes per sample, Default is 2, which is 16 bits.
     """
 
+    buffer_capacity_ms: int = 30000
+    """
+    Buffer Capacity is the maximum amount of audio in milliseconds held by the playout buffer, Default is 30 seconds.
+    Audio written past the capacity is dropped.
+    """
+
+    playout_clock: Optional[PlayoutClock] = None
+    """
+    Playout Clock paces the frames returned by the track, Default is the clock shared by every track of the event loop it is played on.
+    """
+
+    jitter_buffer: bool = False
+    """
+    Jitter Buffer enables the adaptive jitter buffer, which holds back the start of every response, and playout after an underrun,
+    until enough audio is buffered to ride out bursty delta arrival, Default is False.
+    """
+
+    prebuffer_ms: int = 60
+    """
+    Prebuffer is the initial amount of audio in milliseconds held before the first frame of a response, Default is 60.
+    The jitter buffer adapts it from how the deltas of every response arrive.
+    """
+
+    jitter_min_ms: int = 20
+    """
+    Minimum target depth of the jitter buffer in milliseconds, Default is 20.
+    """
+
+    jitter_max_ms: int = 400
+    """
+    Maximum target depth of the jitter buffer in milliseconds, Default is 400.
+    This is also the longest playout is held when less than the target depth arrives.
+    """
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class PlayoutPosition:
+    """
+    Playout Position is how much of a response item's audio the track has played.
+    """
+
+    __slots__ = ("item_id", "content_index", "samples", "buffered", "sample_rate")
+
+    def __init__(self, item_id: Optional[str], content_index: int, sample_rate: int):
+        self.item_id = item_id
+        """
+        Item ID of the response item the audio belongs to, None for audio written without an item.
+        """
+
+        self.content_index = content_index
+        """
+        Content Index of the audio content part within the item.
+        """
+
+        self.samples = 0
+        """
+        Number of samples per channel of the item which were played.
+        """
+
+        self.buffered = 0
+        """
+        Number of samples per channel of the item which were buffered but not played, set when the buffer is flushed.
+        """
+
+        self.sample_rate = sample_rate
+
+    def __repr__(self) -> str:
+        return f"<PlayoutPosition item_id={self.item_id} content_index={self.content_index} audio_end_ms={self.audio_end_ms} buffered={self.buffered}>"
+
+    @property
+    def audio_end_ms(self) -> int:
+        """
+        Duration of the played audio of the item in milliseconds.
+        """
+        return self.samples * 1000 // self.sample_rate
+
 
 class AudioTrack(MediaStreamTrack):
     kind = "audio"
 
     def __init__(self, options=AudioTrackOptions()):
-        print("AudioTrack __init__")
-        breakpoint()
         super().__init__()
 
         # Audio configuration
@@ -45,89 +143,260 @@ class AudioTrack(MediaStreamTrack):
         self.channels = options.channels
         self.sample_width = options.sample_width  # 2 bytes per sample (16 bits)
 
-        self._start = None
         self._timestamp = 0
 
         self.AUDIO_PTIME = 0.020  # 20ms audio packetization
         self.frame_samples = int(self.AUDIO_PTIME * self.sample_rate)
 
-        # Audio FIFO buffer
-        self.audio_fifo = AudioFifo()
+        # Playout Clock releasing the frame slots, by default the clock shared by the tracks of the loop
+        # the track is played on, looked up on the first frame.
+        self.playout_clock: Optional[PlayoutClock] = options.playout_clock
+        self._first_slot: Optional[int] = None
+        self._next_slot: Optional[int] = None
+
+        # Audio Ring buffer, preallocated for the configured capacity.
+        self.audio_buffer = AudioRingBuffer(
+            capacity=int(options.buffer_capacity_ms * self.sample_rate / 1000),
+            channels=self.channels,
+        )
         self.fifo_lock = threading.Lock()
         self._lock = threading.Lock()
 
+        # Generation of the buffered audio, bumped on every flush so that late producers can't write stale audio.
+        self._generation = 0
+
+        # Draining is set once the current response is complete, so its tail is played out instead of held back.
+        self._draining = False
+
+        # Segments of the buffered audio per response item, as [item_id, content_index, samples], in playout order.
+        self._segments: Deque[List] = deque()
+
+        # Position of the response item currently being played.
+        self._playing: Optional[PlayoutPosition] = None
+
+        # Adaptive Jitter Buffer deciding when buffered audio may play, only when enabled.
+        self.jitter_buffer: Optional[AdaptiveJitterBuffer] = (
+            AdaptiveJitterBuffer(
+                sample_rate=self.sample_rate,
+                prebuffer_ms=options.prebuffer_ms,
+                min_depth_ms=options.jitter_min_ms,
+                max_depth_ms=options.jitter_max_ms,
+            )
+            if options.jitter_buffer
+            else None
+        )
+
+        # Audible is set while `recv` returns audio, On Audible is called when it returns audio after silence.
+        self._audible = False
+        self.on_audible: Optional[Callable[[], None]] = None
+
+        # Drained is set once the audio of a complete response was played, On Drained is then called outside the fifo lock,
+        # possibly from the thread which marked the end of the response.
+        self._drained = False
+        self.on_drained: Optional[Callable[[], None]] = None
+
+        # Frame Pool of reused output frames, `recv` fills their planes in place instead of allocating new frames.
+        self.frame_pool = FramePool(
+            get_frame_template(
+                sample_rate=self.sample_rate,
+                layout="mono" if self.channels == 1 else "stereo",
+                ptime=self.AUDIO_PTIME,
+            )
+        )
+
     def __repr__(self) -> str:
         return f"<AudioTrack kind={self.kind} state={self.readyState}> sample_rate={self.sample_rate} channels={self.channels} sample_width={self.sample_width}>"
 
+    @property
+    def jitter_stats(self) -> Optional[JitterBufferStats]:
+        """
+        Underrun counts and buffer depth of the jitter buffer, None when the jitter buffer is disabled.
+        """
+        return self.jitter_buffer.stats if self.jitter_buffer else None
+
+    @property
+    def playout_position(self) -> Optional[PlayoutPosition]:
+        """
+        Position of the response item currently being played, None before any item audio was played.
+        """
+        return self._playing
+
+    @property
+    def generation(self) -> int:
+        """
+        Generation of the buffered audio, it changes every time the buffer is flushed.
+        Producers decoding off the event loop pass the generation they started with to `write_pcm`.
+        """
+        return self._generation
+
     def enqueue_audio(self, base64_audio: str):
-        """Process and add audio data directly to the AudioFifo"""
+        """Process and add audio data directly to the Audio Ring Buffer"""
         if self.readyState != "live":
             return
 
         try:
-            audio_bytes = base64.b64decode(base64_audio)
-            audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-            audio_array = audio_array.reshape(self.channels, -1)
+            self.write_pcm(base64.b64decode(base64_audio))
 
-            frame = AudioFrame.from_ndarray(
-                audio_array,
-                format="s16",
-                layout="mono" if self.channels == 1 else "stereo",
+        except Exception as e:
+            logger.error(f"Error in enqueue_audio: {e}", exc_info=True)
+
+    def write_pcm(
+        self,
+        pcm: Union[bytes, np.ndarray],
+        generation: Optional[int] = None,
+        item_id: Optional[str] = None,
+        content_index: int = 0,
+    ) -> int:
+        """
+        Write decoded interleaved int16 PCM into the Audio Ring Buffer, this is safe to call from any thread.
+
+        When `generation` is given and the buffer was flushed since, the audio is stale and is dropped.
+        `item_id` and `content_index` identify the response item the audio belongs to, for played-sample accounting.
+        Returns the number of samples per channel written.
+        """
+        if self.readyState != "live":
+            return 0
+
+        audio_array = (
+            pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype=np.int16)
+        )
+
+        with self.fifo_lock:
+            if generation is not None and generation != self._generation:
+                return 0
+
+            written = self.audio_buffer.write(audio_array)
+
+            if written:
+                segments = self._segments
+
+                if (
+                    segments
+                    and segments[-1][0] == item_id
+                    and segments[-1][1] == content_index
+                ):
+                    segments[-1][2] += written
+                else:
+                    segments.append([item_id, content_index, written])
+
+                if self.jitter_buffer is not None:
+                    self.jitter_buffer.on_write(written, time.monotonic())
+
+        dropped = audio_array.size // self.channels - written
+
+        if dropped > 0:
+            DROPPED_SAMPLES.inc(dropped)
+            event_log.warning(
+                "audio_track.overflow", "Audio buffer full", dropped_samples=dropped
             )
-            frame.sample_rate = self.sample_rate
-            frame.time_base = fractions.Fraction(1, self.sample_rate)
 
-            with self.fifo_lock:
-                self.audio_fifo.write(frame)
+        return written
 
-        except Exception as e:
-            logger.error(f"Error in enqueue_audio: {e}", exc_info=True)
+    def end_of_response(self):
+        """
+        Mark the audio of the current response as complete, the buffered tail is played out without being held back,
+        and once it is drained the jitter buffer adapts and waits for the next response.
+        """
+        with self.fifo_lock:
+            if self.audio_buffer.available:
+                self._draining = True
+            else:
+                self._on_drained()
 
-    def flush_audio(self):
-        """Flush the audio FIFO buffer"""
+        self._notify_drained()
+
+    def flush_audio(self) -> Optional[PlayoutPosition]:
+        """
+        Flush the Audio Ring Buffer.
+
+        Returns the position of the response item which was being played, with the number of its samples dropped
+        by the flush in `buffered`, which is what the server needs to truncate the item to what the user heard.
+        """
         with self.fifo_lock:
-            self.audio_fifo = AudioFifo()
+            position = self._playing
+
+            if position is not None:
+                position.buffered = sum(
+                    seg[2]
+                    for seg in self._segments
+                    if seg[0] == position.item_id and seg[1] == position.content_index
+                )
+
+            self.audio_buffer.clear()
+            self._segments.clear()
+            self._playing = None
+            self._generation += 1
+            self._draining = False
+            self._drained = False
+
+            if self.jitter_buffer is not None:
+                self.jitter_buffer.reset()
+
+        return position
+
+    def _on_drained(self):
+        # Called with the fifo lock held.
+        self._draining = False
+        self._drained = True
+
+        if self.jitter_buffer is not None:
+            self.jitter_buffer.on_drained()
+
+    def _notify_drained(self):
+        if not self._drained:
+            return
+
+        self._drained = False
+
+        if self.on_drained is not None:
+            self.on_drained()
 
     async def recv(self) -> AudioFrame:
         """Receive the next audio frame"""
         if self.readyState != "live":
             raise MediaStreamError
 
-        if self._start is None:
-            self._start = asyncio.get_event_loop().time()
-            self._timestamp = 0
+        if self._next_slot is None:
+            if self.playout_clock is None:
+                self.playout_clock = PlayoutClock.shared(self.AUDIO_PTIME)
+
+            self.playout_clock.register(self)
 
-        samples = self.frame_samples
-        self._timestamp += samples
+        slot = await self.playout_clock.next_slot(self._next_slot)
 
-        target_time = self._start + (self._timestamp / self.sample_rate)
-        current_time = asyncio.get_event_loop().time()
-        wait = target_time - current_time
+        if self._first_slot is None:
+            self._first_slot = slot
 
-        if wait > 0:
-            await asyncio.sleep(wait)
+        self._next_slot = slot + 1
+        self._timestamp = (slot - self._first_slot + 1) * self.frame_samples
 
         try:
-            # Read frames from the FIFO buffer
+            pooled = self.frame_pool.acquire()
+
+            # Read samples from the Ring buffer straight into the pooled frame
             with self.fifo_lock:
-                frame = self.audio_fifo.read(samples)
-
-            if frame is None:
-                # If no data is available, generate silence
-                frame = AudioFrame(
-                    format="s16",
-                    layout="mono" if self.channels == 1 else "stereo",
-                    samples=samples,
-                )
-                for p in frame.planes:
-                    p.update(np.zeros(samples, dtype=np.int16).tobytes())
+                read = self._read_frame(pooled.samples)
+
+            if self._drained:
+                self._notify_drained()
+
+            if read:
+                pooled.silent = False
+                frame = pooled.frame
 
-                frame.sample_rate = self.sample_rate
-                frame.time_base = fractions.Fraction(1, self.sample_rate)
+                AUDIO_FRAMES.inc()
+
+                if not self._audible:
+                    self._audible = True
+
+                    if self.on_audible is not None:
+                        self.on_audible()
             else:
-                # Update frame properties
-                frame.sample_rate = self.sample_rate
-                frame.time_base = fractions.Fraction(1, self.sample_rate)
+                # If no data is available, send the cached silence
+                frame = self.frame_pool.fill_silence(pooled)
+                self._audible = False
+
+                SILENCE_FRAMES.inc()
 
             # Set frame PTS
             frame.pts = self._timestamp
@@ -138,7 +407,65 @@ class AudioTrack(MediaStreamTrack):
             logger.error(f"Error in recv: {e}", exc_info=True)
             raise MediaStreamError("Error processing audio frame")
 
+    def _read_frame(self, out: np.ndarray) -> int:
+        # Called with the fifo lock held, fills `out` and returns the samples read, 0 to play silence.
+        buffer = self.audio_buffer
+        jitter = self.jitter_buffer
+
+        if jitter is not None and not jitter.ready(
+            buffer.available, self._draining, time.monotonic()
+        ):
+            return 0
+
+        read = buffer.read_into(out)
+
+        if not read and self._draining and buffer.available:
+            # The tail of the response is shorter than a frame, pad it with silence.
+            read = buffer.read_available_into(out)
+            out[read * self.channels :].fill(0)
+
+        if read:
+            self._account_played(read)
+
+            if jitter is not None:
+                jitter.on_frame(buffer.available)
+
+            if self._draining and not buffer.available:
+                self._on_drained()
+
+        elif jitter is not None and not jitter.buffering and not self._draining:
+            jitter.on_underrun()
+
+        return read
+
+    def _account_played(self, count: int):
+        # Called with the fifo lock held, attributes `count` played samples to the buffered response items.
+        segments = self._segments
+
+        while count and segments:
+            segment = segments[0]
+            position = self._playing
+
+            if (
+                position is None
+                or position.item_id != segment[0]
+                or position.content_index != segment[1]
+            ):
+                position = self._playing = PlayoutPosition(
+                    segment[0], segment[1], self.sample_rate
+                )
+
+            played = min(count, segment[2])
+            position.samples += played
+            segment[2] -= played
+            count -= played
+
+            if not segment[2]:
+                segments.popleft()
+
     def stop(self) -> None:
         """Stop the track"""
         if self.readyState == "live":
+            if self.playout_clock is not None:
+                self.playout_clock.unregister(self)
             super().stop()
@@ -11,12 +11,19 @@ from ._api import (
     Voice,
 )
 from .realtime_model import RealTimeModel, RealTimeModelOptions
+from .session_pool import PooledSession, RealtimeSessionPool, SessionPoolStats
+from .turn_tracer import TurnStats, TurnTracer
 
 __all__ = [
     "api",
     "RealTimeModel",
     "RealTimeModels",
     "RealTimeModelOptions",
+    "RealtimeSessionPool",
+    "PooledSession",
+    "SessionPoolStats",
+    "TurnTracer",
+    "TurnStats",
     "ClientEvent",
     "ServerEvent",
     "Voice",
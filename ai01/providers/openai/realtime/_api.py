@@ -481,6 +481,7 @@ class ServerEvent:
         event_id: str
         type: Literal["response.text.done"]
         response_id: str
+        item_id: str
         output_index: int
         content_index: int
         text: str
@@ -497,6 +498,7 @@ class ServerEvent:
         event_id: str
         type: Literal["response.audio_transcript.done"]
         response_id: str
+        item_id: str
         output_index: int
         content_index: int
         transcript: str
@@ -505,6 +507,7 @@ class ServerEvent:
         event_id: str
         type: Literal["response.audio.delta"]
         response_id: str
+        item_id: str
         output_index: int
         content_index: int
         delta: str  # b64
@@ -513,6 +516,7 @@ class ServerEvent:
         event_id: str
         type: Literal["response.audio.done"]
         response_id: str
+        item_id: str
         output_index: int
         content_index: int
 
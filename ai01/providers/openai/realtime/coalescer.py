@@ -0,0 +1,162 @@
+import time
+from typing import Optional
+
+from ....utils.histogram import Histogram
+
+CHUNK_MS_BUCKETS = (10, 20, 40, 60, 80, 100, 150, 200, 300, 500, 1000)
+
+
+class InputAudioStats:
+    """
+    Input Audio Stats are the statistics of the `input_audio_buffer.append` messages sent to the Model.
+    """
+
+    __slots__ = ("messages", "bytes", "chunk_ms", "_started")
+
+    def __init__(self):
+        self.messages = 0
+        """
+        Number of append messages sent.
+        """
+
+        self.bytes = 0
+        """
+        Number of PCM bytes sent, before base64 encoding.
+        """
+
+        self.chunk_ms = Histogram(CHUNK_MS_BUCKETS)
+        """
+        Duration of the audio per message in milliseconds.
+        """
+
+        self._started = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"<InputAudioStats messages={self.messages} messages_per_second={self.messages_per_second:.1f} bytes_per_message={self.bytes_per_message:.0f}>"
+
+    @property
+    def messages_per_second(self) -> float:
+        """
+        Average rate of append messages since the stats were created.
+        """
+        elapsed = time.monotonic() - self._started
+        return self.messages / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_message(self) -> float:
+        """
+        Average PCM bytes per append message.
+        """
+        return self.bytes / self.messages if self.messages else 0.0
+
+    def record(self, size: int, sample_rate: int, sample_width: int = 2):
+        """
+        Record an append message of `size` PCM bytes.
+        """
+        self.messages += 1
+        self.bytes += size
+        self.chunk_ms.observe(size * 1000 / (sample_rate * sample_width))
+
+
+class InputChunkCoalescer:
+    """
+    Input Chunk Coalescer groups the input audio into append messages of a target duration.
+
+    Audio is held until `chunk_ms` of it is pending, which is then sent as one message.
+    Audio is never held longer than `max_hold_ms`, and everything pending is released at once on `flush`,
+    e.g. on a speech boundary, so that the end of an utterance is not delayed by the target size.
+    A larger target trades a little latency for fewer messages, less JSON and WebSocket framing overhead.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        chunk_ms: int = 100,
+        max_hold_ms: int = 200,
+        sample_width: int = 2,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+        self.chunk_bytes = max(sample_width, int(sample_rate * chunk_ms / 1000) * sample_width)
+        """
+        Target size of a message in PCM bytes.
+        """
+
+        self.max_hold = max_hold_ms / 1000
+        """
+        Longest time in seconds audio is held before it is sent.
+        """
+
+        self.stats = InputAudioStats()
+
+        self._pending = bytearray()
+        self._pending_since: Optional[float] = None
+        self._flush = False
+
+    def __repr__(self) -> str:
+        return f"<InputChunkCoalescer chunk_bytes={self.chunk_bytes} pending={len(self._pending)} stats={self.stats}>"
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of PCM bytes held.
+        """
+        return len(self._pending)
+
+    def add(self, pcm: bytes):
+        """
+        Add PCM audio to be sent.
+        """
+        if not pcm:
+            return
+
+        if not self._pending:
+            self._pending_since = time.monotonic()
+
+        self._pending += pcm
+
+    def flush(self):
+        """
+        Release everything pending with the next `take`.
+        """
+        if self._pending:
+            self._flush = True
+
+    def hold_remaining(self) -> Optional[float]:
+        """
+        Seconds until the pending audio must be sent, None when nothing is pending.
+        """
+        if self._pending_since is None:
+            return None
+
+        return max(0.0, self._pending_since + self.max_hold - time.monotonic())
+
+    def take(self) -> Optional[bytes]:
+        """
+        Take the next message to send, None when the pending audio should be held.
+        """
+        pending = self._pending
+
+        if not pending:
+            return None
+
+        if len(pending) >= self.chunk_bytes and not self._flush:
+            size = self.chunk_bytes
+        elif self._flush or self.hold_remaining() == 0:
+            size = len(pending)
+        else:
+            return None
+
+        chunk = bytes(pending[:size])
+        del pending[:size]
+
+        if pending:
+            self._pending_since = time.monotonic()
+        else:
+            self._pending_since = None
+            self._flush = False
+
+        self.stats.record(len(chunk), self.sample_rate, self.sample_width)
+
+        return chunk
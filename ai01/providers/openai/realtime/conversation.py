@@ -1,24 +1,48 @@
 import asyncio
 import logging
-from typing import Dict
+from typing import AsyncIterator, Dict, Optional, Set
 
-from aiortc.mediastreams import MediaStreamTrack
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
 
-from ....rtc.audio_resampler import AudioResampler
+from ....rtc.audio_mixer import AudioMixer
+from ....rtc.audio_resampler import AudioResampler, OverflowPolicy
+from ....rtc.vad import VadStats, VoiceActivityGate
+from ....utils.metrics import REGISTRY
 from . import _exceptions
 
 logger = logging.getLogger(__name__)
 
+ACTIVE_TRACKS = REGISTRY.gauge("ai01_conversation_tracks", "Tracks being mixed into the Conversations.")
+RECEIVED_FRAMES = REGISTRY.counter("ai01_conversation_frames_total", "Frames received from the tracks of the Conversations.")
+
 class Conversation:
-    def __init__(self, id: str):
+    def __init__(
+        self,
+        id: str,
+        vad: Optional[VoiceActivityGate] = None,
+        capacity_ms: int = 2000,
+        overflow_policy: OverflowPolicy = "drop_oldest",
+    ):
         self.id = id
         """
         Conversation ID for the Realtime Conversation.
         """
 
-        self.audio_resampler = AudioResampler(format="s16", layout="mono", rate=16000)
+        self.vad = vad
         """
-        Audio Resampler for the Realtime Conversation, takes in Audio Frame and resamples it to the desired format.
+        Voice Activity Gate for the Realtime Conversation, when set only the audio which is likely speech is received.
+        """
+
+        self.audio_mixer = AudioMixer(
+            rate=16000,
+            layout="mono",
+            capacity_ms=capacity_ms,
+            overflow_policy=overflow_policy,
+            on_high_water=self._on_high_water,
+        )
+        """
+        Audio Mixer for the Realtime Conversation, resamples the Audio Frames of every track to the desired format and mixes them into one stream.
+        Every track buffers at most `capacity_ms` of audio, what happens to the audio which does not fit is decided by the `overflow_policy`.
         """
 
         self._logger = logger.getChild("Conversation")
@@ -26,9 +50,14 @@ class Conversation:
         Logger for the Conversation.
         """
 
-        self._track_fut: Dict[str, asyncio.Future] = {}
+        self._track_fut: Dict[str, asyncio.Task] = {}
         """
-        Track Futures for different tracks.
+        Track Futures for different tracks, removed once a track's task is done.
+        """
+
+        self._paused: Set[str] = set()
+        """
+        IDs of the tracks which are paused, their frames are dropped without being resampled.
         """
 
         self._active = True
@@ -36,6 +65,11 @@ class Conversation:
         Is the Conversation Active.
         """
 
+        self._ready = asyncio.Event()
+        """
+        Set when mixed audio is ready to be received, or when the Conversation stops.
+        """
+
     def __str__(self):
         return f"Conversation ID: {self.id}"
     
@@ -49,6 +83,13 @@ class Conversation:
     @property
     def active(self):
         return self._active
+
+    @property
+    def vad_stats(self) -> Optional[VadStats]:
+        """
+        Stats of the Voice Activity Gate, including the percentage of the audio which was suppressed.
+        """
+        return self.vad.stats if self.vad else None
     
     def add_track(self, id: str, track: MediaStreamTrack):
         """
@@ -61,34 +102,169 @@ class Conversation:
         if self._track_fut.get(id):
             raise _exceptions.RealtimeModelError("Track is already started.")
 
+        self.audio_mixer.add_track(id)
+
         async def handle_audio_frame():
             try:
                 while self._active and track.readyState != "ended":
                     frame = await track.recv()
-                    
-                    frame.pts = None
 
-                    if frame is None:
+                    if frame is None or id in self._paused:
                         continue
-                    
-                    self.audio_resampler.resample(frame)
+
+                    RECEIVED_FRAMES.inc()
+
+                    await self.audio_mixer.wait_writable(id)
+
+                    self.audio_mixer.push(id, frame)
+
+                    if not self._ready.is_set() and self.audio_mixer.ready():
+                        self._ready.set()
+            except MediaStreamError:
+                self.logger.debug(f"Track {id} ended")
             except Exception as e:
                 self.logger.error(f"Error in handling audio frame: {e}")
 
-        self._started_fut = asyncio.create_task(handle_audio_frame(), name=f"Conversation-{id}")
+        task = asyncio.create_task(handle_audio_frame(), name=f"Conversation-{id}")
+        task.add_done_callback(lambda task: self._reap_track(id, task))
+
+        self._track_fut[id] = task
+
+        ACTIVE_TRACKS.inc()
+
+    def remove_track(self, id: str) -> bool:
+        """
+        Remove a Track from the Conversation, its task is cancelled and its buffered audio is dropped.
+        Returns False when the Track is not in the Conversation.
+        """
+        task = self._track_fut.pop(id, None)
+
+        self._paused.discard(id)
+        self.audio_mixer.remove_track(id)
+
+        if task is None:
+            return False
+
+        ACTIVE_TRACKS.dec()
+        task.cancel()
+
+        return True
+
+    def pause_track(self, id: str):
+        """
+        Pause a Track, its frames are dropped without being resampled and it no longer holds back the mix until it is resumed.
+        """
+        if id not in self._track_fut or id in self._paused:
+            return
+
+        self._paused.add(id)
+        self.audio_mixer.remove_track(id)
+
+    def resume_track(self, id: str):
+        """
+        Resume a paused Track, its audio is mixed again from the next frame on.
+        """
+        if id not in self._paused:
+            return
+
+        self._paused.discard(id)
+
+        if id in self._track_fut:
+            self.audio_mixer.add_track(id)
+
+    async def close(self):
+        """
+        Close the Conversation, stopping it and cancelling the tasks of every track.
+        """
+        self.stop()
+
+        tasks = list(self._track_fut.values())
+
+        for id in list(self._track_fut):
+            self.remove_track(id)
 
-        self._track_fut[id] = self._started_fut
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _reap_track(self, id: str, task: asyncio.Task):
+        # A track's task is done, e.g. the track ended, forget it unless it was already replaced.
+        if self._track_fut.get(id) is not task:
+            return
+
+        del self._track_fut[id]
+
+        ACTIVE_TRACKS.dec()
+
+        self._paused.discard(id)
+        self.audio_mixer.remove_track(id)
+
+    def _on_high_water(self, id: str, resampler: AudioResampler):
+        self.logger.warning(
+            f"Input audio of Track {id} is falling behind, {resampler.buffered_ms:.0f}ms buffered, {resampler.stats.dropped_samples} samples dropped"
+        )
 
     def stop(self):
         """
-        Stop the Conversation and clear the Audio FIFO Buffer.
+        Stop the Conversation and clear the buffered audio.
         """
         self._active = False
 
-        self.audio_resampler.clear()
+        self.audio_mixer.clear()
+
+        if self.vad:
+            self.vad.reset()
+            self.logger.info(f"Voice Activity Gate suppressed {self.vad.stats.suppressed_percent:.1f}% of the audio")
+
+        # Wake up the consumers, so that they see the Conversation stopped.
+        self._ready.set()
 
     def recv(self):
         """
-        Receive the resampled audio frame from the Audio Resampler.
+        Receive the mixed audio of every track which is ready, as PCM bytes, None when no audio is ready.
+        With a Voice Activity Gate, audio which is not speech is dropped and None is returned for it.
         """
-        return self.audio_resampler.recv()
\ No newline at end of file
+        chunks = []
+
+        while (block := self.audio_mixer.mix()) is not None:
+            if self.vad:
+                block = self.vad.process(block)
+
+                if block is None:
+                    continue
+
+            chunks.append(block.tobytes())
+
+        self._ready.clear()
+
+        if not chunks:
+            return None
+
+        return b"".join(chunks)
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until mixed audio is ready to be received, without polling.
+        Returns False when the Conversation stopped or the timeout expired first.
+        """
+        if not self._ready.is_set():
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+
+        return self._active
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Stream the mixed audio as PCM bytes, waking up only when audio is ready, the stream ends when the Conversation stops.
+
+        Example Usage:
+            ```python
+            async for pcm in conversation.stream():
+                await send(pcm)
+            ```
+        """
+        while await self.wait_ready():
+            audio_chunk = self.recv()
+
+            if audio_chunk is not None:
+                yield audio_chunk
\ No newline at end of file
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from typing import List, Literal, Optional
+
+from . import _api
+
+MirrorRole = Literal["user", "assistant"]
+
+
+class MirroredItem:
+    """
+    Mirrored Item is the local copy of a conversation item, kept as text.
+    """
+
+    __slots__ = ("item_id", "role", "text")
+
+    def __init__(self, item_id: str, role: MirrorRole, text: Optional[str] = None):
+        self.item_id = item_id
+        self.role: MirrorRole = role
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"<MirroredItem {self.item_id} role={self.role} text={self.text!r}>"
+
+
+class ConversationMirror:
+    """
+    Conversation Mirror keeps a local, text only copy of the latest conversation items, so that the context can be
+    restored on a new session after a reconnect or a rotation.
+
+    Items are kept in the order the server created them, their text is filled in once the transcript of the
+    user's audio or the assistant's response is known. Only the latest `max_items` items are kept.
+    """
+
+    def __init__(self, max_items: int = 20):
+        self.max_items = max_items
+        """
+        Maximum number of items kept.
+        """
+
+        self._items: "OrderedDict[str, MirroredItem]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"<ConversationMirror items={len(self._items)}>"
+
+    def add(self, item_id: str, role: str, text: Optional[str] = None):
+        """
+        Add an item created by the server, items of other roles than user and assistant are ignored.
+        """
+        if role not in ("user", "assistant") or self.max_items <= 0:
+            return
+
+        item = self._items.get(item_id)
+
+        if item is None:
+            self._items[item_id] = MirroredItem(item_id, role, text)  # type: ignore[arg-type]
+        elif text:
+            item.text = text
+
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def set_text(self, item_id: str, text: str):
+        """
+        Set the text of an item, e.g. once its transcript is done.
+        """
+        item = self._items.get(item_id)
+
+        if item is not None:
+            item.text = text
+
+    def remove(self, item_id: str):
+        """
+        Remove an item, e.g. once it was deleted on the server.
+        """
+        self._items.pop(item_id, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def items(self) -> List[_api.ClientEvent.ConversationItemCreateContent]:
+        """
+        The mirrored items which have text, as items to create on a new session, without ids so the new session assigns its own.
+        """
+        items: List[_api.ClientEvent.ConversationItemCreateContent] = []
+
+        for item in self._items.values():
+            if not item.text:
+                continue
+
+            if item.role == "user":
+                items.append(
+                    {  # type: ignore[typeddict-item]
+                        "type": "message",
+                        "role": "user",
+                        "content": [{"type": "input_text", "text": item.text}],
+                    }
+                )
+            else:
+                items.append(
+                    {  # type: ignore[typeddict-item]
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "text", "text": item.text}],
+                    }
+                )
+
+        return items
@@ -1,24 +1,49 @@
 import asyncio
-import base64
-import json
 import logging
+import time
 import uuid
-from typing import Literal, Optional, Union
+from typing import Awaitable, Callable, Dict, Literal, Optional, Union, get_args
 
 import asyncio
 
+import numpy as np
 from pydantic import BaseModel
 
-from ai01.agent import Agent, AgentsEvents
-from ai01.utils.socket import SocketClient
+from ai01.agent import Agent, AgentState
+from ai01.utils.json_codec import JsonBackend
+from ai01.utils.log import EventLogger, LogSampler
+from ai01.utils.metrics import REGISTRY
 
+from ....rtc.audio_resampler import OverflowPolicy
+from ....rtc.vad import VoiceActivityGate
 from ....utils.emitter import EnhancedEventEmitter
+from ....utils.ring_buffer import AudioRingBuffer
+from ..audio_decoder import AudioDeltaDecoder, DecodeBackend
+from ..audio_track import PlayoutPosition
 from . import _api, _exceptions
+from .append_encoder import AppendEncoder
+from .coalescer import InputAudioStats, InputChunkCoalescer
 from .conversation import Conversation
+from .mirror import ConversationMirror
+from .reconnect import RECONNECT_MS_BUCKETS, ReconnectStats, backoff_delay
+from .rotation import RotationStats
+from .session_pool import PooledSession, RealtimeSessionPool, create_socket, session_update
+from .turn_tracer import TurnStats, TurnTracer
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ACTIVE_SESSIONS = REGISTRY.gauge("ai01_realtime_sessions", "Connected RealTimeModel sessions, by provider.", ("provider",)).labels("openai")
+SERVER_EVENTS = REGISTRY.counter("ai01_realtime_server_events_total", "Server events received from the RealTime API, by type.", ("type",))
+SERVER_EVENTS_BY_TYPE = {event: SERVER_EVENTS.labels(event) for event in (*get_args(_api.ServerEventType), "unknown")}
+AUDIO_DELTA_BYTES = REGISTRY.counter("ai01_realtime_audio_delta_bytes_total", "PCM bytes of the audio deltas received.")
+INPUT_AUDIO_BYTES = REGISTRY.counter("ai01_realtime_input_audio_bytes_total", "PCM bytes of input audio sent upstream.")
+OUTAGES = REGISTRY.counter("ai01_realtime_outages_total", "Times the socket to the RealTime API was lost.")
+RECONNECTS = REGISTRY.counter("ai01_realtime_reconnects_total", "Sessions restored after the socket was lost.")
+RECONNECT_DURATION = REGISTRY.histogram(
+    "ai01_realtime_reconnect_duration_ms", "Time from losing the socket to restoring the session, in milliseconds.", buckets=RECONNECT_MS_BUCKETS
+)
+ROTATIONS = REGISTRY.counter("ai01_realtime_rotations_total", "Sessions rotated before they expired.")
+
 
 class RealTimeModelOptions(BaseModel):
     """
@@ -90,6 +115,114 @@ class RealTimeModelOptions(BaseModel):
     Server VAD which means Voice Activity Detection is the configuration for the VAD, to detect the voice activity.
     """
 
+    client_vad: bool = False
+    """
+    Client VAD gates the input audio on the client, so that only the audio which is likely speech is sent to the Model,
+    the pre-roll and hangover of the gate follow `server_vad_opts`, defaults to False.
+    """
+
+    audio_decode_backend: DecodeBackend = "inline"
+    """
+    Audio Decode Backend is where the audio deltas returned by the Model are decoded, defaults to inline on the Event Loop,
+    use `thread` to decode them on the shared decode thread pool.
+    """
+
+    input_buffer_ms: int = 2000
+    """
+    Input Buffer is the most input audio in milliseconds buffered per track before it is mixed, defaults to 2s.
+    """
+
+    input_overflow_policy: OverflowPolicy = "drop_oldest"
+    """
+    Input Overflow Policy decides what happens to a track's input audio which does not fit in its buffer, defaults to `drop_oldest`,
+    see `OverflowPolicy`.
+    """
+
+    input_chunk_ms: int = 100
+    """
+    Input Chunk is the target duration in milliseconds of the audio sent per `input_audio_buffer.append` message, defaults to 100ms.
+    Larger chunks mean fewer messages and less encoding overhead, at the cost of a little input latency.
+    """
+
+    input_max_hold_ms: int = 200
+    """
+    Input Max Hold is the longest time in milliseconds input audio is held back while coalescing, defaults to 200ms.
+    """
+
+    flush_on_speech_boundary: bool = True
+    """
+    Flush On Speech Boundary sends the held input audio straight away when speech starts or stops,
+    so that coalescing never delays the end of the user's turn.
+    """
+
+    reconnect: bool = True
+    """
+    Reconnect restores the session when the socket to the RealTime API is lost, defaults to True.
+    """
+
+    reconnect_max_attempts: int = 10
+    """
+    Reconnect Max Attempts is the number of reconnect attempts before giving up, defaults to 10.
+    """
+
+    reconnect_backoff_ms: int = 250
+    """
+    Reconnect Backoff is the base of the exponential backoff between reconnect attempts in milliseconds, jittered, defaults to 250ms.
+    """
+
+    reconnect_max_backoff_ms: int = 10000
+    """
+    Reconnect Max Backoff is the longest wait between reconnect attempts in milliseconds, defaults to 10s.
+    """
+
+    outage_buffer_ms: int = 5000
+    """
+    Outage Buffer is the latest input audio in milliseconds kept while reconnecting, and sent once the session is restored, defaults to 5s.
+    """
+
+    replay_items: int = 20
+    """
+    Replay Items is the number of latest conversation items mirrored as text and replayed into a new session, defaults to 20.
+    """
+
+    json_codec: JsonBackend = "stdlib"
+    """
+    JSON Codec is the JSON backend used to encode and decode the socket messages, defaults to the standard library,
+    use `orjson` or `auto` to use orjson when it is installed.
+    """
+
+    turn_summary_interval_s: Optional[float] = 60
+    """
+    Turn Summary Interval is how often in seconds the percentiles of the turn latencies are logged, None to not log them.
+    """
+
+    log_sample_rates: Dict[str, int] = {
+        "response.audio.delta": 50,
+        "response.audio_transcript.delta": 50,
+        "response.text.delta": 50,
+        "response.function_call_arguments.delta": 50,
+    }
+    """
+    Log Sample Rates is the sampling of the server events logged at DEBUG, an event type is logged once every N occurrences,
+    defaults to once every 50 deltas.
+    """
+
+    rotate_before_s: float = 120
+    """
+    Rotate Before is how many seconds before the session's `expires_at` a replacement session is opened,
+    the Model switches over to it on the next turn boundary, defaults to 120s, 0 disables the rotation.
+    """
+
+    rotation_boundary_timeout_s: float = 60
+    """
+    Rotation Boundary Timeout is the longest time in seconds a rotation waits for a turn boundary before switching anyway, defaults to 60s.
+    """
+
+    session_pool: Optional[RealtimeSessionPool] = None
+    """
+    Session Pool keeps warm sessions to the RealTime API, `connect` takes one from it when available, defaults to None.
+    """
+
     loop: Optional[asyncio.AbstractEventLoop] = None
     """
     Loop is the Event Loop to be used for the RealTimeModel, defaults to the current Event Loop.
@@ -110,16 +243,16 @@ class RealTimeModel(EnhancedEventEmitter):
         # Loop is the Event Loop to be used for the RealTimeModel.
         self.loop = options.loop or asyncio.get_event_loop()
 
+        super().__init__(loop=self.loop)
+
+        # Handlers is the dispatch registry of the server events, keyed by the ServerEventType.
+        self._handlers = self._build_handlers()
+
         # Socket is the WebSocket connection to the RealTime API.
-        self.socket = SocketClient(
-            url=f"{self._opts.base_url}?model={self._opts.model}",
-            headers={
-                "Authorization": f"Bearer {self._opts.oai_api_key}",
-                "OpenAI-Beta": "realtime=v1",
-            },
-            loop=self.loop,
-            json=True,
-        )
+        self.socket = create_socket(self._opts, self.loop)
+
+        # Session is the Session of the RealTime API as last reported by the server.
+        self._session: Optional[_api.Resource.Session] = None
 
         # Turn Detection is the configuration for the VAD, to detect the voice activity.
         self.turn_detection = options.server_vad_opts
@@ -127,12 +260,101 @@ class RealTimeModel(EnhancedEventEmitter):
         # Logger for RealTimeModel.
         self._logger = logger.getChild(f"RealTimeModel-{self._opts.model}")
 
+        # Event Log is the sampled logger of the server events.
+        self._event_log = EventLogger(self._logger, LogSampler(options.log_sample_rates))
+
         # Conversation is the Conversations which being are happening with the RealTimeModel.
-        self._conversation: Conversation = Conversation(id = str(uuid.uuid4()))
+        self._conversation: Conversation = Conversation(
+            id=str(uuid.uuid4()),
+            vad=VoiceActivityGate.from_server_vad(options.server_vad_opts) if options.client_vad else None,
+            capacity_ms=options.input_buffer_ms,
+            overflow_policy=options.input_overflow_policy,
+        )
 
         # Main Task is the Audio Append the RealTimeModel.
         self._main_tsk: Optional[asyncio.Future] = None
 
+        # Listen Task is the task reading the server events from the socket.
+        self._listen_tsk: Optional[asyncio.Task] = None
+
+        # Failure is set to the error which ended the listen or the audio append task, e.g. a socket which could not be restored.
+        self._failure: asyncio.Future = self.loop.create_future()
+
+        # Flush Task sends the input audio held by the coalescer on a speech boundary.
+        self._flush_tsk: Optional[asyncio.Task] = None
+
+        # Rotation Task opens the replacement session before the current one expires.
+        self._rotation_tsk: Optional[asyncio.Task] = None
+
+        # Rotation Stats are the counters and timings of the session rotations.
+        self._rotation_stats = RotationStats()
+
+        # Turn Boundary is set while neither the user nor the Model has a turn in progress.
+        self._turn_boundary = asyncio.Event()
+        self._turn_boundary.set()
+
+        # User Speaking is set between speech started and speech stopped.
+        self._user_speaking = False
+
+        # Awaiting Response is set from speech stopped until the Model starts its Response.
+        self._awaiting_response = False
+
+        # Audio Decoder is the decode stage feeding the audio deltas to the Agent's Audio Track.
+        self._audio_decoder: Optional[AudioDeltaDecoder] = (
+            AudioDeltaDecoder(
+                track=self.agent.audio_track,
+                backend=self._opts.audio_decode_backend,
+                loop=self.loop,
+            )
+            if self.agent.audio_track
+            else None
+        )
+
+        # Turn Tracer timestamps every turn from the end of the user's speech to the first audio played.
+        self._tracer = TurnTracer()
+
+        if self.agent.audio_track:
+            self.agent.audio_track.on_audible = self._tracer.first_audio
+
+        # Turn Summary Task logs the turn latencies periodically.
+        self._turn_summary_tsk: Optional[asyncio.Task] = None
+
+        # Rate Limits are the rate limits last reported by the server.
+        self._rate_limits: list = []
+
+        # Response ID of the Response being generated by the Model, None when no Response is in progress.
+        self._response_id: Optional[str] = None
+
+        # Append Encoder writes the input_audio_buffer.append messages straight from the PCM bytes.
+        self._append_encoder = AppendEncoder()
+
+        # Conversation Mirror keeps the latest items as text, to restore the context on a new session.
+        self._mirror = ConversationMirror(max_items=self._opts.replay_items)
+
+        # Reconnect Stats are the counters and timings of the reconnects.
+        self._reconnect_stats = ReconnectStats()
+
+        # Outage Buffer holds the latest input audio while reconnecting.
+        self._outage_buffer = AudioRingBuffer(
+            max(1, self._conversation.audio_mixer.rate * self._opts.outage_buffer_ms // 1000)
+        )
+
+        # Reconnecting is set while the session is being restored after the socket was lost.
+        self._reconnecting = False
+
+        # Closing is set once the RealTimeModel is closed, so a closed socket is not reconnected.
+        self._closing = False
+
+        # Counted is set while the RealTimeModel is counted in the active sessions.
+        self._counted = False
+
+        # Input Coalescer groups the Conversation's audio into append messages of the configured duration.
+        self._input_coalescer = InputChunkCoalescer(
+            sample_rate=self._conversation.audio_mixer.rate,
+            chunk_ms=self._opts.input_chunk_ms,
+            max_hold_ms=self._opts.input_max_hold_ms,
+        )
+
     def __str__(self):
         return f"RealTimeModel: {self._opts.model}"
     
@@ -143,6 +365,42 @@ class RealTimeModel(EnhancedEventEmitter):
     def conversation(self):
         return self._conversation
 
+    @property
+    def input_audio_stats(self) -> InputAudioStats:
+        """
+        Input Audio Stats are the message rate and size of the audio appended to the Model.
+        """
+        return self._input_coalescer.stats
+
+    @property
+    def rate_limits(self) -> list:
+        """
+        Rate Limits are the rate limits of the session as last reported by the server.
+        """
+        return self._rate_limits
+
+    @property
+    def turn_stats(self) -> TurnStats:
+        """
+        Turn Stats are the latencies of the session's turns, from the end of the user's speech to the first audio played
+        and to the end of the response, the latencies of every session are in `TurnTracer.process_stats`.
+        """
+        return self._tracer.stats
+
+    @property
+    def reconnect_stats(self) -> ReconnectStats:
+        """
+        Reconnect Stats are the outages, reconnects and reconnect durations of the RealTimeModel.
+        """
+        return self._reconnect_stats
+
+    @property
+    def rotation_stats(self) -> RotationStats:
+        """
+        Rotation Stats are the counts and timings of the proactive session rotations.
+        """
+        return self._rotation_stats
+
     async def connect(self):
         """
         Connects the RealTimeModel to the RealTime API.
@@ -152,15 +410,34 @@ class RealTimeModel(EnhancedEventEmitter):
                 f"Connecting to OpenAI RealTime Model at {self._opts.base_url}"
             )
 
-            await self.socket.connect()
+            pooled = self._opts.session_pool.acquire(self._opts) if self._opts.session_pool else None
+
+            if pooled is not None:
+                # A warm session is already connected and configured.
+                self.socket = pooled.socket
+                self._session = pooled.session
+
+                self._logger.info(f"Using warm session {pooled.id}")
+
+                self._schedule_rotation()
+            else:
+                await self.socket.connect()
 
-            asyncio.create_task(self._socket_listen(), name="Socket-Listen")
+            self._listen_tsk = self._watch(asyncio.create_task(self._socket_listen(), name="Socket-Listen"))
 
-            await self._session_create()
+            if pooled is None:
+                await self._session_create()
 
             self._logger.info("Connected to OpenAI RealTime Model")
 
-            self._main_tsk = asyncio.create_task(self._main(), name="RealTimeModel-Main")
+            if not self._counted:
+                self._counted = True
+                ACTIVE_SESSIONS.inc()
+
+            self._main_tsk = self._watch(asyncio.create_task(self._main(), name="RealTimeModel-Main"))
+
+            if self._opts.turn_summary_interval_s and self._turn_summary_tsk is None:
+                self._turn_summary_tsk = asyncio.create_task(self._turn_summary(), name="RealTimeModel-TurnSummary")
 
         except _exceptions.RealtimeModelNotConnectedError:
             raise 
@@ -169,6 +446,65 @@ class RealTimeModel(EnhancedEventEmitter):
             self._logger.error(f"Error connecting to RealTime API: {e}")
             raise _exceptions.RealtimeModelSocketError()
     
+    async def close(self):
+        """
+        Close the RealTimeModel, stopping the Conversation and closing the connection to the RealTime API.
+        """
+        self._closing = True
+
+        if self._counted:
+            self._counted = False
+            ACTIVE_SESSIONS.dec()
+
+        for task in (self._main_tsk, self._listen_tsk, self._flush_tsk, self._rotation_tsk, self._turn_summary_tsk):
+            if task is not None:
+                task.cancel()
+
+        await self.conversation.close()
+        await self.socket.aclose()
+
+        self._logger.info("Closed OpenAI RealTime Model")
+
+    async def wait_failure(self) -> BaseException:
+        """
+        Wait until the session fails for good, e.g. the socket was lost and could not be restored, and return the error.
+        The RealTimeModel is not closed, its owner is expected to close it.
+        """
+        return await asyncio.shield(self._failure)
+
+    def _watch(self, task: asyncio.Task) -> asyncio.Task:
+        # The error of a watched task fails the session, once, unless the RealTimeModel is closing.
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    def _on_task_done(self, task: asyncio.Task):
+        if task.cancelled() or self._closing or self._failure.done():
+            return
+
+        error = task.exception()
+
+        if error is not None:
+            self._logger.error(f"Task {task.get_name()} failed: {error!r}")
+            self._failure.set_result(error)
+
+    async def _turn_summary(self):
+        """
+        Log the percentiles of the turn latencies of the session and of the process every `turn_summary_interval_s`.
+        """
+        interval = self._opts.turn_summary_interval_s
+        logged = -1
+
+        while True:
+            await asyncio.sleep(interval)
+
+            if self._tracer.stats.turns == logged:
+                continue
+
+            logged = self._tracer.stats.turns
+
+            self._logger.info(f"Turn latency, session: {self._tracer.stats.summary()}")
+            self._logger.info(f"Turn latency, process: {TurnTracer.process_stats.summary()}")
+
     async def _session_create(self):
         """
         Session Updated is the Event Handler for the Session Update Event.
@@ -179,28 +515,7 @@ class RealTimeModel(EnhancedEventEmitter):
             if not self.socket.connected:
                 raise _exceptions.RealtimeModelNotConnectedError()
 
-            opts = self._opts
-
-            session_data: _api.ClientEvent.SessionUpdateData = {
-                "instructions": self._opts.instructions,
-                "voice": opts.voice,
-                "input_audio_format": opts.input_audio_format,
-                "input_audio_transcription": {"model": "whisper-1"},
-                "max_response_output_tokens": self._opts.max_response_output_tokens,
-                "modalities": opts.modalities,
-                "temperature": opts.temperature,
-                "tools": [],
-                "turn_detection": opts.server_vad_opts,
-                "output_audio_format": opts.output_audio_format,
-                "tool_choice": opts.tool_choice,
-            }
-
-            payload: _api.ClientEvent.SessionUpdate = {
-                "session": session_data,
-                "type": "session.update",
-            }
-
-            await self.socket.send(payload)
+            await self.socket.send(session_update(self._opts))
 
         except Exception as e:
             self._logger.error(f"Error Sending Session Update Event: {e}")
@@ -209,92 +524,305 @@ class RealTimeModel(EnhancedEventEmitter):
     async def _send_audio_append(self, audio_byte: bytes):
         """
         Send Audio Append is the method to send the Audio Append Event to the RealTime API.
+        While reconnecting, the audio is kept in the outage buffer instead.
         """
-        if not self.socket.connected:
-            raise _exceptions.RealtimeModelNotConnectedError()
-        
-        pcm_base64 = base64.b64encode(audio_byte).decode("utf-8")
+        if self._reconnecting or not self.socket.connected:
+            if not self._opts.reconnect or self._closing:
+                raise _exceptions.RealtimeModelNotConnectedError()
 
-        payload: _api.ClientEvent.InputAudioBufferAppend = {
-            "event_id": str(uuid.uuid4()),
-            "type": "input_audio_buffer.append",
-            "audio": pcm_base64,
-        }
+            dropped = len(audio_byte) // 2 - self._outage_buffer.free
 
-        await self.socket.send(payload)
+            if dropped > 0:
+                self._reconnect_stats.dropped_audio_ms += dropped * 1000 / self._conversation.audio_mixer.rate
+
+            self._outage_buffer.write(audio_byte, overwrite=True)
+            return
+
+        payload = self._append_encoder.encode(audio_byte)
+
+        INPUT_AUDIO_BYTES.inc(len(audio_byte))
+
+        await self.socket.send(payload, priority="audio", raw=True)
+
+    def _schedule_input_flush(self):
+        """
+        Send the input audio held by the coalescer on a speech boundary, from a task of its own,
+        so that the server events are not held up while the audio sends wait for room in the send queue.
+        """
+        if not self._opts.flush_on_speech_boundary:
+            return
+
+        self._input_coalescer.flush()
+
+        # A flush in progress takes the audio released now as well.
+        if self._flush_tsk is None or self._flush_tsk.done():
+            self._flush_tsk = asyncio.create_task(self._flush_input_audio(), name="RealTimeModel-InputFlush")
+
+    async def _flush_input_audio(self):
+        """
+        Flush Input Audio sends the input audio released by the coalescer.
+        """
+        try:
+            while (chunk := self._input_coalescer.take()) is not None:
+                await self._send_audio_append(chunk)
+        except _exceptions.RealtimeModelError as e:
+            self._logger.warning(f"Could not flush the input audio: {e}")
 
     async def _socket_listen(self):
         """
-        Listen to the WebSocket
+        Listen to the WebSocket, reconnecting when the connection is lost.
+        """
+        while True:
+            socket = self.socket
+
+            try:
+                if not socket.connected:
+                    raise _exceptions.RealtimeModelNotConnectedError()
+
+                async for message in socket.ws:
+                    await self._handle_message(message)
+            except Exception as e:
+                logger.error(f"Error listening to WebSocket: {e}")
+
+            if self._closing:
+                return
+
+            if self.socket is not socket:
+                # The session was rotated, listen to the replacement session.
+                continue
+
+            if not self._opts.reconnect:
+                raise _exceptions.RealtimeModelSocketError()
+
+            await self._reconnect()
+
+    async def _reconnect(self):
+        """
+        Reconnect restores the session after the socket was lost, with jittered exponential backoff between attempts.
+        The session is configured again, the mirrored items are replayed and the input audio kept meanwhile is sent.
         """
+        stats = self._reconnect_stats
+        stats.outages += 1
+        OUTAGES.inc()
+
+        started = time.monotonic()
+
+        self._reconnecting = True
+        self._on_connection_lost()
+
         try:
-            if not self.socket.connected:
-                raise _exceptions.RealtimeModelNotConnectedError()
+            for attempt in range(self._opts.reconnect_max_attempts):
+                await asyncio.sleep(
+                    backoff_delay(attempt, self._opts.reconnect_backoff_ms, self._opts.reconnect_max_backoff_ms)
+                )
 
-            async for message in self.socket.ws:
-                await self._handle_message(message)
-        except Exception as e:
-            logger.error(f"Error listening to WebSocket: {e}")
+                if self._closing:
+                    return
 
-            raise _exceptions.RealtimeModelSocketError()
-        
+                try:
+                    self._logger.info(f"Reconnecting to OpenAI RealTime Model, attempt {attempt + 1}")
+
+                    await self.socket.connect()
+                    await self._session_create()
+                    await self._replay_items()
+
+                    break
+                except Exception as e:
+                    stats.failed_attempts += 1
+                    self._logger.warning(f"Reconnect attempt {attempt + 1} failed: {e}")
+            else:
+                self._logger.error(f"Could not reconnect after {self._opts.reconnect_max_attempts} attempts")
+                raise _exceptions.RealtimeModelSocketError()
+        finally:
+            self._reconnecting = False
+
+        duration = (time.monotonic() - started) * 1000
+
+        stats.reconnects += 1
+        RECONNECTS.inc()
+        stats.duration.observe(duration)
+        RECONNECT_DURATION.observe(duration)
+
+        self._logger.info(f"Reconnected to OpenAI RealTime Model in {duration:.0f}ms")
+
+        await self._send_outage_audio()
+
+    def _schedule_rotation(self):
+        """
+        Schedule the rotation of the current session ahead of its `expires_at`.
+        """
+        if self._rotation_tsk is not None:
+            self._rotation_tsk.cancel()
+            self._rotation_tsk = None
+
+        if not self._opts.rotate_before_s or not self._session or not self._session.get("expires_at") or self._closing:
+            return
+
+        delay = self._session["expires_at"] - self._opts.rotate_before_s - time.time()
+
+        self._rotation_tsk = asyncio.create_task(self._rotate(max(0.0, delay)), name="RealTimeModel-Rotation")
+
+    def _update_turn_boundary(self):
+        if self._user_speaking or self._awaiting_response or self._response_id is not None:
+            self._turn_boundary.clear()
+        else:
+            self._turn_boundary.set()
+
+    async def _rotate(self, delay: float):
+        """
+        Rotate opens a replacement session before the current one expires, and switches over to it on a turn boundary,
+        so the conversation goes on without the pause of a server side cutoff and reconnect.
+        """
+        await asyncio.sleep(delay)
+
+        stats = self._rotation_stats
+        started = time.monotonic()
+
+        pooled: Optional[PooledSession] = None
+        switched = False
+
+        # The replacement session is closed on every way out before the switch, including the task being cancelled
+        # by `close` or by a new rotation being scheduled.
+        try:
+            pooled = self._opts.session_pool.acquire(self._opts) if self._opts.session_pool else None
+
+            try:
+                if pooled is None:
+                    pooled = PooledSession(create_socket(self._opts, self.loop))
+
+                    await pooled.socket.connect()
+
+                    pooled.start()
+
+                    await pooled.socket.send(session_update(self._opts))
+                    await asyncio.wait_for(pooled.ready.wait(), self._opts.rotation_boundary_timeout_s)
+            except Exception as e:
+                stats.failures += 1
+                self._logger.error(f"Could not prepare the replacement session: {e}")
+                return
+
+            prepared = time.monotonic()
+            stats.prepare.observe((prepared - started) * 1000)
+
+            try:
+                await asyncio.wait_for(self._turn_boundary.wait(), self._opts.rotation_boundary_timeout_s)
+            except asyncio.TimeoutError:
+                stats.forced += 1
+                self._logger.warning("No turn boundary before the rotation timeout, switching sessions mid-turn")
+
+            boundary = time.monotonic()
+            stats.boundary_wait.observe((boundary - prepared) * 1000)
+
+            if self._reconnecting or self._closing:
+                return
+
+            # Switch over, the audio pump sends through `self.socket` and follows straight away.
+            pooled.detach()
+            switched = True
+        finally:
+            if pooled is not None and not switched:
+                await pooled.close()
+
+        previous = self.socket
+        self.socket = pooled.socket
+        self._session = pooled.session
+
+        await self._replay_items()
+
+        stats.switch.observe((time.monotonic() - boundary) * 1000)
+        stats.rotations += 1
+        ROTATIONS.inc()
+
+        self._logger.info(
+            f"Rotated to session {pooled.id} in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+
+        # Closing the previous socket ends its listener, which then listens to the replacement session.
+        await previous.aclose()
+
+        self._rotation_tsk = None
+        self._schedule_rotation()
+
+    def _on_connection_lost(self):
+        """
+        The Response in progress is lost with the connection, let the Audio Track play out what it already has.
+        """
+        self._response_id = None
+        self._user_speaking = False
+        self._awaiting_response = False
+        self._update_turn_boundary()
+
+        if self._audio_decoder:
+            self._audio_decoder.end_of_response()
+
+    async def _replay_items(self):
+        """
+        Replay Items creates the mirrored conversation items on the new session, to restore the context.
+        The mirror is refilled from the items the new session creates, with their new ids.
+        """
+        items = self._mirror.items()
+
+        self._mirror.clear()
+
+        for item in items:
+            payload: _api.ClientEvent.ConversationItemCreate = {
+                "type": "conversation.item.create",
+                "item": item,
+            }
+
+            await self.socket.send(payload)
+
+        if items:
+            self._logger.info(f"Replayed {len(items)} conversation items")
+
+    async def _send_outage_audio(self):
+        """
+        Send the input audio kept in the outage buffer, in chunks of the coalescer's size.
+        """
+        buffer = self._outage_buffer
+        chunk = np.empty(self._input_coalescer.chunk_bytes // 2, dtype=np.int16)
+
+        while buffer.available:
+            count = buffer.read_available_into(chunk)
+
+            await self._send_audio_append(chunk[:count].tobytes())
 
     async def _handle_message(self, message: Union[str, bytes]):
-        data = json.loads(message)
+        data = self.socket.codec.loads(message)
+
+        await self._dispatch(data)
 
+    async def _dispatch(self, data: dict):
+        """
+        Dispatch a server event to its handler, then to the listeners subscribed to it with `on`.
+        """
         event: _api.ServerEventType = data.get("type", "unknown")
 
-        if event == "session.created":
-            self._handle_session_created(data)
-        elif event == "error":
-            self._handle_error(data)
-        elif event == "input_audio_buffer.speech_started":
-            self._handle_input_audio_buffer_speech_started(data)
-        elif event == "input_audio_buffer.speech_stopped":
-            self._handle_input_audio_buffer_speech_stopped(data)
-        elif event == "response.audio_transcript.delta":
-            self._handle_response_audio_transcript_delta(data)
-        # elif event == "input_audio_buffer.committed":
-        #     self._handle_input_audio_buffer_speech_committed(data)
-        # elif (
-        #     event == "conversation.item.input_audio_transcription.completed"
-        # ):
-        #     self._handle_conversation_item_input_audio_transcription_completed(
-        #         data
-        #     )
-        # elif event == "conversation.item.input_audio_transcription.failed":
-        #     self._handle_conversation_item_input_audio_transcription_failed(
-        #         data
-        #     )
-        # elif event == "conversation.item.created":
-        #     self._handle_conversation_item_created(data)
-        # elif event == "conversation.item.deleted":
-        #     self._handle_conversation_item_deleted(data)
-        # elif event == "conversation.item.truncated":
-        #     self._handle_conversation_item_truncated(data)
-        # elif event == "response.created":
-        #     self._handle_response_created(data)
-        # elif event == "response.output_item.added":
-        #     self._handle_response_output_item_added(data)
-        # elif event == "response.content_part.added":
-        #     self._handle_response_content_part_added(data)
-        elif event == "response.audio.delta":
-            self._handle_response_audio_delta(data)
-        # elif event == "response.audio.done":
-        #     self._handle_response_audio_done(data)
-        # elif event == "response.text.done":
-        #     self._handle_response_text_done(data)
-        # elif event == "response.audio_transcript.done":
-        #     self._handle_response_audio_transcript_done(data)
-        # elif event == "response.content_part.done":
-        #     self._handle_response_content_part_done(data)
-        # elif event == "response.output_item.done":
-        #     self._handle_response_output_item_done(data)
-        # elif event == "response.done":
-        #     self._handle_response_done(data)
+        SERVER_EVENTS_BY_TYPE.get(event, SERVER_EVENTS_BY_TYPE["unknown"]).inc()
 
-        
-        self._logger.info(f"Unhandled Event: {event}")
+        handler = self._handlers.get(event)
+
+        if handler is None:
+            self._event_log.debug(event, "Unhandled Event")
+            return
+
+        result = handler(data)
+
+        if result is not None:
+            await result
+
+        if self._events.get(event):
+            self.emit(event, data)
+
+    def _build_handlers(self) -> Dict[str, Callable[[dict], Optional[Awaitable[None]]]]:
+        """
+        Build the dispatch registry, every server event type is handled by its `_handle_<event>` method,
+        e.g. `response.audio.delta` by `_handle_response_audio_delta`.
+        """
+        return {
+            event: getattr(self, f"_handle_{event.replace('.', '_')}")
+            for event in get_args(_api.ServerEventType)
+        }
 
     def _handle_response_output_item_done(self, data: dict):
         """
@@ -320,17 +848,46 @@ class RealTimeModel(EnhancedEventEmitter):
         """
         self._logger.info("Conversation Item Deleted")
 
+        self._mirror.remove(data["item_id"])
+
     def _handle_conversation_item_created(self, data: dict):
         """
         Conversation Item Created is the Event Handler for the Conversation Item Created Event.
         """
         self._logger.info("Conversation Item Created")
 
+        item = data["item"]
+
+        if item.get("type") != "message":
+            return
+
+        text = "".join(
+            part.get("text") or part.get("transcript") or ""
+            for part in item.get("content", [])
+        )
+
+        self._mirror.add(item["id"], item.get("role", ""), text or None)
+
     def _handle_session_created(self, data: dict):
         """
         Session Created is the Event Handler for the Session Created Event.
         """
         self._logger.info("Session Created")
+
+        self._session = data["session"]
+        self._schedule_rotation()
+
+    def _handle_session_updated(self, data: dict):
+        """
+        Session Updated is the Event Handler for the Session Updated Event.
+        """
+        self._logger.info("Session Updated")
+
+        if self._session is None or self._session.get("expires_at") != data["session"].get("expires_at"):
+            self._session = data["session"]
+            self._schedule_rotation()
+        else:
+            self._session = data["session"]
     
     def _handle_error(self, data: dict):
         """
@@ -338,35 +895,148 @@ class RealTimeModel(EnhancedEventEmitter):
         """
         self._logger.error(f"Error: {data}")
 
-    def _handle_input_audio_buffer_speech_started(self, data: dict):
+    async def _handle_input_audio_buffer_speech_started(self, data: dict):
         """
         Speech Started is the Event Handler for the Speech Started Event.
         """
         self._logger.info("Speech Started")
 
+        self._tracer.speech_started()
+        self.agent.set_state(AgentState.Listening)
+        self._user_speaking = True
+        self._update_turn_boundary()
+
+        # Interrupt first, the cancel and truncate are control messages which never wait behind the audio sends.
         if self.agent.audio_track:
-            self.agent.audio_track.flush_audio()
+            if self._audio_decoder:
+                self._audio_decoder.clear()
+
+            position = self.agent.audio_track.flush_audio()
 
-            self.agent.emit(AgentsEvents.Listening)
+            await self._interrupt(position)
 
-    def _handle_input_audio_buffer_speech_stopped(self, data: dict):
+        self._schedule_input_flush()
+
+    async def _interrupt(self, position: Optional[PlayoutPosition]):
+        """
+        Interrupt is called when the user barges in, it cancels the Response in progress and truncates the
+        interrupted assistant item to the audio which was actually played, so that the unheard audio does not stay in the context.
+        """
+        interrupted = self._response_id is not None
+
+        if interrupted:
+            await self._send_response_cancel()
+
+        if position is None or position.item_id is None:
+            return
+
+        if interrupted or position.buffered:
+            await self._send_conversation_item_truncate(
+                item_id=position.item_id,
+                content_index=position.content_index,
+                audio_end_ms=position.audio_end_ms,
+            )
+
+    async def _send_response_cancel(self):
+        """
+        Send Response Cancel is the method to cancel the Response in progress.
+        """
+        payload: _api.ClientEvent.ResponseCancel = {
+            "type": "response.cancel",
+        }
+
+        await self.socket.send(payload)
+
+    async def _send_conversation_item_truncate(self, item_id: str, content_index: int, audio_end_ms: int):
+        """
+        Send Conversation Item Truncate is the method to truncate the audio of an assistant item to `audio_end_ms`.
+        """
+        self._logger.info(f"Truncating Item {item_id} at {audio_end_ms}ms")
+
+        payload: _api.ClientEvent.ConversationItemTruncate = {
+            "type": "conversation.item.truncate",
+            "item_id": item_id,
+            "content_index": content_index,
+            "audio_end_ms": audio_end_ms,
+        }
+
+        await self.socket.send(payload)
+
+    async def _handle_input_audio_buffer_speech_stopped(self, data: dict):
         """
         Speech Stopped is the Event Handler for the Speech Stopped Event.
         """
         self._logger.info("Speech Stopped")
 
-    def _handle_input_audio_buffer_speech_committed(self, data: dict):
+        self._tracer.speech_stopped()
+        self.agent.set_state(AgentState.Thinking)
+        self._user_speaking = False
+        self._awaiting_response = True
+        self._update_turn_boundary()
+
+        self._schedule_input_flush()
+
+    def _handle_input_audio_buffer_committed(self, data: dict):
         """
-        Speech Committed is the Event Handler for the Speech Committed Event.
+        Speech Committed is the Event Handler for the Input Audio Buffer Committed Event.
         """
         self._logger.info("Speech Committed")
 
+        self._tracer.mark("committed")
+
+    def _handle_input_audio_buffer_cleared(self, data: dict):
+        """
+        Input Audio Buffer Cleared is the Event Handler for the Input Audio Buffer Cleared Event.
+        """
+        self._logger.info("Input Audio Buffer Cleared")
+
+    def _handle_conversation_created(self, data: dict):
+        """
+        Conversation Created is the Event Handler for the Conversation Created Event.
+        """
+        self._logger.info(f"Conversation Created: {data['conversation']['id']}")
+
+    def _handle_response_text_delta(self, data: dict):
+        """
+        Response Text Delta is the Event Handler for the Response Text Delta Event.
+        """
+        self._event_log.debug("response.text.delta", "Response Text Delta", item_id=data.get("item_id"))
+
+    def _handle_response_function_call_arguments_delta(self, data: dict):
+        """
+        Response Function Call Arguments Delta is the Event Handler for the Response Function Call Arguments Delta Event.
+        """
+        self._event_log.debug(
+            "response.function_call_arguments.delta",
+            "Response Function Call Arguments Delta",
+            call_id=data.get("call_id"),
+        )
+
+    def _handle_response_function_call_arguments_done(self, data: dict):
+        """
+        Response Function Call Arguments Done is the Event Handler for the Response Function Call Arguments Done Event,
+        no tools are configured on the session, the call is logged for the subscribers of the event to handle.
+        """
+        self._logger.info(f"Response Function Call Arguments Done: {data.get('name')}")
+
+    def _handle_rate_limits_updated(self, data: dict):
+        """
+        Rate Limits Updated is the Event Handler for the Rate Limits Updated Event.
+        """
+        self._rate_limits = data.get("rate_limits", [])
+
+        for limit in self._rate_limits:
+            if limit.get("remaining") == 0:
+                self._logger.warning(f"Rate Limit {limit.get('name')} exhausted, resets in {limit.get('reset_seconds')}s")
+
     def _handle_conversation_item_input_audio_transcription_completed(self, data: dict):
         """
         Input Audio Transcription Completed is the Event Handler for the Input Audio Transcription Completed Event.
         """
         self._logger.info("Input Audio Transcription Completed")
 
+        self._mirror.set_text(data["item_id"], data["transcript"])
+
     def _handle_conversation_item_input_audio_transcription_failed(self, data: dict):
         """
         Input Audio Transcription Failed is the Event Handler for the Input Audio Transcription Failed Event.
@@ -379,12 +1049,26 @@ class RealTimeModel(EnhancedEventEmitter):
         """
         self._logger.info("Response Done")
 
+        self._tracer.mark("response_done")
+
+        # A Response without audio ends here, one with audio ends once the Audio Track played it out.
+        if self.agent.state == AgentState.Thinking:
+            self.agent.set_state(AgentState.Idle)
+
+        self._response_id = None
+        self._update_turn_boundary()
+
     def _handle_response_created(self, data: dict):
         """
         Response Created is the Event Handler for the Response Created Event.
         """
         self._logger.info("Response Created")
 
+        self._tracer.mark("response_created")
+        self._response_id = data["response"]["id"]
+        self._awaiting_response = False
+        self._update_turn_boundary()
+
     def _handle_response_output_item_added(self, data: dict):
         """
         Response Output Item Added is the Event Handler for the Response Output Item Added Event.
@@ -401,19 +1085,32 @@ class RealTimeModel(EnhancedEventEmitter):
         """
         Response Audio Delta is the Event Handler for the Response Audio Delta Event.
         """
-        self._logger.info("Response Audio Delta")
-
         base64_audio = data.get("delta")
 
-        if base64_audio and self.agent.audio_track:
-            self.agent.emit(AgentsEvents.Speaking)
-            self.agent.audio_track.enqueue_audio(base64_audio=base64_audio)
+        self._event_log.debug(
+            "response.audio.delta",
+            "Response Audio Delta",
+            item_id=data.get("item_id"),
+            bytes=lambda: len(base64_audio or "") * 3 // 4,
+        )
+
+        if base64_audio:
+            self._tracer.mark("first_delta")
+            AUDIO_DELTA_BYTES.inc(len(base64_audio) * 3 // 4)
+
+        if base64_audio and self._audio_decoder:
+            self.agent.set_state(AgentState.Speaking)
+            self._audio_decoder.submit(
+                base64_audio,
+                item_id=data.get("item_id"),
+                content_index=data.get("content_index", 0),
+            )
 
     def _handle_response_audio_transcript_delta(self, data: dict):
         """
         Response Audio Transcript Delta is the Event Handler for the Response Audio Transcript Delta Event.
         """
-        self._logger.info("Response Audio Transcript Delta")
+        self._event_log.debug("response.audio_transcript.delta", "Response Audio Transcript Delta", item_id=data.get("item_id"))
 
     def _handle_response_audio_done(self, data: dict):
         """
@@ -421,38 +1118,50 @@ class RealTimeModel(EnhancedEventEmitter):
         """
         self._logger.info("Response Audio Done")
 
+        if self._audio_decoder:
+            self._audio_decoder.end_of_response()
+
     def _handle_response_text_done(self, data: dict):
         """
         Response Text Done is the Event Handler for the Response Text Done Event.
         """
         self._logger.info("Response Text Done")
 
+        self._mirror.set_text(data["item_id"], data["text"])
+
     def _handle_response_audio_transcript_done(self, data: dict):
         """
         Response Audio Transcript Done is the Event Handler for the Response Audio Transcript Done Event.
         """
         self._logger.info("Response Audio Transcript Done")
 
+        self._mirror.set_text(data["item_id"], data["transcript"])
+
     async def _main(self):
         if not self.socket.connected:
             raise _exceptions.RealtimeModelNotConnectedError()
         
         try:
             async def handle_audio_chunk():
+                conversation = self.conversation
+                coalescer = self._input_coalescer
+
                 while True:
-                    if not self.conversation.active:
-                        await asyncio.sleep(0.01)
-                        continue
+                    # Wake up on ready audio, or when the held audio is due.
+                    ready = await conversation.wait_ready(coalescer.hold_remaining())
+
+                    if not conversation.active:
+                        break
 
-                    audio_chunk = self.conversation.recv()
+                    if ready:
+                        coalescer.add(conversation.recv() or b"")
 
-                    if audio_chunk is None:
-                        await asyncio.sleep(0.01)
-                        continue
+                    while (audio_chunk := coalescer.take()) is not None:
+                        await self._send_audio_append(audio_chunk)
 
-                    await self._send_audio_append(audio_chunk)
+                self._logger.info("Conversation stopped, Audio Append stopped")
 
-            self._main_tsk = asyncio.create_task(handle_audio_chunk(), name="RealTimeModel-AudioAppend")
+            self._main_tsk = self._watch(asyncio.create_task(handle_audio_chunk(), name="RealTimeModel-AudioAppend"))
         except Exception as e:
             self._logger.error(f"Error in Main Loop: {e}")
         
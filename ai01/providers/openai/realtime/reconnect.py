@@ -0,0 +1,49 @@
+import random
+
+from ....utils.histogram import Histogram
+
+RECONNECT_MS_BUCKETS = (100, 250, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+class ReconnectStats:
+    """
+    Counters and timings of the reconnects of a RealTimeModel.
+    """
+
+    __slots__ = ("outages", "reconnects", "failed_attempts", "duration", "dropped_audio_ms")
+
+    def __init__(self):
+        self.outages = 0
+        """
+        Number of times the connection was lost.
+        """
+
+        self.reconnects = 0
+        """
+        Number of outages which ended with a successful reconnect.
+        """
+
+        self.failed_attempts = 0
+        """
+        Number of reconnect attempts which failed.
+        """
+
+        self.duration = Histogram(RECONNECT_MS_BUCKETS)
+        """
+        Time from losing the connection to the session being restored, in milliseconds.
+        """
+
+        self.dropped_audio_ms = 0.0
+        """
+        Input audio in milliseconds which did not fit in the outage buffer and was dropped.
+        """
+
+    def __repr__(self) -> str:
+        return f"<ReconnectStats outages={self.outages} reconnects={self.reconnects} failed_attempts={self.failed_attempts} duration={self.duration}>"
+
+
+def backoff_delay(attempt: int, base_ms: float, max_ms: float) -> float:
+    """
+    Delay in seconds before the reconnect attempt `attempt`, counting from 0, exponential backoff with full jitter.
+    """
+    return random.uniform(0, min(max_ms, base_ms * 2**attempt)) / 1000
@@ -0,0 +1,45 @@
+from ....utils.histogram import Histogram
+
+ROTATION_MS_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class RotationStats:
+    """
+    Counters and timings of the session rotations of a RealTimeModel.
+    """
+
+    __slots__ = ("rotations", "forced", "failures", "prepare", "boundary_wait", "switch")
+
+    def __init__(self):
+        self.rotations = 0
+        """
+        Number of sessions rotated.
+        """
+
+        self.forced = 0
+        """
+        Number of rotations which switched without waiting for a turn boundary, because none came in time.
+        """
+
+        self.failures = 0
+        """
+        Number of replacement sessions which could not be prepared.
+        """
+
+        self.prepare = Histogram(ROTATION_MS_BUCKETS)
+        """
+        Time to connect and configure the replacement session, in milliseconds.
+        """
+
+        self.boundary_wait = Histogram(ROTATION_MS_BUCKETS)
+        """
+        Time the prepared session waited for a turn boundary, in milliseconds.
+        """
+
+        self.switch = Histogram(ROTATION_MS_BUCKETS)
+        """
+        Time to seed the replacement session and switch over to it, in milliseconds.
+        """
+
+    def __repr__(self) -> str:
+        return f"<RotationStats rotations={self.rotations} forced={self.forced} failures={self.failures} prepare={self.prepare} boundary_wait={self.boundary_wait}>"
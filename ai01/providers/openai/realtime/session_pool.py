@@ -0,0 +1,370 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Optional
+
+from ai01.utils.socket import SocketClient
+
+from . import _api
+
+if TYPE_CHECKING:
+    from .realtime_model import RealTimeModelOptions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_LIFETIME = 30 * 60
+"""
+Lifetime in seconds assumed for a session whose `expires_at` is not known yet.
+"""
+
+
+def create_socket(options: "RealTimeModelOptions", loop: asyncio.AbstractEventLoop) -> SocketClient:
+    """
+    Create the Socket to the RealTime API for the options.
+    """
+    return SocketClient(
+        url=f"{options.base_url}?model={options.model}",
+        headers={
+            "Authorization": f"Bearer {options.oai_api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        },
+        loop=loop,
+        json=True,
+        codec=options.json_codec,
+    )
+
+
+def session_update(options: "RealTimeModelOptions") -> _api.ClientEvent.SessionUpdate:
+    """
+    The `session.update` event configuring a session for the options.
+    """
+    session_data: _api.ClientEvent.SessionUpdateData = {
+        "instructions": options.instructions,
+        "voice": options.voice,
+        "input_audio_format": options.input_audio_format,
+        "input_audio_transcription": {"model": "whisper-1"},
+        "max_response_output_tokens": options.max_response_output_tokens,
+        "modalities": options.modalities,
+        "temperature": options.temperature,
+        "tools": [],
+        "turn_detection": options.server_vad_opts,
+        "output_audio_format": options.output_audio_format,
+        "tool_choice": options.tool_choice,
+    }
+
+    return {
+        "session": session_data,
+        "type": "session.update",
+    }
+
+
+class PooledSession:
+    """
+    Pooled Session is a connected and configured session to the RealTime API, waiting in the pool to be handed to a RealTimeModel.
+    """
+
+    def __init__(self, socket: SocketClient):
+        self.socket = socket
+        """
+        Socket of the session.
+        """
+
+        self.session: Optional[_api.Resource.Session] = None
+        """
+        Session as last reported by the server.
+        """
+
+        self.created_at = time.time()
+        """
+        Time the session was connected, in seconds since the epoch.
+        """
+
+        self.ready = asyncio.Event()
+        """
+        Set once the server confirmed the session's configuration.
+        """
+
+        self._reader: Optional[asyncio.Task] = None
+
+    def __repr__(self) -> str:
+        return f"<PooledSession id={self.id} ready={self.ready.is_set()} expires_in={self.expires_in():.0f}s>"
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.session["id"] if self.session else None
+
+    @property
+    def expires_at(self) -> float:
+        """
+        Time the session expires, in seconds since the epoch.
+        """
+        if self.session and self.session.get("expires_at"):
+            return float(self.session["expires_at"])
+
+        return self.created_at + DEFAULT_SESSION_LIFETIME
+
+    @property
+    def alive(self) -> bool:
+        return self.socket.connected and (self._reader is None or not self._reader.done())
+
+    def expires_in(self) -> float:
+        """
+        Seconds until the session expires.
+        """
+        return self.expires_at - time.time()
+
+    def start(self):
+        """
+        Start reading the session's events while it waits in the pool.
+        """
+        self._reader = asyncio.create_task(self._read(), name="SessionPool-Reader")
+
+    def detach(self):
+        """
+        Stop reading the session's events, the session's new owner reads them from now on.
+        """
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    async def close(self):
+        self.detach()
+        await self.socket.aclose(timeout=1.0)
+
+    async def _read(self):
+        try:
+            async for message in self.socket.ws:
+                data = self.socket.codec.loads(message)
+                event = data.get("type")
+
+                if event in ("session.created", "session.updated"):
+                    self.session = data["session"]
+
+                    if event == "session.updated":
+                        self.ready.set()
+                elif event == "error":
+                    logger.error(f"Pooled Session Error: {data}")
+        except Exception as e:
+            logger.warning(f"Pooled Session closed: {e}")
+
+
+class SessionPoolStats:
+    """
+    Counters of a Realtime Session Pool.
+    """
+
+    __slots__ = ("hits", "misses", "created", "recycled", "failed")
+
+    def __init__(self):
+        self.hits = 0
+        """
+        Number of acquires served with a warm session.
+        """
+
+        self.misses = 0
+        """
+        Number of acquires which found no warm session.
+        """
+
+        self.created = 0
+        """
+        Number of sessions connected by the pool.
+        """
+
+        self.recycled = 0
+        """
+        Number of idle sessions closed because they were about to expire or were lost.
+        """
+
+        self.failed = 0
+        """
+        Number of sessions which could not be connected.
+        """
+
+    def __repr__(self) -> str:
+        return f"<SessionPoolStats hits={self.hits} misses={self.misses} hit_rate={self.hit_rate:.2f} created={self.created} recycled={self.recycled} failed={self.failed}>"
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RealtimeSessionPool:
+    """
+    Realtime Session Pool keeps warm sessions to the RealTime API, connected and configured, keyed by the RealTimeModelOptions.
+
+    A RealTimeModel given the pool in its options takes a warm session on `connect`, which skips the connection
+    and the configuration round trip. Taking a session tops the pool back up in the background, and idle sessions
+    are recycled `recycle_before_s` seconds before they expire.
+
+    Example Usage:
+        ```python
+        pool = RealtimeSessionPool(size=2)
+        options = RealTimeModelOptions(oai_api_key=key, session_pool=pool)
+
+        pool.prewarm(options)
+
+        llm = RealTimeModel(agent=agent, options=options)
+        await llm.connect()
+        ```
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        recycle_before_s: float = 300,
+        check_interval_s: float = 10,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.size = size
+        """
+        Number of warm sessions kept per options.
+        """
+
+        self.recycle_before_s = recycle_before_s
+        """
+        Idle sessions expiring within this many seconds are replaced.
+        """
+
+        self.check_interval_s = check_interval_s
+        """
+        Seconds between the checks for sessions to recycle.
+        """
+
+        self.loop = loop or asyncio.get_event_loop()
+
+        self.stats = SessionPoolStats()
+
+        self._options: Dict[str, "RealTimeModelOptions"] = {}
+        self._sessions: Dict[str, Deque[PooledSession]] = {}
+        self._connecting: Dict[str, int] = {}
+        self._maintainer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"<RealtimeSessionPool size={self.size} keys={len(self._sessions)} stats={self.stats}>"
+
+    @staticmethod
+    def key(options: "RealTimeModelOptions") -> str:
+        """
+        Key of the options in the pool, made of what defines the session, options which only differ in local settings share their sessions.
+        """
+        return json.dumps(
+            [options.base_url, options.model, options.oai_api_key, options.json_codec, session_update(options)],
+            sort_keys=True,
+        )
+
+    def idle(self, options: "RealTimeModelOptions") -> int:
+        """
+        Number of warm sessions ready for the options.
+        """
+        return sum(1 for s in self._sessions.get(self.key(options), ()) if s.ready.is_set() and s.alive)
+
+    def prewarm(self, options: "RealTimeModelOptions"):
+        """
+        Start keeping warm sessions for the options.
+        """
+        key = self.key(options)
+
+        if key not in self._options:
+            self._options[key] = options
+            self._sessions[key] = deque()
+            self._connecting[key] = 0
+
+        self._top_up(key)
+
+        if self._maintainer is None or self._maintainer.done():
+            self._maintainer = self.loop.create_task(self._maintain(), name="SessionPool-Maintainer")
+
+    def acquire(self, options: "RealTimeModelOptions") -> Optional[PooledSession]:
+        """
+        Take a warm session for the options, None on a miss, in both cases the pool is topped back up in the background.
+        The session is detached from the pool, its events are for the caller to read.
+        """
+        self.prewarm(options)
+
+        sessions = self._sessions[self.key(options)]
+
+        for session in list(sessions):
+            if session.ready.is_set() and session.alive and session.expires_in() > self.recycle_before_s:
+                sessions.remove(session)
+                session.detach()
+
+                self.stats.hits += 1
+                self._top_up(self.key(options))
+
+                logger.debug(f"Session Pool hit, {self.stats}")
+
+                return session
+
+        self.stats.misses += 1
+
+        logger.debug(f"Session Pool miss, {self.stats}")
+
+        return None
+
+    async def close(self):
+        """
+        Close every idle session and stop keeping sessions warm.
+        """
+        self._closed = True
+
+        if self._maintainer is not None:
+            self._maintainer.cancel()
+            self._maintainer = None
+
+        sessions = [s for q in self._sessions.values() for s in q]
+
+        for q in self._sessions.values():
+            q.clear()
+
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+    def _top_up(self, key: str):
+        if self._closed:
+            return
+
+        missing = self.size - len(self._sessions[key]) - self._connecting[key]
+
+        for _ in range(missing):
+            self._connecting[key] += 1
+            self.loop.create_task(self._connect(key), name="SessionPool-Connect")
+
+    async def _connect(self, key: str):
+        options = self._options[key]
+        socket = create_socket(options, self.loop)
+
+        try:
+            await socket.connect()
+
+            session = PooledSession(socket)
+            session.start()
+
+            await socket.send(session_update(options))
+
+            self._sessions[key].append(session)
+            self.stats.created += 1
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Session Pool could not connect a session: {e}")
+        finally:
+            self._connecting[key] -= 1
+
+    async def _maintain(self):
+        while not self._closed:
+            await asyncio.sleep(self.check_interval_s)
+
+            for key, sessions in self._sessions.items():
+                for session in list(sessions):
+                    if session.alive and session.expires_in() > self.recycle_before_s:
+                        continue
+
+                    sessions.remove(session)
+                    self.stats.recycled += 1
+
+                    self.loop.create_task(session.close())
+
+                self._top_up(key)
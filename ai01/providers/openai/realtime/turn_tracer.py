@@ -0,0 +1,164 @@
+import logging
+import time
+from typing import Dict, Literal, Optional
+
+from ....utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+TURN_MS_BUCKETS = (50, 100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000, 30000)
+
+TurnMark = Literal["committed", "response_created", "first_delta", "first_audio", "response_done"]
+"""
+Points of a turn timestamped after the end of the user's speech, in the order they happen:
+- `committed`: the server committed the user's audio, `input_audio_buffer.committed`.
+- `response_created`: the server started the response, `response.created`.
+- `first_delta`: the first audio of the response arrived, the first `response.audio.delta`.
+- `first_audio`: the first non-silent frame of the response was returned by `AudioTrack.recv()`.
+- `response_done`: the server finished the response, `response.done`.
+"""
+
+MARKS: tuple = ("committed", "response_created", "first_delta", "first_audio", "response_done")
+
+
+class TurnStats:
+    """
+    Latencies of the turns from the end of the user's speech, `input_audio_buffer.speech_stopped`, to every TurnMark.
+    """
+
+    __slots__ = ("turns", "completed", "interrupted", "latency")
+
+    def __init__(self):
+        self.turns = 0
+        """
+        Number of turns started by the end of the user's speech.
+        """
+
+        self.completed = 0
+        """
+        Number of turns whose response was done.
+        """
+
+        self.interrupted = 0
+        """
+        Number of turns cut short by the user speaking again before the response was done.
+        """
+
+        self.latency: Dict[str, Histogram] = {mark: Histogram(TURN_MS_BUCKETS) for mark in MARKS}
+        """
+        Latency in milliseconds from the end of the user's speech to each TurnMark.
+        """
+
+    def __repr__(self) -> str:
+        return f"<TurnStats turns={self.turns} completed={self.completed} interrupted={self.interrupted} first_audio={self.latency['first_audio']}>"
+
+    def summary(self) -> str:
+        """
+        One line summary of the p50 and p95 latency of every TurnMark.
+        """
+        spans = " ".join(
+            f"{mark}={self.latency[mark].percentile(50):.0f}/{self.latency[mark].percentile(95):.0f}ms" for mark in MARKS
+        )
+
+        return f"turns={self.turns} completed={self.completed} interrupted={self.interrupted} p50/p95 {spans}"
+
+    def snapshot(self) -> dict:
+        """
+        Snapshot of the TurnStats as plain data.
+        """
+        return {
+            "turns": self.turns,
+            "completed": self.completed,
+            "interrupted": self.interrupted,
+            "latency": {mark: histogram.snapshot() for mark, histogram in self.latency.items()},
+        }
+
+
+class TurnTracer:
+    """
+    Turn Tracer timestamps every turn of a session, from the end of the user's speech to the first audio the agent
+    plays and the end of the response, and records the latencies in the session's TurnStats and in the process-wide
+    TurnStats shared by every tracer.
+
+    Each TurnMark is recorded once per turn, marks which happen without a turn in progress, e.g. a response created
+    without the user speaking, are ignored. A turn lasts until the user speaks again, as a short response can be done
+    before its first frame is played.
+    """
+
+    process_stats = TurnStats()
+    """
+    Turn latencies of every session in the process.
+    """
+
+    def __init__(self):
+        self.stats = TurnStats()
+        """
+        Turn latencies of the session.
+        """
+
+        self._started: Optional[float] = None
+        self._marked: Dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return f"<TurnTracer in_turn={self.in_turn} stats={self.stats}>"
+
+    @property
+    def in_turn(self) -> bool:
+        return self._started is not None
+
+    @property
+    def current(self) -> Dict[str, float]:
+        """
+        Latencies in milliseconds of the marks of the turn in progress, or of the last turn.
+        """
+        return dict(self._marked)
+
+    def speech_started(self):
+        """
+        The user started speaking, a turn whose response is not done yet is interrupted.
+        """
+        if self._started is not None and "response_done" not in self._marked:
+            self.stats.interrupted += 1
+            TurnTracer.process_stats.interrupted += 1
+
+        self._started = None
+
+    def speech_stopped(self):
+        """
+        The user stopped speaking, which starts a turn.
+        """
+        self._started = time.monotonic()
+        self._marked = {}
+
+        self.stats.turns += 1
+        TurnTracer.process_stats.turns += 1
+
+    def mark(self, mark: TurnMark):
+        """
+        Timestamp a point of the turn in progress, only its first occurrence in the turn is recorded.
+        """
+        if self._started is None or mark in self._marked:
+            return
+
+        # The first audio played belongs to the response, not to audio left over from the previous one.
+        if mark == "first_audio" and "response_created" not in self._marked:
+            return
+
+        latency = (time.monotonic() - self._started) * 1000
+
+        self._marked[mark] = latency
+
+        self.stats.latency[mark].observe(latency)
+        TurnTracer.process_stats.latency[mark].observe(latency)
+
+        if mark == "first_audio":
+            logger.debug(f"Turn first audio after {latency:.0f}ms")
+        elif mark == "response_done":
+            self.stats.completed += 1
+            TurnTracer.process_stats.completed += 1
+
+    def first_audio(self):
+        """
+        Audible callback of the AudioTrack, marks the first non-silent frame of the turn.
+        """
+        self.mark("first_audio")
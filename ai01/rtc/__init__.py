@@ -2,10 +2,13 @@ from huddle01 import Role
 from huddle01.local_peer import ProduceOptions
 from huddle01.room import RoomEvents, RoomEventsData
 
-from .audio_resampler import AudioFrame, AudioResampler
+from .audio_resampler import AudioFrame, AudioResampler, OverflowPolicy, ResamplerStats
+from .frame_pool import FramePool, FrameTemplate, get_frame_template
+from .playout_clock import PlayoutClock, PlayoutPolicy
 from .rtc import RTC, HuddleClientOptions, RTCOptions
+from .vad import VadStats, VoiceActivityGate
 
-__all__ = ["RTC", "RTCOptions", "AudioResampler", "AudioFrame", "HuddleClientOptions", "Role", "RoomEvents", "RoomEventsData", "ProduceOptions"]
+__all__ = ["RTC", "RTCOptions", "AudioResampler", "AudioFrame", "OverflowPolicy", "ResamplerStats", "HuddleClientOptions", "Role", "RoomEvents", "RoomEventsData", "ProduceOptions", "FramePool", "FrameTemplate", "get_frame_template", "PlayoutClock", "PlayoutPolicy", "VoiceActivityGate", "VadStats"]
 
 
 # Cleanup docs of unexported modules
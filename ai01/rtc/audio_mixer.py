@@ -0,0 +1,298 @@
+import logging
+import time
+from typing import Callable, Dict, List, Literal, Optional
+
+import numpy as np
+from av import AudioFrame
+
+from .audio_resampler import AudioResampler, OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class MixerTrack:
+    """
+    Mixer Track is the per-track state of the Audio Mixer, its own resampler and position on the track's timeline.
+    """
+
+    __slots__ = ("id", "resampler", "next_time", "last_push", "gaps", "full")
+
+    def __init__(self, id: str, resampler: AudioResampler):
+        self.id = id
+        """
+        ID of the track.
+        """
+
+        self.resampler = resampler
+        """
+        Resampler of the track, holding its resampled audio until it is mixed.
+        """
+
+        self.next_time: Optional[float] = None
+        """
+        Time in seconds on the track's timeline where the next frame is expected to start.
+        """
+
+        self.last_push = time.monotonic()
+        """
+        Monotonic time of the last frame pushed for the track.
+        """
+
+        self.gaps = 0
+        """
+        Number of timeline gaps which were filled with silence.
+        """
+
+        self.full = False
+        """
+        Whether the track has a full block buffered, kept up to date by the Audio Mixer.
+        """
+
+
+class AudioMixer:
+    """
+    Audio Mixer mixes the audio of multiple tracks into a single stream of fixed size blocks.
+
+    Every track is resampled into its own buffer, gaps in its timestamps are filled with silence so that its audio stays
+    aligned to its own timeline, and every `mix` sums one block from each track in NumPy, saturating to int16.
+    A block is mixed once every track has a block buffered, tracks which sent nothing for `max_skew_ms`
+    (muted, paused or lagging peers) are treated as silent instead of holding back the others.
+    The cost of a block is linear in the number of tracks, `ready` keeps a count of the tracks with a full block
+    so that checking it after every push does not scan every track.
+
+    Every track buffers at most `capacity_ms` of audio, see `AudioResampler` for the `overflow_policy`,
+    `on_high_water` is called with the track's id and resampler when a track's buffer is filling up.
+    """
+
+    def __init__(
+        self,
+        rate: int = 16000,
+        layout: Literal["mono", "stereo"] = "mono",
+        ptime: float = 0.020,
+        max_skew_ms: float = 60,
+        max_gap_ms: float = 500,
+        capacity_ms: int = 2000,
+        overflow_policy: OverflowPolicy = "drop_oldest",
+        on_high_water: Optional[Callable[[str, AudioResampler], None]] = None,
+    ):
+        self.rate = rate
+        self.layout: Literal["mono", "stereo"] = layout
+        self.channels = 1 if layout == "mono" else 2
+
+        self.block_samples = int(ptime * rate)
+        """
+        Number of samples per channel in a mixed block.
+        """
+
+        self.max_skew = max_skew_ms / 1000
+        """
+        Seconds a track may lag behind before it is mixed as silence.
+        """
+
+        self.max_gap = max_gap_ms / 1000
+        """
+        Longest timeline gap in seconds filled with silence, longer gaps are treated as a restart of the track's timeline.
+        """
+
+        self.capacity_ms = capacity_ms
+        """
+        Capacity of every track's buffer in milliseconds.
+        """
+
+        self.overflow_policy: OverflowPolicy = overflow_policy
+        """
+        Overflow Policy of every track's buffer.
+        """
+
+        self.on_high_water = on_high_water
+        """
+        Called with the track's id and resampler when a track's buffer rises above its high-water mark.
+        """
+
+        self._tracks: Dict[str, MixerTrack] = {}
+        self._contributing: List[MixerTrack] = []
+
+        # Number of tracks with a full block buffered, and the tracks without one.
+        self._full = 0
+        self._filling: Dict[str, MixerTrack] = {}
+
+        size = self.block_samples * self.channels
+        self._acc = np.zeros(size, dtype=np.int32)
+        self._scratch = np.zeros(size, dtype=np.int16)
+        self._out = np.zeros(size, dtype=np.int16)
+
+    def __repr__(self) -> str:
+        return f"<AudioMixer rate={self.rate} layout={self.layout} tracks={len(self._tracks)}>"
+
+    @property
+    def tracks(self) -> Dict[str, MixerTrack]:
+        return self._tracks
+
+    def add_track(self, id: str):
+        """
+        Add a track to the mix.
+        """
+        if id in self._tracks:
+            return
+
+        on_high_water = self.on_high_water
+
+        self._tracks[id] = self._filling[id] = MixerTrack(
+            id=id,
+            resampler=AudioResampler(
+                format="s16",
+                layout=self.layout,
+                rate=self.rate,
+                capacity_ms=self.capacity_ms,
+                overflow_policy=self.overflow_policy,
+                on_high_water=(lambda resampler: on_high_water(id, resampler)) if on_high_water else None,
+            ),
+        )
+
+    def remove_track(self, id: str):
+        """
+        Remove a track from the mix, dropping its buffered audio.
+        """
+        track = self._tracks.pop(id, None)
+
+        if track is not None:
+            track.resampler.clear()
+
+            if track.full:
+                self._full -= 1
+
+            self._filling.pop(id, None)
+
+    async def wait_writable(self, id: str):
+        """
+        Wait until the track `id` may push again, only ever waits with the `block` overflow policy.
+        """
+        track = self._tracks.get(id)
+
+        if track is not None:
+            await track.resampler.wait_writable()
+
+    def push(self, id: str, frame: AudioFrame):
+        """
+        Push a frame of the track `id`, the frame's `pts` is used to keep the track aligned to its timeline.
+        """
+        track = self._tracks.get(id)
+
+        if track is None:
+            return
+
+        if frame.pts is not None and frame.time_base is not None and frame.sample_rate:
+            start = float(frame.pts * frame.time_base)
+
+            if track.next_time is not None:
+                gap = start - track.next_time
+
+                if self.block_samples / self.rate <= gap <= self.max_gap:
+                    track.resampler.pad(int(gap * self.rate))
+                    track.gaps += 1
+
+            track.next_time = start + frame.samples / frame.sample_rate
+
+        # The resampler produces its own timestamps, the input ones are only used for alignment.
+        frame.pts = None
+
+        track.resampler.resample(frame)
+        track.last_push = time.monotonic()
+
+        self._update(track)
+
+    def ready(self) -> bool:
+        """
+        Whether a block can be mixed, without scanning the tracks when none or all of them have a full block.
+        """
+        if not self._full:
+            return False
+
+        if self._full == len(self._tracks):
+            return True
+
+        now = time.monotonic()
+
+        # Tracks which were mixed re-join the filling ones at the end, muted tracks stay at the front and are looked at last.
+        for track in reversed(self._filling.values()):
+            if now - track.last_push < self.max_skew:
+                return False
+
+        return True
+
+    def mix(self) -> Optional[np.ndarray]:
+        """
+        Mix the next block, returns None when no block is ready.
+        The returned array is reused by the next call, copy it to keep it.
+        """
+        contributing = self._mixable(time.monotonic())
+
+        if contributing is None:
+            return None
+
+        out = self._out
+
+        if len(contributing) == 1:
+            contributing[0].resampler.read_into(out)
+            self._update(contributing[0])
+            return out
+
+        acc = self._acc
+        scratch = self._scratch
+
+        acc.fill(0)
+
+        for track in contributing:
+            track.resampler.read_into(scratch)
+            np.add(acc, scratch, out=acc)
+            self._update(track)
+
+        np.clip(acc, -32768, 32767, out=acc)
+        out[:] = acc
+
+        return out
+
+    def clear(self):
+        """
+        Drop the buffered audio of every track.
+        """
+        for track in self._tracks.values():
+            track.resampler.clear()
+            track.next_time = None
+            track.full = False
+
+        self._full = 0
+        self._filling = dict(self._tracks)
+
+    def _update(self, track: MixerTrack):
+        # Keep the count of tracks with a full block in step with the track's buffer.
+        full = track.resampler.available >= self.block_samples
+
+        if full == track.full:
+            return
+
+        track.full = full
+
+        if full:
+            self._full += 1
+            del self._filling[track.id]
+        else:
+            self._full -= 1
+            self._filling[track.id] = track
+
+    def _mixable(self, now: float) -> Optional[List[MixerTrack]]:
+        # Tracks contributing to the next block, None when a block is not ready yet.
+        contributing = self._contributing
+        contributing.clear()
+        waiting = False
+
+        for track in self._tracks.values():
+            if track.full:
+                contributing.append(track)
+            elif now - track.last_push < self.max_skew:
+                waiting = True
+
+        if not contributing or waiting:
+            return None
+
+        return contributing
@@ -1,19 +1,110 @@
-from typing import Literal
+import asyncio
+import logging
+from typing import Callable, Literal, Optional
 
+import numpy as np
 from av import AudioFrame
 from av import AudioResampler as Resampler
-from av.audio.fifo import AudioFifo
+
+from ..utils.metrics import REGISTRY
+from ..utils.ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+RESAMPLED_FRAMES = REGISTRY.counter("ai01_resampler_frames_total", "Audio frames resampled.")
+DROPPED_SAMPLES = REGISTRY.counter("ai01_resampler_dropped_samples_total", "Resampled samples dropped by buffer overflows.")
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+"""
+Overflow Policy decides what happens to the resampled audio when the buffer is full.
+- `drop_oldest`: discard the oldest buffered audio to make room, keeping the buffer as fresh as possible.
+- `drop_newest`: discard the audio which does not fit.
+- `block`: producers awaiting `wait_writable` are held until the buffer drains below its high-water mark,
+  audio written without waiting which does not fit is discarded as with `drop_newest`.
+"""
+
+
+class ResamplerStats:
+    """
+    Counters of the Audio Resampler's buffer.
+    """
+
+    __slots__ = ("overflows", "dropped_samples", "high_water_events", "peak_samples")
+
+    def __init__(self):
+        self.overflows = 0
+        """
+        Number of writes which did not fit in the buffer.
+        """
+
+        self.dropped_samples = 0
+        """
+        Number of samples per channel discarded because the buffer was full.
+        """
+
+        self.high_water_events = 0
+        """
+        Number of times the buffer rose above its high-water mark.
+        """
+
+        self.peak_samples = 0
+        """
+        Highest number of samples per channel buffered at once.
+        """
+
+    def __repr__(self) -> str:
+        return f"<ResamplerStats overflows={self.overflows} dropped_samples={self.dropped_samples} high_water_events={self.high_water_events} peak_samples={self.peak_samples}>"
 
 
 class AudioResampler:
     """
-    Audio Resampler is used to resample the audio to the desired format, and store it in the Audio FIFO Buffer.
+    Audio Resampler is used to resample the audio to the desired format, and store it in a bounded Audio Buffer.
     Using the `resample` method, you can resample the audio frame to the desired format, and using the `recv` method, you can get the resampled audio frame.
+
+    The buffer holds at most `capacity_ms` of audio, what happens to audio which does not fit is decided by the `overflow_policy`,
+    so a stalled consumer can not grow the memory without bound nor receive a burst of stale audio once it recovers.
+    `on_high_water` is called once when the buffer rises above `high_water` of its capacity, and again only after it drained to half of that.
     """
-    def __init__(self, format: Literal['s16'], layout: Literal['mono', 'stereo'], rate: int):
-        self.audio_fifo = AudioFifo()
+    def __init__(
+        self,
+        format: Literal['s16'],
+        layout: Literal['mono', 'stereo'],
+        rate: int,
+        capacity_ms: int = 5000,
+        overflow_policy: OverflowPolicy = "drop_oldest",
+        high_water: float = 0.75,
+        on_high_water: Optional[Callable[["AudioResampler"], None]] = None,
+    ):
+        self.format = format
+        self.layout = layout
+        self.rate = rate
+        self.channels = 1 if layout == "mono" else 2
+
+        self.overflow_policy: OverflowPolicy = overflow_policy
+        """
+        Overflow Policy applied when the buffer is full, see `OverflowPolicy`.
+        """
+
+        self.capacity = max(1, int(rate * capacity_ms / 1000))
         """
-        Audio FIFO Buffer for the Audio Resampler.
+        Capacity of the buffer in samples per channel.
+        """
+
+        self.high_water_samples = int(self.capacity * high_water)
+        """
+        High-Water Mark of the buffer in samples per channel.
+        """
+
+        self.on_high_water = on_high_water
+        """
+        Called with the resampler when the buffer rises above its high-water mark.
+        """
+
+        self.stats = ResamplerStats()
+
+        self.audio_buffer = AudioRingBuffer(self.capacity, channels=self.channels)
+        """
+        Audio Buffer for the Audio Resampler.
         """
 
         self.resampler = Resampler(
@@ -25,35 +116,134 @@ class AudioResampler:
         For the Audio Resampling, which is used to resample the audio to the desired format.
         """
 
+        self._above_high_water = False
+        self._writable: Optional[asyncio.Event] = None
+
+    def __repr__(self) -> str:
+        return f"<AudioResampler rate={self.rate} layout={self.layout} buffered={self.available}/{self.capacity} policy={self.overflow_policy}>"
 
     def resample(self, audio_frame: AudioFrame):
         """
-        Resample the audio frame to the desired format, and add it to the Audio FIFO
+        Resample the audio frame to the desired format, and add it to the Audio Buffer
         You can use the `recv` method to get the resampled audio frame.
         """
         resampled_frames = self.resampler.resample(audio_frame)
 
+        RESAMPLED_FRAMES.inc()
+
         for frame in resampled_frames:
-            self.audio_fifo.write(frame)
+            self._write(frame.to_ndarray().reshape(-1))
+
+    async def wait_writable(self):
+        """
+        With the `block` policy, wait until the buffer is below its high-water mark, returns straight away with the other policies.
+        """
+        if self.overflow_policy != "block":
+            return
+
+        while self.available >= self.high_water_samples:
+            if self._writable is None:
+                self._writable = asyncio.Event()
+
+            self._writable.clear()
+            await self._writable.wait()
+
+    @property
+    def available(self) -> int:
+        """
+        Number of resampled samples per channel in the Audio Buffer.
+        """
+        return self.audio_buffer.available
+
+    @property
+    def buffered_ms(self) -> float:
+        """
+        Duration of the resampled audio in the Audio Buffer, in milliseconds.
+        """
+        return self.available * 1000 / self.rate
+
+    def pad(self, samples: int):
+        """
+        Add `samples` samples per channel of silence to the Audio Buffer, e.g. to fill a gap in the input timeline.
+        """
+        if samples <= 0:
+            return
+
+        self._write(np.zeros(samples * self.channels, dtype=np.int16))
+
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Read exactly `len(out) // channels` resampled samples per channel into `out`,
+        returns 0 without consuming anything when fewer are buffered.
+        """
+        count = self.audio_buffer.read_into(out)
+
+        if count:
+            self._on_read()
+
+        return count
 
     def recv(self) -> None | bytes:
         """
-        Receive the audio frame from the Audio Resampler, which are stored in the Audio FIFO Queue.
+        Receive the audio frame from the Audio Resampler, which are stored in the Audio Buffer.
         """
-        frame = self.audio_fifo.read()
+        available = self.audio_buffer.available
 
-        if frame is None:
+        if not available:
             return None
 
-        pcm_data = frame.to_ndarray()
+        pcm_data = np.empty(available * self.channels, dtype=np.int16)
+        self.audio_buffer.read_available_into(pcm_data)
+
+        self._on_read()
 
         pcm_bytes = pcm_data.tobytes()
 
         return pcm_bytes
-    
 
     def clear(self):
         """
-        Clear the Audio FIFO Buffer.
+        Clear the Audio Buffer.
         """
-        self.audio_fifo.clear()
\ No newline at end of file
+        self.audio_buffer.clear()
+        self._on_read()
+
+    def _write(self, samples: np.ndarray):
+        buffer = self.audio_buffer
+        count = samples.size // self.channels
+        overflow = count - buffer.free
+
+        if overflow > 0:
+            self.stats.overflows += 1
+            self.stats.dropped_samples += overflow
+            DROPPED_SAMPLES.inc(overflow)
+
+            if self.stats.overflows == 1 or self.stats.overflows % 100 == 0:
+                logger.warning(f"Audio Buffer overflow, {self.stats.overflows} overflows, {self.stats.dropped_samples} samples dropped ({self.overflow_policy})")
+
+        buffer.write(samples, overwrite=self.overflow_policy == "drop_oldest")
+
+        available = buffer.available
+
+        if available > self.stats.peak_samples:
+            self.stats.peak_samples = available
+
+        if not self._above_high_water and available >= self.high_water_samples:
+            self._above_high_water = True
+            self.stats.high_water_events += 1
+
+            if self.on_high_water is not None:
+                try:
+                    self.on_high_water(self)
+                except Exception as e:
+                    logger.error(f"Error in High-Water callback: {e}")
+
+    def _on_read(self):
+        available = self.audio_buffer.available
+
+        # The high-water callback is re-armed only once the buffer drained to half the mark, so it does not fire on every frame.
+        if available < self.high_water_samples // 2:
+            self._above_high_water = False
+
+        if available < self.high_water_samples and self._writable is not None:
+            self._writable.set()
@@ -0,0 +1,172 @@
+import fractions
+import functools
+from typing import Literal
+
+import numpy as np
+from av import AudioFrame
+
+
+class FrameTemplate:
+    """
+    Frame Template is the immutable description of an s16 audio frame for a (sample rate, layout, ptime),
+    it caches everything which is the same for every frame of that shape, so that it is computed once per process.
+    """
+
+    __slots__ = ("sample_rate", "layout", "ptime", "channels", "samples", "time_base", "silence")
+
+    def __init__(self, sample_rate: int, layout: Literal["mono", "stereo"], ptime: float):
+        self.sample_rate = sample_rate
+        self.layout = layout
+        self.ptime = ptime
+        self.channels = 1 if layout == "mono" else 2
+        self.samples = int(ptime * sample_rate)
+        self.time_base = fractions.Fraction(1, sample_rate)
+        self.silence = bytes(self.samples * self.channels * 2)
+
+    def __repr__(self) -> str:
+        return f"<FrameTemplate sample_rate={self.sample_rate} layout={self.layout} ptime={self.ptime} samples={self.samples}>"
+
+    def new_frame(self) -> AudioFrame:
+        """
+        Allocate a new frame of this shape, with the sample rate and time base already set.
+        """
+        frame = AudioFrame(format="s16", layout=self.layout, samples=self.samples)
+        frame.sample_rate = self.sample_rate
+        frame.time_base = self.time_base
+
+        return frame
+
+
+@functools.lru_cache(maxsize=None)
+def get_frame_template(sample_rate: int, layout: Literal["mono", "stereo"], ptime: float) -> FrameTemplate:
+    """
+    Get the process-wide Frame Template for the given (sample rate, layout, ptime).
+    """
+    return FrameTemplate(sample_rate=sample_rate, layout=layout, ptime=ptime)
+
+
+class FramePoolStats:
+    """
+    Counters of the frames handed out by a Frame Pool.
+    """
+
+    __slots__ = ("fresh", "pooled", "silence")
+
+    def __init__(self):
+        self.fresh = 0
+        """
+        Fresh is the number of frames which had to be allocated.
+        """
+
+        self.pooled = 0
+        """
+        Pooled is the number of frames which were served by reusing an already allocated frame.
+        """
+
+        self.silence = 0
+        """
+        Silence is the number of frames which were served as silence.
+        """
+
+    def __repr__(self) -> str:
+        return f"<FramePoolStats fresh={self.fresh} pooled={self.pooled} silence={self.silence}>"
+
+
+class PooledFrame:
+    """
+    Pooled Frame is a reusable frame together with a writable int16 view over its samples.
+    """
+
+    __slots__ = ("frame", "samples", "silent")
+
+    def __init__(self, frame: AudioFrame, samples: np.ndarray):
+        self.frame = frame
+        """
+        The reused Audio Frame.
+        """
+
+        self.samples = samples
+        """
+        Writable interleaved int16 view over the frame plane.
+        """
+
+        self.silent = False
+        """
+        Whether the frame currently holds the template silence.
+        """
+
+
+class FramePool:
+    """
+    Frame Pool hands out reused frames of a single Frame Template in rotation.
+
+    A frame handed out by `acquire` stays valid until `size` more frames have been acquired,
+    a consumer must be done with it by then, e.g. an encoder which finishes with a frame before asking for the next one.
+    Pools are not shared between tracks, only the Frame Templates are.
+    """
+
+    def __init__(self, template: FrameTemplate, size: int = 2):
+        if size <= 0:
+            raise ValueError("Frame Pool size must be greater than 0.")
+
+        self.template = template
+        """
+        Template of the frames in the pool.
+        """
+
+        self.size = size
+        """
+        Number of frames rotated by the pool.
+        """
+
+        self.stats = FramePoolStats()
+        """
+        Counters of pooled versus fresh frames.
+        """
+
+        self._frames: list[PooledFrame] = []
+        self._index = 0
+
+    def __repr__(self) -> str:
+        return f"<FramePool template={self.template} size={self.size} stats={self.stats}>"
+
+    def acquire(self) -> PooledFrame:
+        """
+        Acquire the next frame to be filled, frames are allocated lazily until the pool is full.
+        """
+        if len(self._frames) < self.size:
+            template = self.template
+            frame = template.new_frame()
+            samples = np.frombuffer(frame.planes[0], dtype=np.int16)[: template.samples * template.channels]
+
+            pooled = PooledFrame(frame=frame, samples=samples)
+            self._frames.append(pooled)
+
+            self.stats.fresh += 1
+
+            return pooled
+
+        pooled = self._frames[self._index]
+        self._index = (self._index + 1) % self.size
+
+        self.stats.pooled += 1
+
+        return pooled
+
+    def acquire_silence(self) -> AudioFrame:
+        """
+        Acquire the next frame filled with silence.
+        """
+        return self.fill_silence(self.acquire())
+
+    def fill_silence(self, pooled: PooledFrame) -> AudioFrame:
+        """
+        Fill an acquired frame with the template silence, frames which already hold silence are not rewritten.
+        """
+        if not pooled.silent:
+            pooled.frame.planes[0].update(self.template.silence)
+            pooled.silent = True
+
+        self.stats.silence += 1
+
+        return pooled.frame
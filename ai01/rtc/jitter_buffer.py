@@ -0,0 +1,176 @@
+from typing import Optional
+
+from ..utils.histogram import Histogram
+
+DEPTH_MS_BUCKETS = (0, 20, 40, 60, 80, 100, 150, 200, 300, 400, 600, 1000, 2000, 5000)
+
+
+class JitterBufferStats:
+    """
+    Counters and gauges of an Adaptive Jitter Buffer.
+    """
+
+    __slots__ = ("underruns", "prebuffer_frames", "responses", "depth", "target_ms")
+
+    def __init__(self):
+        self.underruns = 0
+        """
+        Underruns is the number of times the buffer ran dry in the middle of a response.
+        """
+
+        self.prebuffer_frames = 0
+        """
+        Prebuffer Frames is the number of silent frames played while waiting for the buffer to fill.
+        """
+
+        self.responses = 0
+        """
+        Responses is the number of responses which were played out completely.
+        """
+
+        self.depth = Histogram(DEPTH_MS_BUCKETS)
+        """
+        Depth of the buffer in milliseconds, sampled on every frame played from the buffer.
+        """
+
+        self.target_ms = 0.0
+        """
+        Target Depth the buffer currently fills up to before playing, in milliseconds.
+        """
+
+    def __repr__(self) -> str:
+        return f"<JitterBufferStats underruns={self.underruns} prebuffer_frames={self.prebuffer_frames} target_ms={self.target_ms:.1f} depth={self.depth}>"
+
+
+class AdaptiveJitterBuffer:
+    """
+    Adaptive Jitter Buffer decides when the buffered audio of a response may start playing.
+
+    Before the first frame of every response, and again after an underrun, playout is held until the buffer
+    holds the target depth. The target starts at the configured prebuffer and is adapted after every response
+    from how its deltas actually arrived: the audio needed up front to play the response without a gap is the
+    largest amount by which any delta arrived later than real time, measured from the first delta.
+    A mid-response underrun raises the target straight away.
+
+    The buffer only holds the playout state, the samples themselves stay in the track's ring buffer,
+    callers serialize access with the same lock they hold for the ring buffer.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        prebuffer_ms: float = 60,
+        min_depth_ms: float = 20,
+        max_depth_ms: float = 400,
+        smoothing: float = 0.25,
+    ):
+        self.sample_rate = sample_rate
+        self.min_depth_ms = min_depth_ms
+        self.max_depth_ms = max_depth_ms
+
+        self.smoothing = smoothing
+        """
+        Weight of the latest response when adapting the target depth.
+        """
+
+        self.target_ms = min(max(prebuffer_ms, min_depth_ms), max_depth_ms)
+        """
+        Target Depth in milliseconds the buffer fills up to before playing.
+        """
+
+        self.buffering = True
+        """
+        Whether playout is held until the target depth is reached.
+        """
+
+        self.stats = JitterBufferStats()
+        self.stats.target_ms = self.target_ms
+
+        self._response_start: Optional[float] = None
+        self._response_media = 0
+        self._required_ms = 0.0
+        self._buffering_since: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"<AdaptiveJitterBuffer target_ms={self.target_ms:.1f} buffering={self.buffering} stats={self.stats}>"
+
+    @property
+    def target_samples(self) -> int:
+        return int(self.target_ms * self.sample_rate / 1000)
+
+    def on_write(self, samples: int, now: float):
+        """
+        Record the arrival of `samples` samples per channel at monotonic time `now`.
+        """
+        if self._response_start is None:
+            self._response_start = now
+            self._response_media = 0
+            self._required_ms = 0.0
+
+        lateness = (now - self._response_start) * 1000 - self._response_media * 1000 / self.sample_rate
+
+        if lateness > self._required_ms:
+            self._required_ms = lateness
+
+        self._response_media += samples
+
+        if self.buffering and self._buffering_since is None:
+            self._buffering_since = now
+
+    def ready(self, available: int, draining: bool, now: float) -> bool:
+        """
+        Whether a frame may be played from the buffer holding `available` samples per channel,
+        `draining` is set once the response is known to be complete so its tail is never held back.
+        """
+        if not self.buffering:
+            return True
+
+        waited = (now - self._buffering_since) * 1000 if self._buffering_since is not None else 0.0
+
+        if available >= self.target_samples or (available and (draining or waited >= self.max_depth_ms)):
+            self.buffering = False
+            self._buffering_since = None
+            return True
+
+        if available:
+            self.stats.prebuffer_frames += 1
+
+        return False
+
+    def on_frame(self, available: int):
+        """
+        Record the depth after a frame was played from the buffer.
+        """
+        self.stats.depth.observe(available * 1000 / self.sample_rate)
+
+    def on_underrun(self):
+        """
+        The buffer ran dry in the middle of a response, hold playout again with a deeper target.
+        """
+        self.stats.underruns += 1
+        self._set_target(self.target_ms + 20)
+
+        self.buffering = True
+        self._buffering_since = None
+
+    def on_drained(self):
+        """
+        The response was played out completely, adapt the target to how its audio arrived.
+        """
+        if self._response_start is not None:
+            self.stats.responses += 1
+            self._set_target((1 - self.smoothing) * self.target_ms + self.smoothing * self._required_ms)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the current response and hold playout for the next one, e.g. after the buffer was flushed.
+        """
+        self._response_start = None
+        self._buffering_since = None
+        self.buffering = True
+
+    def _set_target(self, target_ms: float):
+        self.target_ms = min(max(target_ms, self.min_depth_ms), self.max_depth_ms)
+        self.stats.target_ms = self.target_ms
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import weakref
+from typing import Dict, Literal, Optional
+
+from ..utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+PlayoutPolicy = Literal["catchup", "skip"]
+"""
+Playout Policy decides what a track does with the frame slots it missed when the loop fell behind.
+- `catchup`: play the missed slots back to back, at most `max_catchup_frames` of them, skipping the rest.
+- `skip`: drop every missed slot and play the current one.
+"""
+
+LATE_FRAME_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class PlayoutClock:
+    """
+    Playout Clock is a single drift-free clock releasing frame slots to every registered track.
+
+    Slots are numbered from the moment the clock starts, slot `n` is due at `start + n * ptime` on the loop's
+    monotonic clock. One timer per clock advances the slot and wakes every track waiting on it,
+    instead of every track running its own sleep timer. Because deadlines are absolute, a late tick does not
+    shift the following ones, it only makes the tracks which waited on it late.
+
+    A clock ticks on one event loop, the loop it was created for or the one its first track registered from.
+    Use `PlayoutClock.shared()` to get the clock of the running loop for a ptime.
+    """
+
+    _shared: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[float, PlayoutClock]]" = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        ptime: float = 0.020,
+        policy: PlayoutPolicy = "catchup",
+        max_catchup_frames: int = 5,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        self.ptime = ptime
+        """
+        Duration of a frame slot in seconds.
+        """
+
+        self.policy: PlayoutPolicy = policy
+        """
+        Policy applied when a track is behind the clock, see `PlayoutPolicy`.
+        """
+
+        self.max_catchup_frames = max_catchup_frames
+        """
+        Maximum number of missed slots played back to back with the `catchup` policy.
+        """
+
+        self.jitter = Histogram()
+        """
+        Lateness of every tick against its deadline, in milliseconds.
+        """
+
+        self.late_frames = Histogram(LATE_FRAME_BUCKETS)
+        """
+        Number of slots a track was behind when it asked for its next frame, recorded only when it was behind.
+        """
+
+        self.skipped_frames = 0
+        """
+        Number of slots dropped by the playout policy.
+        """
+
+        self.loop = loop
+        """
+        Event Loop the clock ticks on, None until the first track registers when it was not given.
+        """
+
+        self._tracks: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tick_fut: Optional[asyncio.Future] = None
+        self._start = 0.0
+        self._slot = 0
+
+    def __repr__(self) -> str:
+        return f"<PlayoutClock ptime={self.ptime} policy={self.policy} tracks={len(self._tracks)} slot={self._slot}>"
+
+    @classmethod
+    def shared(cls, ptime: float = 0.020, loop: Optional[asyncio.AbstractEventLoop] = None) -> "PlayoutClock":
+        """
+        Get the Playout Clock shared by the tracks of an event loop for the given ptime, the running loop by default.
+        """
+        loop = loop or asyncio.get_running_loop()
+        clocks = cls._shared.setdefault(loop, {})
+        clock = clocks.get(ptime)
+
+        if clock is None:
+            clock = clocks[ptime] = cls(ptime=ptime, loop=loop)
+
+        return clock
+
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    @property
+    def slot(self) -> int:
+        """
+        The latest slot which is due.
+        """
+        return self._slot
+
+    @property
+    def tracks(self) -> int:
+        """
+        Number of registered tracks.
+        """
+        return len(self._tracks)
+
+    def register(self, track: object):
+        """
+        Register a track, the clock starts ticking with the first registered track.
+        Must be called from the event loop of the clock, raises RuntimeError from another loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("Playout Clock ticks on another event loop, use PlayoutClock.shared() of this loop.")
+
+        self._tracks.add(track)
+
+        if not self.running:
+            self._run()
+
+    def unregister(self, track: object):
+        """
+        Unregister a track, the clock stops once no tracks are left.
+        """
+        self._tracks.discard(track)
+
+        if not self._tracks:
+            self._halt()
+
+    async def next_slot(self, slot: Optional[int] = None) -> int:
+        """
+        Wait for the frame slot a track should play next, `slot` is the slot it expects to play,
+        or None for a track which has not played yet.
+
+        Returns the slot to play, which is later than `slot` when the playout policy skipped the missed slots.
+        """
+        if not self.running:
+            raise RuntimeError("Playout Clock is not running, register a track first.")
+
+        if slot is None:
+            slot = self._slot + 1
+
+        while self._slot < slot:
+            assert self._tick_fut is not None
+            await asyncio.shield(self._tick_fut)
+
+        late = self._slot - slot
+
+        if late:
+            self.late_frames.observe(late)
+
+            if self.policy == "skip":
+                self.skipped_frames += late
+                return self._slot
+
+            if late > self.max_catchup_frames:
+                self.skipped_frames += late - self.max_catchup_frames
+                return self._slot - self.max_catchup_frames
+
+        return slot
+
+    def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._start = self._loop.time()
+        self._slot = 0
+        self._tick_fut = self._loop.create_future()
+        self._timer = self._loop.call_at(self._start + self.ptime, self._tick)
+
+        logger.debug("Playout Clock started")
+
+    def _halt(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._tick_fut is not None and not self._tick_fut.done():
+            self._tick_fut.cancel()
+
+        self._tick_fut = None
+        self._loop = None
+
+        logger.debug("Playout Clock stopped")
+
+    def _tick(self):
+        assert self._loop is not None and self._tick_fut is not None
+
+        now = self._loop.time()
+        due = int((now - self._start) / self.ptime)
+        deadline = self._start + (self._slot + 1) * self.ptime
+
+        self.jitter.observe((now - deadline) * 1000)
+
+        self._slot = max(self._slot + 1, due)
+
+        tick_fut = self._tick_fut
+        self._tick_fut = self._loop.create_future()
+        tick_fut.set_result(self._slot)
+
+        self._timer = self._loop.call_at(self._start + (self._slot + 1) * self.ptime, self._tick)
@@ -14,9 +14,8 @@ from huddle01 import (
 from huddle01.local_peer import ProduceOptions
 from pydantic import BaseModel
 
-logging.basicConfig(level=logging.INFO)
 
-logger = logging.getLogger("RTC")
+logger = logging.getLogger(__name__)
 
 
 class RTCOptions(BaseModel):
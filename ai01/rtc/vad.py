@@ -0,0 +1,251 @@
+import logging
+import math
+from typing import Optional
+
+import numpy as np
+
+from ..utils.ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+class VadStats:
+    """
+    Counters of a Voice Activity Gate.
+    """
+
+    __slots__ = ("processed_samples", "suppressed_samples", "segments", "sample_rate")
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+        self.processed_samples = 0
+        """
+        Number of samples per channel given to the gate.
+        """
+
+        self.suppressed_samples = 0
+        """
+        Number of samples per channel which were not forwarded.
+        """
+
+        self.segments = 0
+        """
+        Number of speech segments the gate opened for.
+        """
+
+    def __repr__(self) -> str:
+        return f"<VadStats processed_ms={self.processed_ms:.0f} suppressed={self.suppressed_percent:.1f}% segments={self.segments}>"
+
+    @property
+    def processed_ms(self) -> float:
+        return self.processed_samples * 1000 / self.sample_rate
+
+    @property
+    def suppressed_ms(self) -> float:
+        return self.suppressed_samples * 1000 / self.sample_rate
+
+    @property
+    def suppressed_percent(self) -> float:
+        """
+        Percentage of the audio which was suppressed.
+        """
+        if not self.processed_samples:
+            return 0.0
+
+        return self.suppressed_samples * 100 / self.processed_samples
+
+
+class VoiceActivityGate:
+    """
+    Voice Activity Gate forwards the audio only while speech is likely, so that silence is not streamed upstream.
+
+    The gate measures the energy of every block in dBFS against an adaptive noise floor, a block is speech when it is
+    `margin_db` above the floor and above `min_db`. The floor follows quieter blocks straight away and rises towards
+    louder non-speech blocks with `floor_adapt`, it also creeps up by at most `floor_rise_db_per_s` during blocks counted
+    as speech, so a steady background louder than the floor is learned and does not hold the gate open. While the gate is closed the latest `pre_roll_ms` of audio are kept
+    in a ring buffer and forwarded ahead of the block which opens the gate, so speech onsets are not clipped.
+    Once open the gate stays open until `hangover_ms` of non-speech, so trailing audio and the silence a server side VAD
+    needs to detect the end of speech are still forwarded.
+
+    Use `VoiceActivityGate.from_server_vad` to size the pre-roll and hangover from the Server VAD configuration.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        pre_roll_ms: int = 300,
+        hangover_ms: int = 700,
+        margin_db: float = 12.0,
+        min_db: float = -50.0,
+        floor_adapt: float = 0.05,
+        floor_rise_db_per_s: float = 1.0,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+        self.margin_db = margin_db
+        """
+        How far above the noise floor a block must be to count as speech, in dB.
+        """
+
+        self.min_db = min_db
+        """
+        Level in dBFS a block must exceed to count as speech, whatever the noise floor.
+        """
+
+        self.floor_adapt = floor_adapt
+        """
+        Weight of a non-speech block when the noise floor rises, the floor follows quieter blocks straight away.
+        """
+
+        self.floor_rise_db_per_s = floor_rise_db_per_s
+        """
+        Rate in dB per second the noise floor rises at during blocks counted as speech, so that steady noise above the
+        floor is eventually taken as background, slow enough that an utterance barely moves it.
+        """
+
+        self.hangover_samples = int(hangover_ms * sample_rate / 1000)
+        """
+        Number of samples per channel of non-speech after which an open gate closes.
+        """
+
+        self.noise_floor_db = min_db - margin_db
+        """
+        Current estimate of the background level in dBFS.
+        """
+
+        self.open = False
+        """
+        Whether the gate is forwarding audio.
+        """
+
+        self.stats = VadStats(sample_rate)
+
+        pre_roll = int(pre_roll_ms * sample_rate / 1000)
+
+        self._pre_roll = AudioRingBuffer(pre_roll, channels=channels) if pre_roll > 0 else None
+        self._out = np.zeros((pre_roll + int(sample_rate * 0.020)) * channels, dtype=np.int16)
+        self._silent_samples = 0
+
+    def __repr__(self) -> str:
+        return f"<VoiceActivityGate open={self.open} noise_floor_db={self.noise_floor_db:.1f} stats={self.stats}>"
+
+    @classmethod
+    def from_server_vad(
+        cls,
+        server_vad_opts: dict,
+        sample_rate: int = 16000,
+        channels: int = 1,
+        **kwargs,
+    ) -> "VoiceActivityGate":
+        """
+        Create a gate which keeps the Server VAD working as configured, the pre-roll covers its `prefix_padding_ms`
+        and the hangover outlasts its `silence_duration_ms`, so the server still sees the silence ending a turn.
+        """
+        prefix_padding_ms = server_vad_opts.get("prefix_padding_ms", 300)
+        silence_duration_ms = server_vad_opts.get("silence_duration_ms", 500)
+
+        kwargs.setdefault("pre_roll_ms", prefix_padding_ms)
+        kwargs.setdefault("hangover_ms", silence_duration_ms + 200)
+
+        return cls(sample_rate=sample_rate, channels=channels, **kwargs)
+
+    def level_db(self, block: np.ndarray) -> float:
+        """
+        Energy of an int16 block in dBFS.
+        """
+        if not block.size:
+            return -math.inf
+
+        samples = block.astype(np.float32)
+        power = float(np.dot(samples, samples)) / samples.size
+
+        if power <= 0:
+            return -math.inf
+
+        return 10 * math.log10(power / (32768.0 * 32768.0))
+
+    def process(self, block: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Process a block of interleaved int16 samples, returns the audio to forward or None when it is suppressed.
+        When the gate opens the pre-roll is returned ahead of the block.
+        The returned array may be reused by the next call, copy it to keep it.
+        """
+        count = block.size // self.channels
+        self.stats.processed_samples += count
+
+        level = self.level_db(block)
+        speech = level > max(self.noise_floor_db + self.margin_db, self.min_db)
+
+        self._track_floor(level, count, speech)
+
+        if self.open:
+            if speech:
+                self._silent_samples = 0
+            else:
+                self._silent_samples += count
+
+                if self._silent_samples >= self.hangover_samples:
+                    self.open = False
+                    self._silent_samples = 0
+
+                    logger.debug("Voice Activity Gate closed")
+
+            return block
+
+        if not speech:
+            self.stats.suppressed_samples += count
+
+            if self._pre_roll is not None:
+                self._pre_roll.write(block, overwrite=True)
+
+            return None
+
+        self.open = True
+        self._silent_samples = 0
+        self.stats.segments += 1
+
+        logger.debug(f"Voice Activity Gate opened at {level:.1f} dBFS")
+
+        if self._pre_roll is None or not self._pre_roll.available:
+            return block
+
+        # The pre-roll was counted as suppressed when it was buffered, it is forwarded now.
+        pre_roll = self._pre_roll.available
+        self.stats.suppressed_samples -= pre_roll
+
+        size = (pre_roll + count) * self.channels
+
+        if size > self._out.size:
+            self._out = np.zeros(size, dtype=np.int16)
+
+        out = self._out[:size]
+        self._pre_roll.read_available_into(out)
+        out[pre_roll * self.channels :] = block
+
+        return out
+
+    def reset(self):
+        """
+        Close the gate and drop the pre-roll, the noise floor is kept.
+        """
+        self.open = False
+        self._silent_samples = 0
+
+        if self._pre_roll is not None:
+            self._pre_roll.clear()
+
+    def _track_floor(self, level: float, count: int, speech: bool):
+        # Falls straight away, rises with `floor_adapt` on non-speech and at `floor_rise_db_per_s` on speech.
+        if level == -math.inf:
+            return
+
+        if level < self.noise_floor_db:
+            self.noise_floor_db = level
+        elif not speech:
+            self.noise_floor_db += self.floor_adapt * (level - self.noise_floor_db)
+        else:
+            rise = self.floor_rise_db_per_s * count / self.sample_rate
+            self.noise_floor_db = min(level, self.noise_floor_db + rise)
@@ -1,20 +1,137 @@
 from pyee import AsyncIOEventEmitter
 import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from .histogram import Histogram
+
+EmitMode = Literal["sequential", "concurrent"]
+"""
+How `emit_for_results` runs the listeners of an event:
+- `sequential`: one after another, in the order they were added, each listener gets the whole `emit_timeout`.
+- `concurrent`: all together within one `emit_timeout`, the results are still returned in the order the listeners were added.
+"""
+
+
+class EmitTimeoutError(asyncio.TimeoutError):
+    """
+    A listener did not return before the timeout of `emit_for_results`, it is reported on the `error` event.
+    """
+
+    def __init__(self, event: str, listener: str, timeout: float):
+        super().__init__(f"Listener {listener} of {event} timed out after {timeout}s")
+
+        self.event = event
+        self.listener = listener
+        self.timeout = timeout
 
 
 class EnhancedEventEmitter(AsyncIOEventEmitter):
-    def __init__(self, loop=None):
+    def __init__(self, loop=None, emit_mode: EmitMode = "sequential", emit_timeout: Optional[float] = None):
         self._emitter_lock = asyncio.Lock()
         super().__init__(loop=loop)
 
+        self.emit_mode: EmitMode = emit_mode
+        """
+        How `emit_for_results` runs the listeners, sequential by default.
+        """
+
+        self.emit_timeout = emit_timeout
+        """
+        Seconds `emit_for_results` waits for each listener in sequential mode, and for all of them in concurrent mode,
+        None to wait for them however long they take.
+        """
+
+        self.handler_durations: Dict[str, Dict[str, Histogram]] = {}
+        """
+        Durations in milliseconds of the listeners run by `emit_for_results`, by event and listener.
+        """
+
     async def emit_for_results(self, event, *args, **kwargs):
+        """
+        Run the listeners of the event and return their truthy results, in the order the listeners were added.
+
+        A listener which raises, or does not return before `emit_timeout`, is reported on the `error` event
+        and leaves no result, the other listeners keep running.
+        """
+        listeners = list(self._events.get(event, {}).values())
+
+        if self.emit_mode == "concurrent":
+            outcomes = await self._run_concurrent(event, listeners, args, kwargs)
+        else:
+            outcomes = [await self._run_listener(event, f, args, kwargs) for f in listeners]
+
         results = []
-        for f in list(self._events[event].values()):
-            try:
-                result = await f(*args, **kwargs)
-            except Exception as exc:
-                self.emit("error", exc)
-            else:
-                if result:
-                    results.append(result)
+
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                self.emit("error", outcome)
+            elif outcome:
+                results.append(outcome)
+
         return results
+
+    async def _run_concurrent(self, event, listeners: List[Callable], args, kwargs) -> List[Any]:
+        tasks = [asyncio.ensure_future(self._call(event, f, args, kwargs)) for f in listeners]
+
+        if not tasks:
+            return []
+
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=self.emit_timeout)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for task in pending:
+            task.cancel()
+
+        outcomes: List[Any] = []
+
+        for f, task in zip(listeners, tasks):
+            if task in pending or task.cancelled():
+                outcomes.append(EmitTimeoutError(event, _name(f), self.emit_timeout or 0.0))
+            elif task.exception() is not None:
+                outcomes.append(task.exception())
+            else:
+                outcomes.append(task.result())
+
+        return outcomes
+
+    async def _run_listener(self, event, f: Callable, args, kwargs) -> Any:
+        if self.emit_timeout is not None:
+            # Run as a task, unlike `wait_for` this keeps a TimeoutError raised by the listener apart from the timeout.
+            (outcome,) = await self._run_concurrent(event, [f], args, kwargs)
+
+            return outcome
+
+        try:
+            return await self._call(event, f, args, kwargs)
+        except Exception as exc:
+            return exc
+
+    async def _call(self, event, f: Callable, args, kwargs) -> Any:
+        start = time.perf_counter()
+
+        try:
+            result = f(*args, **kwargs)
+
+            if inspect.isawaitable(result):
+                result = await result
+
+            return result
+        finally:
+            durations = self.handler_durations.setdefault(event, {})
+            name = _name(f)
+            histogram = durations.get(name)
+
+            if histogram is None:
+                histogram = durations[name] = Histogram()
+
+            histogram.observe((time.perf_counter() - start) * 1000)
+
+
+def _name(f: Callable) -> str:
+    return getattr(f, "__qualname__", None) or repr(f)
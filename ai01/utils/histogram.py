@@ -0,0 +1,104 @@
+import bisect
+from typing import Sequence
+
+LATENCY_MS_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 250, 500, 1000, 2500, 5000)
+"""
+Default bucket upper bounds for latencies measured in milliseconds.
+"""
+
+
+class Histogram:
+    """
+    Fixed-bucket Histogram, observing a value is a binary search and an increment.
+
+    Buckets are given by their inclusive upper bounds, values above the last bound are counted in an overflow bucket.
+    Percentiles are estimated as the upper bound of the bucket holding the requested rank.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_MS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        """
+        Upper bounds of the buckets.
+        """
+
+        self.counts = [0] * (len(self.buckets) + 1)
+        """
+        Number of observations per bucket, the last entry is the overflow bucket.
+        """
+
+        self.count = 0
+        """
+        Total number of observations.
+        """
+
+        self.sum = 0.0
+        """
+        Sum of all observed values.
+        """
+
+        self.max = 0.0
+        """
+        Largest observed value.
+        """
+
+    def __repr__(self) -> str:
+        return f"<Histogram count={self.count} mean={self.mean:.3f} p50={self.percentile(50)} p99={self.percentile(99)}>"
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def observe(self, value: float):
+        """
+        Record a value.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the `q`th percentile, 0 <= q <= 100, values in the overflow bucket report the largest observed value.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+
+        return self.max
+
+    def reset(self):
+        """
+        Drop all observations.
+        """
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def snapshot(self) -> dict:
+        """
+        Snapshot of the Histogram as plain data.
+        """
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
@@ -0,0 +1,80 @@
+import json
+import logging
+from typing import Any, Callable, Dict, Literal, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JsonBackend = Literal["stdlib", "orjson", "auto"]
+"""
+JSON Backend used to encode and decode the socket messages.
+- `stdlib`: the standard library `json` module.
+- `orjson`: `orjson`, which has to be installed separately.
+- `auto`: `orjson` when it is installed, `stdlib` otherwise.
+"""
+
+
+class JsonCodec:
+    """
+    JSON Codec encodes messages to `str`, so they are always sent as text frames, and decodes `str` or `bytes` messages.
+    """
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(self, name: str, dumps: Callable[[Any], str], loads: Callable[[Union[str, bytes]], Any]):
+        self.name = name
+        """
+        Name of the backend.
+        """
+
+        self.dumps = dumps
+        """
+        Encode a message to a JSON string.
+        """
+
+        self.loads = loads
+        """
+        Decode a JSON message.
+        """
+
+    def __repr__(self) -> str:
+        return f"<JsonCodec {self.name}>"
+
+
+def _orjson_dumps(message: Any) -> str:
+    return orjson.dumps(message).decode()
+
+
+_codecs: Dict[str, JsonCodec] = {
+    "stdlib": JsonCodec("stdlib", dumps=json.dumps, loads=json.loads),
+}
+
+if orjson is not None:
+    _codecs["orjson"] = JsonCodec("orjson", dumps=_orjson_dumps, loads=orjson.loads)
+
+
+def available_backends() -> list[str]:
+    """
+    Names of the JSON backends which are installed.
+    """
+    return list(_codecs)
+
+
+def get_json_codec(backend: JsonBackend = "stdlib") -> JsonCodec:
+    """
+    Get the JSON Codec of a backend, an unavailable backend falls back to `stdlib` with a warning.
+    """
+    if backend == "auto":
+        return _codecs.get("orjson", _codecs["stdlib"])
+
+    codec = _codecs.get(backend)
+
+    if codec is None:
+        logger.warning(f"JSON backend {backend} is not installed, falling back to stdlib")
+        return _codecs["stdlib"]
+
+    return codec
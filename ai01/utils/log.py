@@ -0,0 +1,223 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+"""
+Default format of the records written by `configure_logging`, the structured fields are appended to it.
+"""
+
+
+class LogSampler:
+    """
+    Log Sampler decides per event type which occurrences are logged, an event type sampled `every` N logs the
+    first of every N occurrences. Event types without a rate are always logged.
+    """
+
+    __slots__ = ("rates", "suppressed", "_counts")
+
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        self.rates: Dict[str, int] = dict(rates or {})
+        """
+        Sampling rate per event type, an event type is logged once every `rate` occurrences.
+        """
+
+        self.suppressed = 0
+        """
+        Number of occurrences which were not logged.
+        """
+
+        self._counts: Dict[str, int] = {}
+
+    def __repr__(self) -> str:
+        return f"<LogSampler rates={self.rates} suppressed={self.suppressed}>"
+
+    def sample(self, event: str) -> int:
+        """
+        Count an occurrence of the event type, returns the number of occurrences the logged record stands for, 0 when it is not logged.
+        """
+        every = self.rates.get(event, 1)
+
+        if every <= 1:
+            return 1
+
+        count = self._counts.get(event, 0)
+        self._counts[event] = count + 1
+
+        if count % every:
+            self.suppressed += 1
+            return 0
+
+        return every
+
+
+class EventLogger:
+    """
+    Event Logger logs the events of a hot path, each event type is sampled by the LogSampler and its fields are only
+    resolved once the record is known to be emitted.
+
+    Fields are passed as keyword arguments, a callable field is called to get its value, so an expensive value costs
+    nothing when the level is disabled or the occurrence is sampled out. The fields are attached to the record as
+    `fields` and appended as `key=value` pairs by the StructuredFormatter.
+
+    Example Usage:
+        ```python
+        events = EventLogger(logger, LogSampler({"response.audio.delta": 50}))
+
+        events.debug("response.audio.delta", "Response Audio Delta", bytes=lambda: len(delta))
+        ```
+    """
+
+    __slots__ = ("logger", "sampler")
+
+    def __init__(self, logger: logging.Logger, sampler: Optional[LogSampler] = None):
+        self.logger = logger
+        """
+        Logger the records are emitted to.
+        """
+
+        self.sampler = sampler or LogSampler()
+        """
+        Sampler of the event types.
+        """
+
+    def __repr__(self) -> str:
+        return f"<EventLogger {self.logger.name} sampler={self.sampler}>"
+
+    def log(self, level: int, event: str, msg: Optional[str] = None, **fields: Any):
+        if not self.logger.isEnabledFor(level):
+            return
+
+        every = self.sampler.sample(event)
+
+        if not every:
+            return
+
+        resolved: Dict[str, Any] = {"event": event}
+
+        for key, value in fields.items():
+            resolved[key] = value() if callable(value) else value
+
+        if every > 1:
+            resolved["sampled"] = f"1/{every}"
+
+        self.logger.log(level, msg or event, extra={"fields": resolved}, stacklevel=3)
+
+    def debug(self, event: str, msg: Optional[str] = None, **fields: Any):
+        self.log(logging.DEBUG, event, msg, **fields)
+
+    def info(self, event: str, msg: Optional[str] = None, **fields: Any):
+        self.log(logging.INFO, event, msg, **fields)
+
+    def warning(self, event: str, msg: Optional[str] = None, **fields: Any):
+        self.log(logging.WARNING, event, msg, **fields)
+
+    def error(self, event: str, msg: Optional[str] = None, **fields: Any):
+        self.log(logging.ERROR, event, msg, **fields)
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Structured Formatter appends the fields of the records logged by an EventLogger as `key=value` pairs.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields: Optional[Dict[str, Any]] = getattr(record, "fields", None)
+
+        if not fields:
+            return text
+
+        return text + " " + " ".join(f"{key}={value}" for key, value in fields.items())
+
+
+class OffloopQueueHandler(logging.handlers.QueueHandler):
+    """
+    Offloop Queue Handler hands the records to a QueueListener's thread, which formats and writes them, so the
+    emitting thread only merges the message arguments and enqueues. A full queue drops the record and counts it.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+
+        self.dropped = 0
+        """
+        Number of records dropped because the queue was full.
+        """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[OffloopQueueHandler] = None
+_configured_logger: Optional[logging.Logger] = None
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    handlers: Optional[Iterable[logging.Handler]] = None,
+    logger_name: Optional[str] = "ai01",
+    fmt: str = DEFAULT_FORMAT,
+    queue_size: int = 10000,
+) -> OffloopQueueHandler:
+    """
+    Route the records of `logger_name` through a bounded queue to `handlers`, which a background thread formats and writes.
+    Meant to be called once by the application, the library itself never configures logging. `logger_name=None`
+    configures the root logger, handlers default to a stream to stderr with the StructuredFormatter.
+
+    Calling it again replaces the previous configuration.
+    """
+    global _listener, _queue_handler, _configured_logger
+
+    shutdown_logging()
+
+    if handlers is None:
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(StructuredFormatter(fmt))
+        handlers = [stream]
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(queue_size)
+
+    _queue_handler = OffloopQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    _configured_logger = logging.getLogger(logger_name)
+    _configured_logger.addHandler(_queue_handler)
+    _configured_logger.setLevel(level)
+
+    return _queue_handler
+
+
+def shutdown_logging():
+    """
+    Write the queued records and stop the background thread started by `configure_logging`.
+    """
+    global _listener, _queue_handler, _configured_logger
+
+    if _configured_logger is not None and _queue_handler is not None:
+        _configured_logger.removeHandler(_queue_handler)
+
+    if _listener is not None:
+        _listener.stop()
+
+    _listener = None
+    _queue_handler = None
+    _configured_logger = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,351 @@
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .histogram import LATENCY_MS_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+METRICS_PORT_ENV = "AI01_METRICS_PORT"
+"""
+Environment variable holding the port `serve_from_env` serves the metrics on, the address defaults to 127.0.0.1
+and is set with `AI01_METRICS_ADDR`.
+"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""
+Content type of the Prometheus text exposition format.
+"""
+
+
+class Counter:
+    """
+    Counter is a value which only goes up, e.g. the number of frames resampled.
+    """
+
+    __slots__ = ("registry", "value")
+
+    def __init__(self, registry: "MetricsRegistry"):
+        self.registry = registry
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        if self.registry.enabled:
+            self.value += amount
+
+
+class Gauge:
+    """
+    Gauge is a value which goes up and down, e.g. the number of active sessions.
+
+    Gauges are updated while the registry is disabled too, so that one enabled while sessions are open starts
+    from the right value instead of going negative as they close.
+    """
+
+    __slots__ = ("registry", "value")
+
+    def __init__(self, registry: "MetricsRegistry"):
+        self.registry = registry
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class HistogramMetric:
+    """
+    Histogram Metric observes values into fixed buckets, e.g. send latencies in milliseconds.
+    """
+
+    __slots__ = ("registry", "histogram")
+
+    def __init__(self, registry: "MetricsRegistry", buckets: Sequence[float]):
+        self.registry = registry
+        self.histogram = Histogram(buckets)
+
+    def observe(self, value: float):
+        if self.registry.enabled:
+            self.histogram.observe(value)
+
+
+class MetricFamily:
+    """
+    Metric Family is a named metric and its children, one per combination of label values.
+
+    A family without labels is used through its single child, e.g. `family.inc()`. A family with labels hands out
+    its children with `labels`, which hot paths should look up once and keep.
+    """
+
+    def __init__(
+        self,
+        registry: "MetricsRegistry",
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_MS_BUCKETS,
+    ):
+        self.registry = registry
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def __repr__(self) -> str:
+        return f"<MetricFamily {self.kind} {self.name} children={len(self._children)}>"
+
+    def labels(self, *values: str):
+        """
+        Child of the family for the label values, given in the order of the label names.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+
+                if child is None:
+                    if self.kind == "counter":
+                        child = Counter(self.registry)
+                    elif self.kind == "gauge":
+                        child = Gauge(self.registry)
+                    else:
+                        child = HistogramMetric(self.registry, self.buckets)
+
+                    self._children[key] = child
+
+        return child
+
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def expose(self) -> List[str]:
+        """
+        Lines of the family in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+        with self._lock:
+            children = list(self._children.items())
+
+        for values, child in children:
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+
+            if isinstance(child, HistogramMetric):
+                histogram = child.histogram
+                cumulative = 0
+
+                for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _number(bound)
+                    bucket_labels = _labels([*labels, f'le="{le}"'])
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+
+                lines.append(f"{self.name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{self.name}_count{_labels(labels)} {histogram.count}")
+            else:
+                lines.append(f"{self.name}{_labels(labels)} {_number(child.value)}")  # type: ignore[attr-defined]
+
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: List[str]) -> str:
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Metrics Registry holds the counters, gauges and histograms of the process.
+
+    Metrics are registered at import time, counters and histograms cost a single attribute check per update while the
+    registry is disabled, which it is until `enable` or `start_http_server` is called. Gauges always hold their value.
+
+    Example Usage:
+        ```python
+        from ai01.utils import metrics
+
+        metrics.start_http_server(9464)
+        ```
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        """
+        Counters and histograms are updated only while the registry is enabled.
+        """
+
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<MetricsRegistry enabled={self.enabled} metrics={len(self._families)}>"
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register("counter", name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register("gauge", name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_MS_BUCKETS,
+    ) -> MetricFamily:
+        return self._register("histogram", name, documentation, labelnames, buckets)
+
+    def expose(self) -> str:
+        """
+        Every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            families = list(self._families.values())
+
+        return "\n".join(line for family in families for line in family.expose()) + "\n"
+
+    def _register(
+        self,
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = LATENCY_MS_BUCKETS,
+    ) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+
+            if family is None:
+                family = self._families[name] = MetricFamily(self, kind, name, documentation, labelnames, buckets)
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {family.kind} with labels {family.labelnames}")
+
+            return family
+
+
+REGISTRY = MetricsRegistry()
+"""
+Process-wide Metrics Registry, every metric of ai01 is registered in it.
+"""
+
+
+def enable(enabled: bool = True):
+    """
+    Start, or stop, recording the metrics of the process-wide registry.
+    """
+    REGISTRY.enabled = enabled
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = self.registry.expose().encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        logger.debug(format % args)
+
+
+def start_http_server(
+    port: int = 9464,
+    addr: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None,
+) -> ThreadingHTTPServer:
+    """
+    Enable the registry and serve it in the Prometheus text exposition format at `/metrics`, from a daemon thread.
+    Call `shutdown()` and `server_close()` on the returned server to stop serving.
+    """
+    registry = registry or REGISTRY
+    registry.enabled = True
+
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((addr, port), handler)
+
+    thread = threading.Thread(target=server.serve_forever, name="ai01-metrics", daemon=True)
+    thread.start()
+
+    logger.info(f"Serving metrics at http://{addr}:{server.server_address[1]}/metrics")
+
+    return server
+
+
+_env_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    Serve the metrics when `AI01_METRICS_PORT` is set, once per process, called by the application or the AgentHost
+    at startup. Returns the server, None when the variable is not set.
+    """
+    global _env_server
+
+    port = os.environ.get(METRICS_PORT_ENV)
+
+    if _env_server is None and port:
+        try:
+            _env_server = start_http_server(int(port), os.environ.get("AI01_METRICS_ADDR", "127.0.0.1"))
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not serve metrics on {METRICS_PORT_ENV}={port}: {e}")
+
+    return _env_server
+
+
+def stop_env_server():
+    """
+    Stop serving the metrics started by `serve_from_env`, the next `serve_from_env` serves them again.
+    """
+    global _env_server
+
+    if _env_server is not None:
+        _env_server.shutdown()
+        _env_server.server_close()
+        _env_server = None
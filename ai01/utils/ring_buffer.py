@@ -0,0 +1,169 @@
+from typing import Union
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity ring buffer of interleaved int16 PCM samples.
+
+    The storage is allocated once, writes and reads copy into and out of it with at most
+    two slice assignments, and clearing only resets the read and write positions, so none of
+    the operations allocate on the hot path.
+
+    All positions and sizes are expressed in samples per channel.
+    The buffer is not thread-safe, callers sharing it across threads must hold their own lock.
+    """
+
+    def __init__(self, capacity: int, channels: int = 1):
+        if capacity <= 0:
+            raise ValueError("Ring Buffer capacity must be greater than 0.")
+
+        self.capacity = capacity
+        """
+        Capacity is the maximum number of samples per channel the buffer can hold.
+        """
+
+        self.channels = channels
+        """
+        Channels is the number of interleaved audio channels.
+        """
+
+        self._data = np.zeros(capacity * channels, dtype=np.int16)
+        """
+        Preallocated interleaved sample storage.
+        """
+
+        self._read = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"<AudioRingBuffer size={self._size} capacity={self.capacity} channels={self.channels}>"
+
+    @property
+    def available(self) -> int:
+        """
+        Number of samples per channel ready to be read.
+        """
+        return self._size
+
+    @property
+    def free(self) -> int:
+        """
+        Number of samples per channel which can be written without overflowing.
+        """
+        return self.capacity - self._size
+
+    def write(self, samples: Union[np.ndarray, bytes, bytearray, memoryview], overwrite: bool = False) -> int:
+        """
+        Write interleaved int16 samples into the buffer.
+
+        When the buffer does not have enough room, the newest samples are dropped, or with `overwrite`
+        the oldest buffered samples are discarded to make room.
+
+        Returns the number of samples per channel which were written.
+        """
+        if not isinstance(samples, np.ndarray):
+            samples = np.frombuffer(samples, dtype=np.int16)
+
+        channels = self.channels
+        count = samples.size // channels
+
+        if count == 0:
+            return 0
+
+        if count > self.capacity:
+            if not overwrite:
+                count = self.capacity - self._size
+                samples = samples[: count * channels]
+            else:
+                # Only the tail of the input can survive, everything buffered is discarded.
+                samples = samples[(count - self.capacity) * channels :]
+                count = self.capacity
+                self._read = 0
+                self._size = 0
+        elif count > self.capacity - self._size:
+            if overwrite:
+                drop = count - (self.capacity - self._size)
+                self._read = (self._read + drop) % self.capacity
+                self._size -= drop
+            else:
+                count = self.capacity - self._size
+                samples = samples[: count * channels]
+
+        if count == 0:
+            return 0
+
+        start = (self._read + self._size) % self.capacity
+        first = min(count, self.capacity - start)
+
+        self._data[start * channels : (start + first) * channels] = samples[: first * channels]
+
+        if first < count:
+            self._data[: (count - first) * channels] = samples[first * channels : count * channels]
+
+        self._size += count
+
+        return count
+
+    def read_into(self, out: np.ndarray) -> int:
+        """
+        Read exactly `len(out) // channels` samples per channel into `out`.
+
+        Nothing is consumed when the buffer holds fewer samples than requested,
+        in which case 0 is returned, otherwise the number of samples per channel read.
+        """
+        channels = self.channels
+        count = out.size // channels
+
+        if count == 0 or count > self._size:
+            return 0
+
+        return self._copy_out(out, count)
+
+    def read_available_into(self, out: np.ndarray) -> int:
+        """
+        Read up to `len(out) // channels` samples per channel into `out`, returning the number read.
+        """
+        count = min(out.size // self.channels, self._size)
+
+        if count == 0:
+            return 0
+
+        return self._copy_out(out, count)
+
+    def skip(self, count: int) -> int:
+        """
+        Discard up to `count` samples per channel from the read side, returning the number discarded.
+        """
+        count = min(count, self._size)
+
+        self._read = (self._read + count) % self.capacity
+        self._size -= count
+
+        return count
+
+    def clear(self):
+        """
+        Clear the buffer, this only resets the positions and does not touch the storage.
+        """
+        self._read = 0
+        self._size = 0
+
+    def _copy_out(self, out: np.ndarray, count: int) -> int:
+        channels = self.channels
+        start = self._read
+        first = min(count, self.capacity - start)
+
+        out[: first * channels] = self._data[start * channels : (start + first) * channels]
+
+        if first < count:
+            out[first * channels : count * channels] = self._data[: (count - first) * channels]
+
+        self._read = (start + count) % self.capacity
+        self._size -= count
+
+        return count
@@ -1,17 +1,38 @@
 import asyncio
-import json
+import itertools
 import logging
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Literal, Optional, Tuple, Union
 
 import websockets
 
-logging.basicConfig(level=logging.INFO)
+from .histogram import Histogram
+from .json_codec import JsonBackend, JsonCodec, get_json_codec
+from .metrics import REGISTRY
+
 logger = logging.getLogger(__name__)
 
+SENT_MESSAGES = REGISTRY.counter("ai01_socket_messages_sent_total", "Messages sent on the sockets, by priority.", ("priority",))
+SENT_BYTES = REGISTRY.counter("ai01_socket_bytes_sent_total", "Bytes sent on the sockets, text frames count their UTF-8 encoding.")
+DROPPED_MESSAGES = REGISTRY.counter("ai01_socket_dropped_messages_total", "Queued messages dropped because the socket was closed.")
+SEND_LATENCY = REGISTRY.histogram("ai01_socket_send_latency_ms", "Time from queueing a message to sending it, in milliseconds.")
+
+SendPriority = Literal["control", "audio"]
+"""
+Send Priority of a message, `control` messages are sent ahead of every queued `audio` message.
+"""
+
+_PRIORITIES: Dict[str, int] = {"control": 0, "audio": 1}
+
 
 class SocketClient:
     """
     Handles all the websocket related operations
+
+    Messages are sent by a single writer task from a priority queue, so producers only wait for a slot in the queue
+    and never for the socket itself. Control messages jump ahead of queued audio, audio messages are bounded by
+    `send_queue_size` so a stalled socket applies backpressure to the audio producer instead of growing the queue.
+    Every wake-up of the writer sends all pending messages, up to `batch_size`, back to back.
     """
 
     def __init__(
@@ -20,6 +41,9 @@ class SocketClient:
         headers: Dict[str, str],
         loop: asyncio.AbstractEventLoop,
         json: bool = True,
+        send_queue_size: int = 64,
+        batch_size: int = 32,
+        codec: Union[JsonBackend, JsonCodec] = "stdlib",
     ):
         # URL is the WebSocket server URL.
         self.url = url
@@ -39,6 +63,28 @@ class SocketClient:
         # JSON flag to determine if the messages are JSON or not.
         self.json = json
 
+        # Codec is the JSON Codec used to encode the messages sent, and to decode the messages received.
+        self.codec = codec if isinstance(codec, JsonCodec) else get_json_codec(codec)
+
+        # Batch Size is the most messages the writer sends per wake-up.
+        self.batch_size = batch_size
+
+        # Send Latency is the time from queueing a message to it being written to the socket, in milliseconds.
+        self.send_latency = Histogram()
+
+        # Dropped is the number of queued messages which could not be sent because the connection was closed.
+        self.dropped = 0
+
+        # Send Queue holds (priority, sequence, message, queued at, raw) of the messages waiting for the writer.
+        self._send_queue: asyncio.PriorityQueue[Tuple[int, int, Any, float, bool]] = asyncio.PriorityQueue()
+
+        # Audio Slots bound the number of queued audio messages, control messages are never held back.
+        self._audio_slots = asyncio.Semaphore(send_queue_size)
+
+        self._sequence = itertools.count()
+
+        self._writer_tsk: Optional[asyncio.Task] = None
+
     @property
     def ws(self) -> websockets.WebSocketClientProtocol:
         # Get the WebSocket connection, raising an error if not connected.
@@ -59,32 +105,140 @@ class SocketClient:
             self._logger.info(f"Attempting to connect to WebSocket at {self.url}")
             
             self.__ws = await websockets.connect(self.url, extra_headers=self.headers)
-            
+
+            if self._writer_tsk is None or self._writer_tsk.done():
+                self._writer_tsk = asyncio.create_task(self._writer(), name="SocketClient-Writer")
+
             self._logger.info("WebSocket connection established")
         except Exception as e:
             self._logger.error(f"Error connecting to WebSocket: {e}")
             raise
 
-    async def send(self, message: Any):
+    @property
+    def pending(self) -> int:
         """
-        Send a message to the WebSocket server.
+        Number of messages waiting to be sent.
+        """
+        return self._send_queue.qsize()
+
+    async def send(self, message: Any, priority: SendPriority = "control", raw: bool = False):
+        """
+        Queue a message to be sent to the WebSocket server, waits only while the audio queue is full.
+        A `raw` message is an already encoded `str` or `bytes` and is sent as is.
         """
         try:
             if not self.__ws:
                 raise Exception("WebSocket is not connected")
 
-            dump_data = json.dumps(message) if self.json else message
+            if priority == "audio":
+                await self._audio_slots.acquire()
 
-            await self.__ws.send(dump_data)
+            self._send_queue.put_nowait((_PRIORITIES[priority], next(self._sequence), message, time.monotonic(), raw))
 
         except Exception as e:
             self._logger.error(f"Error sending message: {e}")
             raise
 
+    async def flush(self):
+        """
+        Wait until every queued message has been sent.
+        """
+        if self._writer_tsk is None or self._writer_tsk.done():
+            return
+
+        await self._send_queue.join()
+
+    async def aclose(self, timeout: Optional[float] = 5.0):
+        """
+        Close the WebSocket connection gracefully, the queued messages are sent first, for at most `timeout` seconds.
+        """
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            self._logger.warning(f"Closing with {self.pending} messages not sent")
+
+        if self._writer_tsk is not None:
+            self._writer_tsk.cancel()
+            self._writer_tsk = None
+
+        if self.__ws:
+            self._logger.info("Closing WebSocket connection")
+            await self.__ws.close()
+
     def close(self):
         """
         Close the WebSocket connection.
         """
         if self.__ws:
-            self._logger.info("Closing WebSocket connection")
-            self.loop.create_task(self.__ws.close())
+            self.loop.create_task(self.aclose())
+
+    async def _writer(self):
+        """
+        Writer is the single task writing the queued messages to the WebSocket.
+        """
+        queue = self._send_queue
+        dumps = self.codec.dumps
+        sent_messages = {prio: SENT_MESSAGES.labels(name) for name, prio in _PRIORITIES.items()}
+
+        while True:
+            batch = [await queue.get()]
+
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            done = 0
+
+            try:
+                for priority, _, message, queued_at, raw in batch:
+                    # Counted first, `_write` settles its own message however it ends.
+                    done += 1
+                    await self._write(priority, message, queued_at, raw, dumps, sent_messages)
+
+            finally:
+                # A cancelled writer still settles the rest of its batch, so `flush` and the audio producers never hang.
+                for priority, *_ in batch[done:]:
+                    self._settle(priority)
+
+    async def _write(self, priority: int, message: Any, queued_at: float, raw: bool, dumps, sent_messages: Dict[int, Any]):
+        """
+        Write one queued message to the WebSocket, it is settled even when the write is cancelled.
+        """
+        try:
+            ws = self.__ws
+
+            if ws is None or not ws.open:
+                self.dropped += 1
+                DROPPED_MESSAGES.inc()
+                return
+
+            payload = dumps(message) if self.json and not raw else message
+
+            await ws.send(payload)
+
+            latency = (time.monotonic() - queued_at) * 1000
+
+            self.send_latency.observe(latency)
+            SEND_LATENCY.observe(latency)
+            sent_messages[priority].inc()
+
+            # `isascii` is a flag lookup, only non-ASCII text pays for an encode to count its bytes.
+            if isinstance(payload, str) and not payload.isascii():
+                SENT_BYTES.inc(len(payload.encode()))
+            else:
+                SENT_BYTES.inc(len(payload))
+
+        except websockets.ConnectionClosed:
+            self.dropped += 1
+            DROPPED_MESSAGES.inc()
+
+        except Exception as e:
+            self._logger.error(f"Error sending message: {e}")
+
+        finally:
+            self._settle(priority)
+
+    def _settle(self, priority: int):
+        if priority == _PRIORITIES["audio"]:
+            self._audio_slots.release()
+
+        self._send_queue.task_done()
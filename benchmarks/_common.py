@@ -0,0 +1,54 @@
+import time
+import tracemalloc
+from typing import Callable
+
+
+def cpu_time(fn: Callable[[], None], iterations: int) -> float:
+    """
+    CPU seconds spent running `fn` `iterations` times.
+    """
+    start = time.process_time()
+
+    for _ in range(iterations):
+        fn()
+
+    return time.process_time() - start
+
+
+def allocated_bytes(fn: Callable[[], None], iterations: int) -> int:
+    """
+    Bytes transiently allocated by the Python and NumPy allocators while running `fn` `iterations` times.
+
+    The peak above the current traced memory is sampled around every call and summed,
+    which counts every short-lived buffer a call creates even when it is freed before returning.
+    """
+    tracemalloc.start()
+
+    total = 0
+
+    try:
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+
+            fn()
+
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+
+    return total
+
+
+def report(title: str, rows: list[tuple[str, ...]], header: tuple[str, ...]):
+    """
+    Print a fixed-width table of benchmark results.
+    """
+    widths = [max(len(str(r[i])) for r in [header, *rows]) for i in range(len(header))]
+
+    print(f"\n{title}")
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -0,0 +1,94 @@
+"""
+Measures the per-chunk cost of encoding `input_audio_buffer.append` messages,
+building a dict with a `uuid4` event id and encoding it with each JSON backend, versus the pre-serialized Append Encoder.
+Before timing, every message of the Append Encoder is checked to decode to the same object as the dict.
+
+Run with `python -m benchmarks.audio_append_encode`.
+"""
+
+import base64
+import json
+import time
+import uuid
+
+import numpy as np
+
+from ai01.providers.openai.realtime.append_encoder import AppendEncoder
+from ai01.utils.json_codec import available_backends, get_json_codec
+
+from ._common import allocated_bytes, report
+
+CHUNK_MS = (20, 100, 200)
+ITERATIONS = 20000
+
+
+def _pcm(ms: int) -> bytes:
+    return (np.random.default_rng(ms).standard_normal(16 * ms) * 4000).astype(np.int16).tobytes()
+
+
+def _dict_encoder(backend: str):
+    dumps = get_json_codec(backend).dumps
+
+    def encode(pcm: bytes) -> str:
+        payload = {
+            "event_id": str(uuid.uuid4()),
+            "type": "input_audio_buffer.append",
+            "audio": base64.b64encode(pcm).decode("utf-8"),
+        }
+
+        return dumps(payload)
+
+    return encode
+
+
+def _check_round_trip():
+    """
+    The Append Encoder's messages decode to the dict the other encoders serialize, for chunks of every base64 padding.
+    """
+    encoder = AppendEncoder()
+
+    for size in (0, 1, 2, 3, 64, 65, 3200, 6401):
+        pcm = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+        message = json.loads(encoder.encode(pcm))
+
+        assert message == {
+            "type": "input_audio_buffer.append",
+            "event_id": message["event_id"],
+            "audio": base64.b64encode(pcm).decode("utf-8"),
+        }, f"Append Encoder round trip failed for {size} bytes"
+
+
+def _per_chunk_us(encode, pcm: bytes) -> float:
+    start = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        encode(pcm)
+
+    return (time.perf_counter() - start) * 1e6 / ITERATIONS
+
+
+def main():
+    encoders = {f"dict + {backend}": _dict_encoder(backend) for backend in available_backends()}
+    encoders["append encoder"] = AppendEncoder().encode
+
+    _check_round_trip()
+
+    rows = []
+
+    for ms in CHUNK_MS:
+        pcm = _pcm(ms)
+
+        for name, encode in encoders.items():
+            allocated = allocated_bytes(lambda: encode(pcm), 1000)
+
+            rows.append((str(ms), name, f"{_per_chunk_us(encode, pcm):.2f}", f"{allocated / 1000:,.0f}"))
+
+    report(
+        f"input_audio_buffer.append encoding, 16 kHz mono PCM, {ITERATIONS} chunks",
+        rows,
+        ("chunk ms", "encoder", "us/chunk", "peak bytes/chunk"),
+    )
+
+
+if __name__ == "__main__":
+    main()
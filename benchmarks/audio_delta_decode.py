@@ -0,0 +1,104 @@
+"""
+Measures event loop lag while many sessions receive `response.audio.delta` bursts,
+with the deltas decoded inline on the loop versus on the decode thread pool.
+
+Every session submits one delta of `DELTA_MS` audio every 20 ms, which is how the Realtime API
+bursts a response faster than real time, while a probe task records how late its 5 ms sleeps wake up.
+
+Run with `python -m benchmarks.audio_delta_decode`.
+"""
+
+import asyncio
+import base64
+import time
+
+import numpy as np
+
+from ai01.providers.openai.audio_decoder import AudioDeltaDecoder
+from ai01.providers.openai.audio_track import AudioTrack, AudioTrackOptions
+from ai01.utils.histogram import Histogram
+
+from ._common import report
+
+SESSIONS = (8, 32, 64)
+DELTA_MS = 200
+DURATION = 2.0
+PROBE_INTERVAL = 0.005
+
+
+def _delta() -> str:
+    pcm = (np.random.default_rng(0).standard_normal(24 * DELTA_MS) * 4000).astype(np.int16)
+    return base64.b64encode(pcm.tobytes()).decode("utf-8")
+
+
+async def _probe(lag: Histogram, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lag.observe((loop.time() - start - PROBE_INTERVAL) * 1000)
+
+
+async def _session(decoder: AudioDeltaDecoder, delta: str, stop: asyncio.Event):
+    while not stop.is_set():
+        decoder.submit(delta)
+        await asyncio.sleep(0.020)
+
+
+async def run(sessions: int, backend: str, delta: str) -> tuple[Histogram, float]:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    lag = Histogram()
+
+    options = AudioTrackOptions(buffer_capacity_ms=int(DURATION * 1000 * DELTA_MS / 20) + 1000)
+    decoders = [
+        AudioDeltaDecoder(track=AudioTrack(options), backend=backend, loop=loop)
+        for _ in range(sessions)
+    ]
+
+    cpu = time.process_time()
+
+    tasks = [asyncio.create_task(_session(d, delta, stop)) for d in decoders]
+    tasks.append(asyncio.create_task(_probe(lag, stop)))
+
+    await asyncio.sleep(DURATION)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    cpu = time.process_time() - cpu
+
+    for d in decoders:
+        d.track.stop()
+
+    return lag, cpu
+
+
+async def main():
+    delta = _delta()
+    rows = []
+
+    for sessions in SESSIONS:
+        for backend in ("inline", "thread"):
+            lag, cpu = await run(sessions, backend, delta)
+            rows.append(
+                (
+                    str(sessions),
+                    backend,
+                    f"{lag.mean:.2f}",
+                    f"{lag.percentile(50)}",
+                    f"{lag.percentile(99)}",
+                    f"{lag.max:.2f}",
+                    f"{cpu / DURATION:.2f}",
+                )
+            )
+
+    report(
+        f"Event loop lag, one {DELTA_MS} ms delta per session every 20 ms",
+        rows,
+        ("sessions", "backend", "mean ms", "p50 ms", "p99 ms", "max ms", "cpu s/s"),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
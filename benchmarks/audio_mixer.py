@@ -0,0 +1,92 @@
+"""
+Measures the per-tick cost of mixing 2, 8 and 32 peers with the Conversation's Audio Mixer.
+
+Every tick pushes one 20 ms 48 kHz frame per peer, which resamples it to 16 kHz,
+and mixes one 20 ms output block. Push and mix are timed separately, and so is the `ready` check the
+Conversation makes after every pushed frame.
+
+Run with `python -m benchmarks.audio_mixer`.
+"""
+
+import fractions
+import time
+
+import numpy as np
+from av import AudioFrame
+
+from ai01.rtc.audio_mixer import AudioMixer
+
+from ._common import report
+
+PEERS = (2, 8, 32)
+TICKS = 500
+INPUT_RATE = 48000
+INPUT_SAMPLES = 960
+
+
+def _frame(peer: int, tick: int) -> AudioFrame:
+    pcm = (np.random.default_rng(peer * TICKS + tick).standard_normal(INPUT_SAMPLES) * 6000).astype(np.int16)
+    frame = AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = INPUT_RATE
+    frame.time_base = fractions.Fraction(1, INPUT_RATE)
+    frame.pts = tick * INPUT_SAMPLES
+    return frame
+
+
+def run(peers: int) -> tuple[float, float, float, int]:
+    mixer = AudioMixer(rate=16000, layout="mono")
+
+    for peer in range(peers):
+        mixer.add_track(str(peer))
+
+    frames = [[_frame(peer, tick) for peer in range(peers)] for tick in range(TICKS)]
+
+    push = 0.0
+    ready = 0.0
+    mix = 0.0
+    blocks = 0
+
+    for tick in range(TICKS):
+        for peer, frame in enumerate(frames[tick]):
+            start = time.perf_counter()
+            mixer.push(str(peer), frame)
+            push += time.perf_counter() - start
+
+            start = time.perf_counter()
+            mixer.ready()
+            ready += time.perf_counter() - start
+
+        start = time.perf_counter()
+        while mixer.mix() is not None:
+            blocks += 1
+        mix += time.perf_counter() - start
+
+    return push / TICKS, ready / TICKS, mix / max(blocks, 1), blocks
+
+
+def main():
+    rows = []
+
+    for peers in PEERS:
+        push, ready, mix, blocks = run(peers)
+        rows.append(
+            (
+                str(peers),
+                f"{push * 1e6:.1f}",
+                f"{push * 1e6 / peers:.1f}",
+                f"{ready * 1e6:.1f}",
+                f"{mix * 1e6:.1f}",
+                f"{mix * 1e6 / peers:.2f}",
+                str(blocks),
+            )
+        )
+
+    report(
+        f"Audio Mixer, {TICKS} ticks of 20 ms",
+        rows,
+        ("peers", "push us/tick", "push us/peer", "ready us/tick", "mix us/block", "mix us/peer", "blocks"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Compares the OpenAI `AudioTrack` output path before and after the ring buffer.
+
+`fifo` replays the previous implementation, which built an `AudioFrame` for every delta,
+wrote it into an `av.AudioFifo` and read a freshly allocated frame every 20 ms.
+`ring` is the current implementation, which decodes into the preallocated ring buffer and
+reads into a pooled frame.
+
+The silence section compares the previous per-call silent frame construction with the frame pool.
+
+Run with `python -m benchmarks.audio_track_buffer`.
+"""
+
+import base64
+import fractions
+
+import numpy as np
+from av import AudioFrame
+from av.audio.fifo import AudioFifo
+
+from ai01.providers.openai.audio_track import AudioTrack, AudioTrackOptions
+
+from ._common import allocated_bytes, cpu_time, report
+
+SAMPLE_RATE = 24000
+FRAME_SAMPLES = 480
+DELTA_MS = 100
+SECONDS = 60
+
+FRAMES_PER_DELTA = DELTA_MS // 20
+
+
+def _delta() -> str:
+    pcm = (np.sin(np.arange(SAMPLE_RATE * DELTA_MS // 1000) / 10) * 8000).astype(np.int16)
+    return base64.b64encode(pcm.tobytes()).decode("utf-8")
+
+
+def fifo_path(delta: str, frames: set):
+    fifo = AudioFifo()
+
+    def step():
+        audio_array = np.frombuffer(base64.b64decode(delta), dtype=np.int16).reshape(1, -1)
+        frame = AudioFrame.from_ndarray(audio_array, format="s16", layout="mono")
+        frame.sample_rate = SAMPLE_RATE
+        frame.time_base = fractions.Fraction(1, SAMPLE_RATE)
+        fifo.write(frame)
+        frames.add(frame)
+
+        for _ in range(FRAMES_PER_DELTA):
+            out = fifo.read(FRAME_SAMPLES)
+            out.sample_rate = SAMPLE_RATE
+            out.time_base = fractions.Fraction(1, SAMPLE_RATE)
+            frames.add(out)
+
+    return step
+
+
+def ring_path(delta: str, frames: set):
+    track = AudioTrack(AudioTrackOptions(sample_rate=SAMPLE_RATE))
+
+    def step():
+        track.enqueue_audio(delta)
+
+        for _ in range(FRAMES_PER_DELTA):
+            pooled = track.frame_pool.acquire()
+            with track.fifo_lock:
+                track.audio_buffer.read_into(pooled.samples)
+            frames.add(pooled.frame)
+
+    return step
+
+
+def fresh_silence(frames: set):
+    def step():
+        frame = AudioFrame(format="s16", layout="mono", samples=FRAME_SAMPLES)
+        for p in frame.planes:
+            p.update(np.zeros(FRAME_SAMPLES, dtype=np.int16).tobytes())
+        frame.sample_rate = SAMPLE_RATE
+        frame.time_base = fractions.Fraction(1, SAMPLE_RATE)
+        frames.add(frame)
+
+    return step
+
+
+def pooled_silence(frames: set):
+    track = AudioTrack(AudioTrackOptions(sample_rate=SAMPLE_RATE))
+
+    def step():
+        frames.add(track.frame_pool.acquire_silence())
+
+    return step
+
+
+def main():
+    delta = _delta()
+    iterations = SECONDS * 1000 // DELTA_MS
+
+    rows = []
+
+    for name, factory in (("fifo", fifo_path), ("ring", ring_path)):
+        cpu = cpu_time(factory(delta, set()), iterations) / SECONDS
+        alloc = allocated_bytes(factory(delta, set()), iterations) / SECONDS
+
+        # Frames are kept alive in the set, so every distinct object is a frame allocation.
+        frames: set = set()
+        step = factory(delta, frames)
+        for _ in range(iterations):
+            step()
+
+        rows.append((name, f"{cpu * 1e3:.3f}", f"{alloc / 1024:.1f}", f"{len(frames) / SECONDS:.1f}"))
+
+    report(
+        f"AudioTrack output path, {DELTA_MS} ms deltas, per second of audio",
+        rows,
+        ("path", "cpu ms/s", "py+numpy KiB/s", "AudioFrames/s"),
+    )
+    print("py+numpy KiB/s excludes libav allocations, which are counted by AudioFrames/s.")
+
+    iterations = SECONDS * 1000 // 20
+
+    rows = []
+
+    for name, factory in (("fresh", fresh_silence), ("pooled", pooled_silence)):
+        cpu = cpu_time(factory(set()), iterations) / SECONDS
+        alloc = allocated_bytes(factory(set()), iterations) / SECONDS
+
+        frames: set = set()
+        step = factory(frames)
+        for _ in range(iterations):
+            step()
+
+        rows.append((name, f"{cpu * 1e3:.3f}", f"{alloc / 1024:.1f}", f"{len(frames) / SECONDS:.1f}"))
+
+    report(
+        "AudioTrack silence, per second of audio",
+        rows,
+        ("path", "cpu ms/s", "py+numpy KiB/s", "AudioFrames/s"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Soak test of the Conversation's track lifecycle over thousands of join and leave cycles.
+
+Every cycle adds a few peers, streams some frames, pauses and resumes one, then lets one track end on its own
+and removes the others, as when peers keep joining and leaving a room. Traced memory, pending tasks and tracked
+tracks are sampled along the way, all of them should stay flat.
+
+Run with `python -m benchmarks.conversation_soak`.
+"""
+
+import asyncio
+import fractions
+import gc
+import tracemalloc
+
+import numpy as np
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
+from av import AudioFrame
+
+from ai01.providers.openai.realtime.conversation import Conversation
+
+from ._common import report
+
+CYCLES = 5000
+PEERS_PER_CYCLE = 3
+FRAMES_PER_TRACK = 5
+SAMPLES = 960
+RATE = 48000
+
+
+class SyntheticTrack(MediaStreamTrack):
+    kind = "audio"
+
+    def __init__(self, frames: int):
+        super().__init__()
+        self._frames = frames
+        self._pts = 0
+        self._pcm = np.zeros((1, SAMPLES), dtype=np.int16)
+
+    async def recv(self) -> AudioFrame:
+        if self._frames <= 0:
+            self.stop()
+            raise MediaStreamError
+
+        self._frames -= 1
+
+        await asyncio.sleep(0)
+
+        frame = AudioFrame.from_ndarray(self._pcm, format="s16", layout="mono")
+        frame.sample_rate = RATE
+        frame.time_base = fractions.Fraction(1, RATE)
+        frame.pts = self._pts
+        self._pts += SAMPLES
+
+        return frame
+
+
+async def main():
+    conversation = Conversation(id="soak")
+
+    rows = []
+    tracemalloc.start()
+
+    for cycle in range(1, CYCLES + 1):
+        ids = [f"{cycle}-{peer}" for peer in range(PEERS_PER_CYCLE)]
+
+        for id in ids:
+            conversation.add_track(id, SyntheticTrack(FRAMES_PER_TRACK))
+
+        conversation.pause_track(ids[1])
+
+        for _ in range(FRAMES_PER_TRACK):
+            await asyncio.sleep(0)
+            conversation.recv()
+
+        conversation.resume_track(ids[1])
+
+        # The first track ends on its own and is reaped, the others leave the room.
+        for id in ids[1:]:
+            conversation.remove_track(id)
+
+        await asyncio.sleep(0)
+
+        if cycle % (CYCLES // 10) == 0:
+            await asyncio.sleep(0)
+            gc.collect()
+
+            current, _ = tracemalloc.get_traced_memory()
+
+            rows.append(
+                (
+                    str(cycle),
+                    f"{current / 1024:.0f}",
+                    str(len(asyncio.all_tasks()) - 1),
+                    str(len(conversation._track_fut)),
+                    str(len(conversation.audio_mixer.tracks)),
+                )
+            )
+
+    await conversation.close()
+
+    tracemalloc.stop()
+
+    report(
+        f"Conversation soak, {CYCLES} cycles of {PEERS_PER_CYCLE} peers",
+        rows,
+        ("cycle", "traced KiB", "tasks", "tracks", "mixer tracks"),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
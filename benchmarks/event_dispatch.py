@@ -0,0 +1,197 @@
+"""
+Measures the per-event cost of handling server events in the RealTimeModel, the former if/elif chain of
+`_handle_message` versus the dispatch registry, `RealTimeModel._handle_message` as shipped.
+
+Both run the RealTimeModel's own handlers on the same stream of JSON messages, shaped after a recorded realtime turn:
+mostly audio and transcript deltas, bracketed by the speech, item, response and content part events, with the fields
+the handlers read. The chain is the `_handle_message` which preceded the registry, including its decode and its
+log line after every event, the registry path adds the per-type counter, the lookup of the `on` listeners and the
+await of the async handlers. The registry handles every event type, the chain skipped some of the stream's events,
+e.g. `input_audio_buffer.committed` and `rate_limits.updated`, so the registry also does more handler work.
+
+The Agent has no Audio Track, so the audio deltas are not decoded and the time is spent dispatching and in the handlers.
+Each path is timed from the socket message, `_handle_message`, where the JSON decode of the deltas dominates, and from
+the decoded event, `_dispatch`. The paths take turns round by round, so that drifts of the machine hit both alike.
+
+Run with `python -m benchmarks.event_dispatch`.
+"""
+
+import asyncio
+import base64
+import json
+import time
+from typing import Union
+
+from huddle01 import HuddleClientOptions, Role
+
+from ai01.agent import Agent, AgentOptions
+from ai01.providers.openai.realtime import RealTimeModel, RealTimeModelOptions
+from ai01.rtc import RTCOptions
+
+from ._common import report
+
+ROUNDS = 500
+
+# 100 ms of 24 kHz pcm16, the size of a typical `response.audio.delta`.
+_DELTA = base64.b64encode(bytes(4800)).decode()
+
+
+def _stream() -> list[str]:
+    """
+    Messages of one turn, as received from the socket.
+    """
+    user_item = {"id": "item_user", "type": "message", "role": "user", "content": [{"type": "input_audio"}]}
+    assistant_item = {"id": "item_agent", "type": "message", "role": "assistant", "content": []}
+    part = {"item_id": "item_agent", "output_index": 0, "content_index": 0}
+
+    turn = [
+        {"type": "input_audio_buffer.speech_started", "audio_start_ms": 1000, "item_id": "item_user"},
+        {"type": "input_audio_buffer.speech_stopped", "audio_end_ms": 3000, "item_id": "item_user"},
+        {"type": "input_audio_buffer.committed", "previous_item_id": None, "item_id": "item_user"},
+        {"type": "conversation.item.created", "previous_item_id": None, "item": user_item},
+        {"type": "response.created", "response": {"id": "resp_1", "status": "in_progress", "output": []}},
+        {"type": "rate_limits.updated", "rate_limits": [{"name": "tokens", "limit": 20000, "remaining": 19000, "reset_seconds": 3}]},
+        {"type": "response.output_item.added", "response_id": "resp_1", "output_index": 0, "item": assistant_item},
+        {"type": "conversation.item.created", "previous_item_id": "item_user", "item": assistant_item},
+        {"type": "response.content_part.added", **part, "part": {"type": "audio", "transcript": ""}},
+    ]
+
+    for _ in range(40):
+        turn.append({"type": "response.audio.delta", "response_id": "resp_1", **part, "delta": _DELTA})
+        turn.append({"type": "response.audio_transcript.delta", "response_id": "resp_1", **part, "delta": "Hello "})
+
+    turn += [
+        {"type": "response.audio.done", "response_id": "resp_1", **part},
+        {"type": "response.audio_transcript.done", "response_id": "resp_1", **part, "transcript": "Hello " * 40},
+        {"type": "response.content_part.done", "response_id": "resp_1", **part, "part": {"type": "audio"}},
+        {"type": "response.output_item.done", "response_id": "resp_1", "output_index": 0, "item": assistant_item},
+        {"type": "response.done", "response": {"id": "resp_1", "status": "completed", "output": [assistant_item]}},
+        {"type": "conversation.item.input_audio_transcription.completed", "item_id": "item_user", "content_index": 0, "transcript": "Hi"},
+    ]
+
+    for i, event in enumerate(turn):
+        event["event_id"] = f"event_{i:04d}"
+
+    return [json.dumps(event) for event in turn]
+
+
+async def _chain_handle_message(self: RealTimeModel, message: Union[str, bytes]):
+    # `_handle_message` as it was before the dispatch registry.
+    data = self.socket.codec.loads(message)
+
+    await _chain_dispatch(self, data)
+
+
+async def _chain_dispatch(self: RealTimeModel, data: dict):
+    event = data.get("type", "unknown")
+
+    if event == "session.created":
+        self._handle_session_created(data)
+    elif event == "session.updated":
+        self._handle_session_updated(data)
+    elif event == "error":
+        self._handle_error(data)
+    elif event == "input_audio_buffer.speech_started":
+        await self._handle_input_audio_buffer_speech_started(data)
+    elif event == "input_audio_buffer.speech_stopped":
+        await self._handle_input_audio_buffer_speech_stopped(data)
+    elif event == "response.audio_transcript.delta":
+        self._handle_response_audio_transcript_delta(data)
+    elif event == "conversation.item.input_audio_transcription.completed":
+        self._handle_conversation_item_input_audio_transcription_completed(data)
+    elif event == "conversation.item.created":
+        self._handle_conversation_item_created(data)
+    elif event == "conversation.item.deleted":
+        self._handle_conversation_item_deleted(data)
+    elif event == "response.created":
+        self._handle_response_created(data)
+    elif event == "response.audio.delta":
+        self._handle_response_audio_delta(data)
+    elif event == "response.audio.done":
+        self._handle_response_audio_done(data)
+    elif event == "response.text.done":
+        self._handle_response_text_done(data)
+    elif event == "response.audio_transcript.done":
+        self._handle_response_audio_transcript_done(data)
+    elif event == "response.done":
+        self._handle_response_done(data)
+
+    self._logger.info(f"Unhandled Event: {event}")
+
+
+def _model() -> RealTimeModel:
+    agent = Agent(
+        AgentOptions(
+            rtc_options=RTCOptions(
+                project_id="benchmark",
+                api_key="benchmark",
+                room_id="benchmark",
+                role=Role.HOST,
+                metadata={},
+                huddle_client_options=HuddleClientOptions(autoConsume=True, volatileMessaging=False),
+            ),
+            audio_track=None,
+            text_track=None,
+        )
+    )
+
+    return RealTimeModel(agent=agent, options=RealTimeModelOptions(oai_api_key="benchmark", turn_summary_interval_s=None))
+
+
+async def _time(paths, inputs: list) -> dict:
+    # Warm up every path, so that none pays for the first lookups of the handlers and the metrics.
+    for _, handle in paths:
+        for item in inputs:
+            await handle(item)
+
+    totals = {name: 0.0 for name, _ in paths}
+
+    for _ in range(ROUNDS):
+        for name, handle in paths:
+            start = time.perf_counter()
+
+            for item in inputs:
+                await handle(item)
+
+            totals[name] += time.perf_counter() - start
+
+    return {name: total * 1e9 / (ROUNDS * len(inputs)) for name, total in totals.items()}
+
+
+async def _run() -> list[tuple[str, ...]]:
+    stream = _stream()
+    events = [json.loads(message) for message in stream]
+    model = _model()
+
+    rows = []
+
+    for entry, inputs, chain, registry in (
+        ("_handle_message", stream, _chain_handle_message, RealTimeModel._handle_message),
+        ("_dispatch", events, _chain_dispatch, RealTimeModel._dispatch),
+    ):
+        results = await _time(
+            (
+                ("if/elif chain", lambda item, chain=chain: chain(model, item)),
+                ("registry", lambda item, registry=registry: registry(model, item)),
+            ),
+            inputs,
+        )
+
+        for name, ns in results.items():
+            rows.append((entry, name, f"{ns:.0f}", f"{ns - results['if/elif chain']:+.0f}"))
+
+    return rows
+
+
+def main():
+    rows = asyncio.run(_run())
+
+    report(
+        f"RealTimeModel server event handling, {len(_stream())} events per turn, {ROUNDS} turns",
+        rows,
+        ("from", "dispatch", "ns/event", "vs chain"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Measures encode and decode throughput of every installed JSON backend over realtime payloads.
+
+The payloads follow the shape and mix of a recorded realtime session: mostly `response.audio.delta` events
+carrying 50 ms of 24 kHz audio and `input_audio_buffer.append` events carrying 100 ms of 16 kHz audio,
+with transcript deltas and the occasional larger control event.
+
+Run with `python -m benchmarks.json_codec`.
+"""
+
+import base64
+import time
+
+import numpy as np
+
+from ai01.utils.json_codec import available_backends, get_json_codec
+
+from ._common import report
+
+ROUNDS = 50
+
+
+def _audio(samples: int, seed: int) -> str:
+    pcm = (np.random.default_rng(seed).standard_normal(samples) * 4000).astype(np.int16)
+    return base64.b64encode(pcm.tobytes()).decode("utf-8")
+
+
+def _payloads() -> list[dict]:
+    payloads: list[dict] = []
+
+    for i in range(40):
+        payloads.append(
+            {
+                "type": "response.audio.delta",
+                "event_id": f"event_{i:08d}",
+                "response_id": "resp_0001",
+                "item_id": "item_0001",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": _audio(1200, i),
+            }
+        )
+
+    for i in range(20):
+        payloads.append(
+            {
+                "type": "input_audio_buffer.append",
+                "event_id": f"event_{i:08d}",
+                "audio": _audio(1600, 100 + i),
+            }
+        )
+
+    for i in range(30):
+        payloads.append(
+            {
+                "type": "response.audio_transcript.delta",
+                "event_id": f"event_{i:08d}",
+                "response_id": "resp_0001",
+                "item_id": "item_0001",
+                "output_index": 0,
+                "content_index": 0,
+                "delta": "Sure, here is what I found ",
+            }
+        )
+
+    payloads.append(
+        {
+            "type": "response.done",
+            "event_id": "event_done",
+            "response": {
+                "id": "resp_0001",
+                "object": "realtime.response",
+                "status": "completed",
+                "output": [
+                    {
+                        "id": "item_0001",
+                        "type": "message",
+                        "role": "assistant",
+                        "content": [{"type": "audio", "transcript": "Sure, here is what I found " * 20}],
+                    }
+                ],
+                "usage": {"total_tokens": 1520, "input_tokens": 900, "output_tokens": 620},
+            },
+        }
+    )
+
+    return payloads
+
+
+def main():
+    payloads = _payloads()
+    encoded = [get_json_codec("stdlib").dumps(p) for p in payloads]
+    total_bytes = sum(len(e) for e in encoded)
+
+    rows = []
+
+    for backend in available_backends():
+        codec = get_json_codec(backend)
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for payload in payloads:
+                codec.dumps(payload)
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for message in encoded:
+                codec.loads(message)
+        decode = time.perf_counter() - start
+
+        messages = ROUNDS * len(payloads)
+        megabytes = ROUNDS * total_bytes / 1e6
+
+        rows.append(
+            (
+                backend,
+                f"{messages / encode:,.0f}",
+                f"{megabytes / encode:,.0f}",
+                f"{messages / decode:,.0f}",
+                f"{megabytes / decode:,.0f}",
+            )
+        )
+
+    report(
+        f"JSON codecs, {len(payloads)} payloads, {total_bytes / 1024:.0f} KiB per round, {ROUNDS} rounds",
+        rows,
+        ("backend", "encode msg/s", "encode MB/s", "decode msg/s", "decode MB/s"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the time a hot-path log call costs the calling thread, the Event Loop in production.
+
+Compares the former INFO record per audio delta written by a synchronous file handler, the same record handed to
+the background thread by the OffloopQueueHandler, and the sampled EventLogger at 1 in 50, with logging enabled
+and with DEBUG disabled.
+
+Run with `python -m benchmarks.log_emit`.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from typing import Callable
+
+from ai01.utils.log import (
+    DEFAULT_FORMAT,
+    EventLogger,
+    LogSampler,
+    StructuredFormatter,
+    configure_logging,
+    shutdown_logging,
+)
+
+from ._common import report
+
+ITERATIONS = 20000
+
+
+def thread_time(fn: Callable[[], None], iterations: int) -> float:
+    """
+    CPU seconds the calling thread spent running `fn` `iterations` times, the writer thread is not counted.
+    """
+    start = time.thread_time()
+
+    for _ in range(iterations):
+        fn()
+
+    return time.thread_time() - start
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "bench.log")
+    rows = []
+
+    logger = logging.getLogger("ai01.benchmarks.log_emit")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+
+    file_handler = logging.FileHandler(path)
+    file_handler.setFormatter(StructuredFormatter(DEFAULT_FORMAT))
+
+    logger.addHandler(file_handler)
+    elapsed = thread_time(lambda: logger.info("Response Audio Delta"), ITERATIONS)
+    logger.removeHandler(file_handler)
+
+    rows.append(("sync file handler, INFO", f"{elapsed * 1e6 / ITERATIONS:.2f}"))
+
+    queue_handler = configure_logging(logging.DEBUG, handlers=[file_handler], logger_name=logger.name)
+    elapsed = thread_time(lambda: logger.info("Response Audio Delta"), ITERATIONS)
+
+    rows.append(("queue handler, INFO", f"{elapsed * 1e6 / ITERATIONS:.2f}"))
+
+    events = EventLogger(logger, LogSampler({"response.audio.delta": 50}))
+    elapsed = thread_time(
+        lambda: events.debug("response.audio.delta", "Response Audio Delta", item_id="item_0001", bytes=lambda: 2400),
+        ITERATIONS,
+    )
+
+    rows.append(("queue handler, sampled 1/50", f"{elapsed * 1e6 / ITERATIONS:.2f}"))
+
+    logger.setLevel(logging.INFO)
+    elapsed = thread_time(
+        lambda: events.debug("response.audio.delta", "Response Audio Delta", item_id="item_0001", bytes=lambda: 2400),
+        ITERATIONS,
+    )
+
+    rows.append(("DEBUG disabled", f"{elapsed * 1e6 / ITERATIONS:.2f}"))
+
+    dropped = queue_handler.dropped
+    shutdown_logging()
+    file_handler.close()
+
+    report(
+        f"Log emission cost on the calling thread, {ITERATIONS} records, {dropped} dropped",
+        rows,
+        ("logging", "us/call"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from ai01.rtc import (
     RoomEventsData,
     RTCOptions,
 )
+from ai01.utils.metrics import serve_from_env
 
 from prompt import bot_prompt
 
@@ -61,6 +62,9 @@ logger = logging.getLogger("Chatbot")
 
 async def main():
     try:
+        # Serve the metrics on /metrics when AI01_METRICS_PORT is set.
+        serve_from_env()
+
         # Huddle01 API Key
         huddle_api_key = os.getenv("HUDDLE_API_KEY")
         huddle_api_key="ak_gUgjnRb9yCbHgQZs"
@@ -149,17 +153,23 @@ async def main():
 
                 llm.conversation.add_track(data['consumer_id'], track)
             
-        # @room.on(RoomEvents.ConsumerClosed)
-        # def on_remote_consumer_closed(data: RoomEventsData.ConsumerClosed):
-        #     logger.info(f"Remote Consumer Closed: {data['consumer_id']}")
+        @room.on(RoomEvents.ConsumerClosed)
+        def on_remote_consumer_closed(data: RoomEventsData.ConsumerClosed):
+            logger.info(f"Remote Consumer Closed: {data['consumer_id']}")
+
+            llm.conversation.remove_track(data['consumer_id'])
+
+        @room.on(RoomEvents.ConsumerPaused)
+        def on_remote_consumer_paused(data: RoomEventsData.ConsumerPaused):
+            logger.info(f"Remote Consumer Paused: {data['consumer_id']}")
+
+            llm.conversation.pause_track(data['consumer_id'])
 
-        # @room.on(RoomEvents.ConsumerPaused)
-        # def on_remote_consumer_paused(data: RoomEventsData.ConsumerPaused):
-        #     logger.info(f"Remote Consumer Paused: {data['consumer_id']}")
+        @room.on(RoomEvents.ConsumerResumed)
+        def on_remote_consumer_resumed(data: RoomEventsData.ConsumerResumed):
+            logger.info(f"Remote Consumer Resumed: {data['consumer_id']}")
 
-        # @room.on(RoomEvents.ConsumerResumed)
-        # def on_remote_consumer_resumed(data: RoomEventsData.ConsumerResumed):
-        #     logger.info(f"Remote Consumer Resumed: {data['consumer_id']}")
+            llm.conversation.resume_track(data['consumer_id'])
 
 
         # # Agent Events
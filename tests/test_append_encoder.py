@@ -0,0 +1,33 @@
+import base64
+import json
+
+from ai01.providers.openai.realtime.append_encoder import AppendEncoder
+
+
+def _message(pcm: bytes, event_id: str) -> dict:
+    return {
+        "type": "input_audio_buffer.append",
+        "event_id": event_id,
+        "audio": base64.b64encode(pcm).decode("utf-8"),
+    }
+
+
+def test_decodes_to_the_dict_it_replaces():
+    encoder = AppendEncoder()
+
+    for size in (0, 1, 2, 3, 320, 3200, 6401):
+        pcm = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+        message = json.loads(encoder.encode(pcm))
+
+        assert message == _message(pcm, message["event_id"])
+        assert json.loads(json.dumps(_message(pcm, message["event_id"]))) == message
+
+
+def test_event_ids_are_unique():
+    encoder = AppendEncoder()
+    other = AppendEncoder()
+
+    ids = [json.loads(encoder.encode(b"\x00\x01"))["event_id"] for _ in range(100)]
+    ids.append(json.loads(other.encode(b"\x00\x01"))["event_id"])
+
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,96 @@
+import asyncio
+
+import numpy as np
+from av import AudioFrame
+
+from ai01.rtc.audio_resampler import AudioResampler
+
+
+def _frame(samples: int = 1600, value: int = 1) -> AudioFrame:
+    frame = AudioFrame.from_ndarray(
+        np.full((1, samples), value, dtype=np.int16), format="s16", layout="mono"
+    )
+    frame.sample_rate = 16000
+
+    return frame
+
+
+def _resampler(policy, **kwargs) -> AudioResampler:
+    # 200 ms of 16 kHz mono, two frames of 100 ms.
+    return AudioResampler(
+        "s16", "mono", 16000, capacity_ms=200, overflow_policy=policy, **kwargs
+    )
+
+
+def test_drop_oldest_keeps_the_newest_audio():
+    resampler = _resampler("drop_oldest")
+
+    for value in (1, 2, 3):
+        resampler.resample(_frame(value=value))
+
+    out = np.empty(resampler.capacity, dtype=np.int16)
+
+    assert resampler.available == resampler.capacity
+    assert resampler.stats.overflows == 1
+    assert resampler.stats.dropped_samples == 1600
+    assert resampler.read_into(out) == resampler.capacity
+    assert set(out[:1600].tolist()) == {2}
+    assert set(out[1600:].tolist()) == {3}
+
+
+def test_drop_newest_keeps_the_buffered_audio():
+    resampler = _resampler("drop_newest")
+
+    for value in (1, 2, 3):
+        resampler.resample(_frame(value=value))
+
+    out = np.empty(resampler.capacity, dtype=np.int16)
+
+    assert resampler.stats.overflows == 1
+    assert resampler.stats.dropped_samples == 1600
+    assert resampler.read_into(out) == resampler.capacity
+    assert set(out[:1600].tolist()) == {1}
+    assert set(out[1600:].tolist()) == {2}
+
+
+def test_block_holds_the_producer_until_drained():
+    async def run():
+        resampler = _resampler("block", high_water=0.5)
+        resampler.resample(_frame())
+
+        waiter = asyncio.ensure_future(resampler.wait_writable())
+        await asyncio.sleep(0)
+
+        assert not waiter.done()
+
+        resampler.read_into(np.empty(800, dtype=np.int16))
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+
+
+def test_high_water_is_reported_once_until_drained():
+    reported = []
+    resampler = _resampler("drop_oldest", on_high_water=reported.append)
+
+    for _ in range(4):
+        resampler.resample(_frame())
+
+    assert reported == [resampler]
+    assert resampler.stats.high_water_events == 1
+
+    resampler.clear()
+    resampler.resample(_frame())
+    resampler.resample(_frame())
+
+    assert resampler.stats.high_water_events == 2
+
+
+def test_pad_writes_silence():
+    resampler = _resampler("drop_oldest")
+    resampler.pad(160)
+
+    out = np.ones(160, dtype=np.int16)
+
+    assert resampler.read_into(out) == 160
+    assert not out.any()
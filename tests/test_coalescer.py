@@ -0,0 +1,51 @@
+from ai01.providers.openai.realtime.coalescer import InputChunkCoalescer
+
+
+def test_holds_audio_until_a_chunk_is_pending():
+    coalescer = InputChunkCoalescer(sample_rate=16000, chunk_ms=100, max_hold_ms=10_000)
+
+    coalescer.add(bytes(1600))
+
+    assert coalescer.take() is None
+    assert coalescer.pending == 1600
+
+    coalescer.add(bytes(2000))
+
+    assert coalescer.take() == bytes(coalescer.chunk_bytes)
+    assert coalescer.pending == 400
+    assert coalescer.take() is None
+
+
+def test_flush_releases_everything_pending():
+    coalescer = InputChunkCoalescer(sample_rate=16000, chunk_ms=100, max_hold_ms=10_000)
+
+    coalescer.add(b"\x01" * 7000)
+    coalescer.flush()
+
+    assert coalescer.take() == b"\x01" * 7000
+    assert coalescer.take() is None
+    assert coalescer.hold_remaining() is None
+
+    # The flush ends with the audio it released, the next audio is held again.
+    coalescer.add(bytes(100))
+
+    assert coalescer.take() is None
+
+
+def test_flush_without_pending_audio_is_a_no_op():
+    coalescer = InputChunkCoalescer(max_hold_ms=10_000)
+
+    coalescer.flush()
+    coalescer.add(bytes(100))
+
+    assert coalescer.take() is None
+
+
+def test_max_hold_releases_a_short_chunk():
+    coalescer = InputChunkCoalescer(sample_rate=16000, chunk_ms=100, max_hold_ms=0)
+
+    coalescer.add(bytes(320))
+
+    assert coalescer.take() == bytes(320)
+    assert coalescer.stats.messages == 1
+    assert coalescer.stats.bytes == 320
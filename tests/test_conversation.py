@@ -0,0 +1,187 @@
+import asyncio
+from fractions import Fraction
+
+import numpy as np
+from aiortc.mediastreams import MediaStreamError, MediaStreamTrack
+from av import AudioFrame
+
+from ai01.providers.openai.realtime.conversation import Conversation
+
+FRAME_SAMPLES = 320
+
+
+class FakeAudioTrack(MediaStreamTrack):
+    """
+    Audio Track whose frames are pushed by the test, 20 ms of 16 kHz mono each.
+    """
+
+    kind = "audio"
+
+    def __init__(self):
+        super().__init__()
+        self._frames: asyncio.Queue = asyncio.Queue()
+        self._pts = 0
+
+    def push(self, value: int = 100):
+        frame = AudioFrame.from_ndarray(
+            np.full((1, FRAME_SAMPLES), value, dtype=np.int16),
+            format="s16",
+            layout="mono",
+        )
+        frame.sample_rate = 16000
+        frame.pts = self._pts
+        frame.time_base = Fraction(1, 16000)
+
+        self._pts += FRAME_SAMPLES
+        self._frames.put_nowait(frame)
+
+    def end(self):
+        self._frames.put_nowait(None)
+
+    async def recv(self) -> AudioFrame:
+        frame = await self._frames.get()
+
+        if frame is None:
+            self.stop()
+            raise MediaStreamError
+
+        return frame
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _track_tasks():
+    return {
+        task
+        for task in asyncio.all_tasks()
+        if task.get_name().startswith("Conversation-")
+    }
+
+
+def test_audio_of_a_track_is_streamed():
+    async def run():
+        conversation = Conversation("test")
+        track = FakeAudioTrack()
+
+        conversation.add_track("a", track)
+        track.push()
+
+        assert await conversation.wait_ready(timeout=1)
+        assert (
+            conversation.recv() == np.full(FRAME_SAMPLES, 100, dtype=np.int16).tobytes()
+        )
+
+        await conversation.close()
+
+    asyncio.run(run())
+
+
+def test_remove_track_cancels_its_task_and_unblocks_the_mix():
+    async def run():
+        conversation = Conversation("test")
+        talking, silent = FakeAudioTrack(), FakeAudioTrack()
+
+        conversation.add_track("talking", talking)
+        conversation.add_track("silent", silent)
+        await _settle()
+
+        assert len(_track_tasks()) == 2
+        assert conversation.remove_track("silent")
+        assert not conversation.remove_track("silent")
+
+        await _settle()
+
+        assert {task.get_name() for task in _track_tasks()} == {"Conversation-talking"}
+        assert set(conversation.audio_mixer.tracks) == {"talking"}
+
+        # The removed track no longer holds back the audio of the other one.
+        talking.push()
+
+        assert await conversation.wait_ready(timeout=1)
+        assert conversation.recv() is not None
+
+        await conversation.close()
+
+    asyncio.run(run())
+
+
+def test_paused_track_is_not_mixed_until_resumed():
+    async def run():
+        conversation = Conversation("test")
+        track = FakeAudioTrack()
+
+        conversation.add_track("a", track)
+        conversation.pause_track("a")
+
+        track.push()
+        await _settle()
+
+        assert "a" not in conversation.audio_mixer.tracks
+        assert conversation.recv() is None
+
+        conversation.resume_track("a")
+        track.push(200)
+
+        assert await conversation.wait_ready(timeout=1)
+        assert (
+            conversation.recv() == np.full(FRAME_SAMPLES, 200, dtype=np.int16).tobytes()
+        )
+
+        await conversation.close()
+
+    asyncio.run(run())
+
+
+def test_ended_track_is_reaped():
+    async def run():
+        conversation = Conversation("test")
+        track = FakeAudioTrack()
+
+        conversation.add_track("a", track)
+        track.end()
+        await _settle()
+
+        assert not _track_tasks()
+        assert not conversation.remove_track("a")
+        assert not conversation.audio_mixer.tracks
+
+        # A track with the same id can be added again once the previous one was reaped.
+        conversation.add_track("a", FakeAudioTrack())
+
+        await conversation.close()
+
+    asyncio.run(run())
+
+
+def test_close_ends_the_stream_and_leaves_no_tasks():
+    async def run():
+        conversation = Conversation("test")
+        tracks = [FakeAudioTrack() for _ in range(3)]
+
+        for i, track in enumerate(tracks):
+            conversation.add_track(str(i), track)
+
+        received = []
+
+        async def consume():
+            async for pcm in conversation.stream():
+                received.append(pcm)
+
+        consumer = asyncio.ensure_future(consume())
+
+        for track in tracks:
+            track.push()
+
+        await _settle()
+        await conversation.close()
+        await asyncio.wait_for(consumer, 1)
+
+        assert received
+        assert not conversation.active
+        assert not _track_tasks()
+        assert not conversation.audio_mixer.tracks
+
+    asyncio.run(run())
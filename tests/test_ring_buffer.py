@@ -0,0 +1,87 @@
+import numpy as np
+
+from ai01.utils.ring_buffer import AudioRingBuffer
+
+
+def _samples(start: int, count: int) -> np.ndarray:
+    return np.arange(start, start + count, dtype=np.int16)
+
+
+def test_write_drops_newest_without_overwrite():
+    buffer = AudioRingBuffer(8)
+
+    assert buffer.write(_samples(0, 6)) == 6
+    assert buffer.write(_samples(6, 6)) == 2
+    assert buffer.available == 8
+    assert buffer.free == 0
+
+    out = np.empty(8, dtype=np.int16)
+
+    assert buffer.read_into(out) == 8
+    assert out.tolist() == list(range(8))
+
+
+def test_write_overwrite_discards_oldest():
+    buffer = AudioRingBuffer(8)
+
+    buffer.write(_samples(0, 6))
+
+    assert buffer.write(_samples(6, 6), overwrite=True) == 6
+    assert buffer.available == 8
+
+    out = np.empty(8, dtype=np.int16)
+    buffer.read_into(out)
+
+    assert out.tolist() == list(range(4, 12))
+
+
+def test_write_overwrite_larger_than_capacity_keeps_tail():
+    buffer = AudioRingBuffer(4)
+
+    buffer.write(_samples(0, 2))
+
+    assert buffer.write(_samples(10, 10), overwrite=True) == 4
+
+    out = np.empty(4, dtype=np.int16)
+    buffer.read_into(out)
+
+    assert out.tolist() == [16, 17, 18, 19]
+
+
+def test_read_into_needs_a_full_read():
+    buffer = AudioRingBuffer(8)
+    buffer.write(_samples(0, 3))
+
+    out = np.zeros(4, dtype=np.int16)
+
+    assert buffer.read_into(out) == 0
+    assert buffer.available == 3
+    assert out.tolist() == [0, 0, 0, 0]
+
+    assert buffer.read_available_into(out) == 3
+    assert out[:3].tolist() == [0, 1, 2]
+    assert buffer.available == 0
+
+
+def test_read_into_wraps_around():
+    buffer = AudioRingBuffer(5)
+    out = np.empty(4, dtype=np.int16)
+
+    buffer.write(_samples(0, 4))
+    buffer.read_into(out)
+    buffer.write(_samples(4, 4))
+
+    assert buffer.read_into(out) == 4
+    assert out.tolist() == [4, 5, 6, 7]
+
+
+def test_stereo_counts_samples_per_channel():
+    buffer = AudioRingBuffer(4, channels=2)
+
+    assert buffer.write(_samples(0, 6)) == 3
+    assert buffer.available == 3
+
+    out = np.empty(4, dtype=np.int16)
+
+    assert buffer.read_into(out) == 2
+    assert out.tolist() == [0, 1, 2, 3]
@@ -0,0 +1,72 @@
+from ai01.providers.openai.realtime.turn_tracer import TurnTracer
+
+
+def test_records_every_mark_once_per_turn():
+    tracer = TurnTracer()
+
+    tracer.speech_stopped()
+
+    for mark in (
+        "committed",
+        "response_created",
+        "first_delta",
+        "first_audio",
+        "response_done",
+    ):
+        tracer.mark(mark)
+        tracer.mark(mark)
+
+    assert tracer.in_turn
+    assert tracer.stats.turns == 1
+    assert tracer.stats.completed == 1
+    assert tracer.stats.interrupted == 0
+    assert set(tracer.current) == {
+        "committed",
+        "response_created",
+        "first_delta",
+        "first_audio",
+        "response_done",
+    }
+    assert all(histogram.count == 1 for histogram in tracer.stats.latency.values())
+
+
+def test_ignores_marks_outside_a_turn():
+    tracer = TurnTracer()
+
+    tracer.mark("response_created")
+
+    assert tracer.current == {}
+    assert tracer.stats.latency["response_created"].count == 0
+
+
+def test_first_audio_needs_the_response():
+    tracer = TurnTracer()
+
+    tracer.speech_stopped()
+    tracer.first_audio()
+
+    assert "first_audio" not in tracer.current
+
+    tracer.mark("response_created")
+    tracer.first_audio()
+
+    assert "first_audio" in tracer.current
+
+
+def test_speaking_again_interrupts_an_unfinished_turn():
+    tracer = TurnTracer()
+    process_interrupted = TurnTracer.process_stats.interrupted
+
+    tracer.speech_stopped()
+    tracer.mark("response_created")
+    tracer.speech_started()
+
+    assert not tracer.in_turn
+    assert tracer.stats.interrupted == 1
+    assert TurnTracer.process_stats.interrupted == process_interrupted + 1
+
+    tracer.speech_stopped()
+    tracer.mark("response_done")
+    tracer.speech_started()
+
+    assert tracer.stats.interrupted == 1